@@ -0,0 +1,78 @@
+"""
+Замер скорости разбора плейлиста (строк в секунду) на синтетических файлах.
+
+Запуск из корня репозитория:
+    python benchmarks/csv_parse_benchmark.py
+    python benchmarks/csv_parse_benchmark.py --rows 100000 1000000 --irregular 0.05
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import radio_core  # Ядро без Qt, окно для замера не нужно
+
+
+def generate_playlist(path, rows, irregular_share, seed=1):
+    """Синтетический плейлист: в основном правильные строки, часть - в форматах для эвристик"""
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i in range(rows):
+            name = f"Station {i} FM"
+            url = f"http://host{i % 5000}.example.com:8000/stream{i}"
+            volume = rnd.randint(-10, 10)
+            if rnd.random() >= irregular_share:
+                f.write(f"{name}\t{url}\t{volume}\r\n")
+                continue
+            kind = rnd.randrange(3)
+            if kind == 0:
+                f.write(f"{name}  {url}  {volume}\r\n")       # Двойные пробелы вместо табуляций
+            elif kind == 1:
+                f.write(f"{name} {url} {url} {volume}\r\n")   # Адрес продублирован
+            else:
+                f.write(f"{name}\t\t{url}\t{volume}\r\n")     # Пустое поле
+    return path
+
+
+def bench_parse_line(processor_class, path):
+    """Только разбор строк, без чтения файла"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    processor = processor_class()
+    started = time.perf_counter()
+    for line_num, line in enumerate(lines, 1):
+        processor.parse_line(line, line_num)
+    return len(lines), time.perf_counter() - started
+
+
+def bench_process_file(processor_class, path):
+    """Полная обработка файла, как при открытии"""
+    started = time.perf_counter()
+    stations, _ = processor_class().process_csv_file(path)
+    return len(stations), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость разбора плейлиста")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000],
+                        help="размеры синтетических плейлистов")
+    parser.add_argument('--irregular', type=float, default=0.05,
+                        help="доля строк нестандартного формата (0-1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = generate_playlist(Path(tmp) / f"playlist_{rows}.csv", rows, args.irregular)
+            count, elapsed = bench_parse_line(radio_core.DataProcessor, path)
+            print(f"{rows:>9} строк  parse_line:       {count / elapsed:>12,.0f} строк/с ({elapsed:.2f} с)")
+            count, elapsed = bench_process_file(radio_core.DataProcessor, path)
+            print(f"{rows:>9} строк  process_csv_file: {count / elapsed:>12,.0f} строк/с ({elapsed:.2f} с)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
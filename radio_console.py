@@ -0,0 +1,206 @@
+"""
+Консольный режим радио менеджера: проверка и обслуживание плейлиста без окна.
+Построен только на radio_core, поэтому запускается без Qt и без дисплея;
+radio-manager.py передает сюда команду до загрузки окна.
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from radio_core import (DEFAULT_RENAME_TEMPLATE, ConfigManager, DataProcessor, DnsCache, NameFixer, ProbeCache,
+                        StationChecker, duplicate_key)
+
+
+class ConsoleRunner:
+    """
+    Обслуживание плейлиста без окна, например по расписанию на сервере:
+        radio-manager.py check --in a.csv --out b.csv --remove-dead --dedupe --rename "[REALNAME]"
+    Параметры проверки берутся из options.ini, ход работы печатается в stdout.
+    Коды выхода: 0 - успешно, 1 - ошибка чтения или записи плейлиста,
+    2 - неверные аргументы, 130 - проверка прервана (Ctrl+C).
+    """
+    COMMANDS = ('check',)
+    EXIT_OK = 0
+    EXIT_ERROR = 1
+    EXIT_INTERRUPTED = 130
+    PROGRESS_INTERVAL = 1.0  # Как часто печатать ход проверки (сек)
+
+    def __init__(self, args, config, out=None):
+        self.args = args
+        self.config = config
+        self.out = out or sys.stdout
+        self._progress_printed = 0.0
+
+    @staticmethod
+    def build_parser():
+        parser = argparse.ArgumentParser(prog='radio-manager.py',
+                                         description="Обслуживание плейлиста без графического интерфейса")
+        commands = parser.add_subparsers(dest='command', required=True)
+        check = commands.add_parser('check', help="проверить станции и сохранить плейлист")
+        check.add_argument('--in', dest='input', required=True, metavar='FILE', help="исходный плейлист")
+        check.add_argument('--out', metavar='FILE', help="куда сохранить (по-умолчанию поверх исходного)")
+        check.add_argument('--remove-dead', action='store_true',
+                           help="удалить битые станции: " + ', '.join(StationChecker.DEAD_STATUSES))
+        check.add_argument('--dedupe', action='store_true', help="удалить дубли по адресу, первая станция остается")
+        check.add_argument('--rename', nargs='?', const='', metavar='TEMPLATE',
+                           help="переименовать активные станции по шаблону (без значения - шаблон из настроек)")
+        check.add_argument('--no-cache', action='store_true', help="проверить все станции по сети, минуя кэш")
+        return parser
+
+    @staticmethod
+    def main(argv):
+        """Разобрать аргументы и выполнить команду; возвращает код выхода"""
+        args = ConsoleRunner.build_parser().parse_args(argv)  # При ошибке argparse сам выходит с кодом 2
+        DnsCache.install()
+        return ConsoleRunner(args, ConfigManager.load_config()).run()
+
+    def print(self, message):
+        print(message, file=self.out, flush=True)
+
+    def run(self):
+        stations = self.load()
+        if stations is None:
+            return self.EXIT_ERROR
+
+        results, interrupted = self.check(stations)
+        if interrupted:
+            # Неполные результаты не сохраняем, исходный файл остается как был
+            return self.EXIT_INTERRUPTED
+        entries = list(zip(stations, results))
+
+        if self.args.remove_dead:
+            entries = self.remove_dead(entries)
+        if self.args.dedupe:
+            entries = self.remove_duplicates(entries)
+        if self.args.rename is not None:
+            self.rename(entries)
+
+        out_path = self.args.out or self.args.input
+        success, message = DataProcessor().save_csv_file(out_path, [station for station, _ in entries])
+        self.print(message)
+        return self.EXIT_OK if success else self.EXIT_ERROR
+
+    def load(self):
+        """Станции из исходного файла или None, если файл не прочитан"""
+        path = self.args.input
+        if not Path(path).is_file():
+            self.print(f"Файл не найден: {path}")
+            return None
+        stations, log_messages = DataProcessor().process_csv_file(path)
+        for message in log_messages:
+            self.print(message)
+        if not stations:
+            self.print("Нет станций для проверки")
+            return None
+        return stations
+
+    def check(self, stations):
+        """
+        Проверить станции в рабочем потоке, главный поток ждет и ловит Ctrl+C.
+        Возвращает (результаты по номерам станций, прервана ли проверка).
+        """
+        settings = self.config['Settings']
+        results = [None] * len(stations)
+        outcome = []
+
+        def store_results(batch):
+            for row, result in batch:
+                results[row] = result
+
+        # События проверки приходят из ее рабочих потоков
+        handlers = {
+            'stations_checked': store_results,
+            'progress_updated': self.print_progress,
+            'prefilter_finished': lambda endpoints, unreachable, count: self.print(
+                f"Доступность серверов: {endpoints - unreachable} из {endpoints} отвечают, "
+                f"станций недоступных серверов: {count}"),
+            'retries_finished': lambda retried, recovered: self.print(
+                f"Повторных проверок после временных сбоев: {retried}, "
+                f"станций ответило на повторе: {recovered}"),
+            'check_finished': lambda *counts: outcome.append(counts),
+            'check_cancelled': lambda *counts: outcome.append(counts),
+        }
+
+        def listener(event, *args):
+            handler = handlers.get(event)
+            if handler is not None:
+                handler(*args)
+
+        checker = StationChecker(listener=listener)
+        checker.apply_settings(settings)
+        use_cache = not self.args.no_cache
+        if use_cache:
+            try:
+                checker.cache = ProbeCache.from_settings(settings)
+            except sqlite3.Error as e:
+                self.print(f"Кэш проверок недоступен: {str(e)}")
+
+        stations_data = [(row, station['url']) for row, station in enumerate(stations)]
+        self.print(f"Запущен поиск битых станций. Всего: {len(stations_data)}")
+        started = time.monotonic()
+        thread = threading.Thread(target=checker.check_stations, args=(stations_data, use_cache), daemon=True)
+        thread.start()
+        interrupted = False
+        try:
+            while thread.is_alive():
+                thread.join(0.5)
+        except KeyboardInterrupt:
+            interrupted = True
+            checker.cancel_check()
+            thread.join()
+        finally:
+            if checker.cache is not None:
+                checker.cache.close()
+
+        checked_count, active_count, dead_count = outcome[0] if outcome else (0, 0, 0)
+        if interrupted:
+            self.print(f"Проверка прервана. Проверено: {checked_count}, "
+                       f"Активных: {active_count}, Мертвых: {dead_count}")
+        else:
+            elapsed = time.monotonic() - started
+            self.print(f"Проверка окончена. Проверено: {checked_count}, "
+                       f"Активных: {active_count}, Мертвых: {dead_count}, за {elapsed:.1f} с")
+            hits, misses = StationChecker.encoding_cache_stats()
+            if hits + misses:
+                self.print(f"Кэш исправления кодировок: попаданий {hits} из {hits + misses}")
+        return results, interrupted
+
+    def print_progress(self, checked, total):
+        """Ход проверки не чаще PROGRESS_INTERVAL, последнее значение - всегда"""
+        now = time.monotonic()
+        if checked < total and now - self._progress_printed < self.PROGRESS_INTERVAL:
+            return
+        self._progress_printed = now
+        self.print(f"Проверено {checked} из {total}")
+
+    def remove_dead(self, entries):
+        kept = [(station, result) for station, result in entries
+                if result is None or result['status'] not in StationChecker.DEAD_STATUSES]
+        self.print(f"Удалено битых станций: {len(entries) - len(kept)}")
+        return kept
+
+    def remove_duplicates(self, entries):
+        """Оставить первую станцию из каждой группы одинаковых адресов (как кнопка "Удалить дубли")"""
+        by_final_url = self.config['Settings'].get('duplicates_by_final_url', '0') == '1'
+        seen = set()
+        kept = []
+        for station, result in entries:
+            url = result['final_url'] if by_final_url and result is not None else None
+            key = duplicate_key(url or station['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append((station, result))
+        self.print(f"Удалено дубликатов: {len(entries) - len(kept)}")
+        return kept
+
+    def rename(self, entries):
+        template = self.args.rename or self.config['Settings'].get('rename_template', DEFAULT_RENAME_TEMPLATE)
+        stations_data = [(row, station['name'], result) for row, (station, result) in enumerate(entries)]
+        new_names = NameFixer().fix_names(stations_data, template)
+        for row, name in new_names.items():
+            entries[row][0]['name'] = name
+        self.print(f"Переименовано станций по шаблону {template}: {len(new_names)}")
@@ -0,0 +1,2368 @@
+"""
+Ядро радио менеджера без зависимостей от Qt: настройки, разбор и сохранение плейлистов,
+проверка станций, загрузка плейлистов по сети, поиск дублей и переименование.
+Окно (radio_gui.py) подключается к нему через тонкие адаптеры сигналов,
+а сам модуль можно импортировать в консольных скриптах, замерах и дочерних процессах.
+"""
+import configparser
+import http.cookiejar
+import sqlite3
+import re
+import threading
+import time
+import heapq
+import random
+import asyncio
+import ssl
+import socket
+import multiprocessing
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlsplit, urljoin, quote
+
+
+RENAME_VARIABLES = ["[REALNAME]", "[OLDNAME]", "[BITRATE]", "[CODEC]", "[GENRE]"]
+DEFAULT_RENAME_TEMPLATE = "[REALNAME] [[CODEC] - [BITRATE]] ([GENRE])"
+
+
+class ConfigManager:
+    CONFIG_FILE = "options.ini"
+
+    @staticmethod
+    def load_config():
+        config = configparser.ConfigParser()
+        if Path(ConfigManager.CONFIG_FILE).exists():
+            config.read(ConfigManager.CONFIG_FILE)
+        else:
+            # Создаем конфиг с настройками по умолчанию
+            config['Settings'] = {
+                'theme': 'light',
+                'window_width': '800',
+                'window_height': '600',
+                'player_volume': '0.5',
+                'player_proxy': '0',
+                'duplicates_by_final_url': '0',
+                'max_check_threads': '10',
+                'adaptive_concurrency': '0',
+                'check_timeout': '10',
+                'connect_timeout': '3',
+                'connect_prefilter': '1',
+                'retry_attempts': '2',
+                'retry_delay': '1',
+                'process_workers': '0',
+                'check_engine': 'threads',
+                'async_concurrency': '500',
+                'per_host_limit': '4',
+                'probe_mode': 'get',
+                'cache_ttl_hours': '24',
+                'cache_max_entries': '200000',
+                'check_mode': 'full',
+                'recheck_hours': '24',
+                'delete_404': 'true',
+                'delete_Error': 'true',
+                'delete_ConnError': 'true',
+                'delete_Timeout': 'true',
+                'rename_template': DEFAULT_RENAME_TEMPLATE
+            }
+            ConfigManager.save_config(config)
+        return config
+    
+    @staticmethod
+    def save_config(config):
+        with open(ConfigManager.CONFIG_FILE, 'w') as configfile:
+            config.write(configfile)
+
+
+class DataProcessor:
+    # Шаблоны разбора строк плейлиста компилируются один раз
+    FIELD_SEPARATOR = re.compile(r'\t+|\s{2,}')
+    DOUBLE_WHITESPACE = re.compile(r'\s\s')
+    DOUBLE_URL_LINE = re.compile(r'^(.*?)\s+(https?://.*?)\s+(https?://.*?)(?:\s+(-?\d+))?$')
+    URL_PREFIXES = ('http://', 'https://')
+
+    def __init__(self):
+        self.log_messages = []
+    
+    def log(self, message):
+        self.log_messages.append(message)
+    
+    def process_csv_file(self, file_path):
+        """Обработка CSV файла с валидацией"""
+        self.log_messages = []
+        stations = []
+        error_count = 0
+        success_count = 0
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+            
+            lines = content.splitlines()
+            
+            for line_num, line in enumerate(lines, 1):
+                try:
+                    station = self.parse_line(line, line_num)
+                    if station is None:
+                        continue
+                    stations.append(station)
+                    success_count += 1
+                    
+                except Exception as e:
+                    error_count += 1
+                    self.log(f"Строка {line_num}: Ошибка: {str(e)}")
+            
+            # Финальная статистика
+            self.log(f"Обработано: {success_count} успешно, {error_count} ошибок")
+            
+        except Exception as e:
+            self.log(f"Ошибка при обработке файла: {str(e)}")
+        
+        return stations, self.log_messages
+
+    def parse_line(self, line, line_num):
+        """
+        Разобрать строку плейлиста. Возвращает словарь станции, None для пустой строки,
+        при ошибке формата бросает ValueError. Исправления пишутся в лог.
+        """
+        line = line.strip().lstrip('\ufeff')
+        if not line:
+            return None
+
+        # Быстрый путь: правильная строка "название\tадрес\tгромкость".
+        # Строки с пустыми полями и двойными пробелами разбираются эвристиками ниже.
+        parts = line.split('\t')
+        if len(parts) == 3 and all(parts) and self.DOUBLE_WHITESPACE.search(line) is None:
+            return self._make_station(parts[0], parts[1], parts[2], line_num)
+
+        parts = self.FIELD_SEPARATOR.split(line)
+        
+        if len(parts) == 1 and ' ' in parts[0]:
+            if parts[0].count('http') >= 2:
+                match = self.DOUBLE_URL_LINE.match(parts[0])
+                if match:
+                    name, url1, url2, volume = match.groups()
+                    url = url1 if url1 == url2 else url1
+                else:
+                    raise ValueError("Неправильный формат строки")
+            else:
+                space_parts = parts[0].rsplit(' ', 2)
+                if len(space_parts) >= 3:
+                    name = ' '.join(space_parts[:-2])
+                    url = space_parts[-2]
+                    volume = space_parts[-1]
+                else:
+                    raise ValueError("Недостаточно частей в строке")
+        elif len(parts) >= 3:
+            name = ' '.join(parts[:-2])
+            url = parts[-2]
+            volume = parts[-1]
+        else:
+            raise ValueError("Недостаточно частей в строке")
+
+        return self._make_station(name, url, volume, line_num)
+
+    def _make_station(self, name, url, volume, line_num):
+        """Подготовка данных станции: очистка полей, проверка громкости и адреса"""
+        name = name.strip()
+        url = url.strip().replace(' ', '')  # удаление пробелов из URL
+        try:
+            volume_int = int(volume) if volume else 0
+            if volume_int < -64 or volume_int > 64:
+                self.log(f"Строка {line_num}: Громкость {volume_int} вне диапазона, установлена в 0")
+                volume_int = 0
+        except ValueError:
+            self.log(f"Строка {line_num}: Неверная громкость '{volume}', установлена в 0")
+            volume_int = 0
+        
+        if not url.startswith(self.URL_PREFIXES):
+            raise ValueError(f"Неправильный формат URL '{url}'")
+        
+        return {
+            'name': name,
+            'url': url,
+            'volume': volume_int
+        }
+    
+    def save_csv_file(self, file_path, stations):
+        """Сохранение станций в CSV файл"""
+        try:
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                for station in stations:
+                    line = f"{station['name']}\t{station['url']}\t{station['volume']}\r\n"
+                    f.write(line)
+            return True, f"Файл сохранён: {file_path}"
+        except Exception as e:
+            return False, f"Ошибка при сохранении файла: {str(e)}"
+
+
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+
+def duplicate_key(url):
+    """
+    Ключ сравнения адресов: http и https считаются одним потоком, регистр,
+    порт по умолчанию, завершающие слэши, фрагмент и порядок параметров не учитываются.
+    Разбор строковыми операциями: urlsplit на миллионе адресов в разы медленнее.
+    """
+    url = url.strip().lower()
+    if not url:
+        return None
+    scheme, separator, rest = url.partition('://')
+    if not separator:
+        scheme, rest = 'http', url
+    rest = rest.partition('#')[0]
+    rest, _, query = rest.partition('?')
+    host, _, path = rest.partition('/')
+    host = host.rpartition('@')[2]
+    default_port = DEFAULT_PORTS.get(scheme)
+    if default_port and host.endswith(default_port):
+        host = host[:-len(default_port)]
+    key = f"{host}/{path.rstrip('/')}"
+    if query:
+        return f"{key}?" + '&'.join(sorted(query.split('&')))
+    return key
+
+
+class IcyDemuxer:
+    """
+    Разбор ICY-потока: каждые metaint байт аудио идет байт длины (в блоках по 16 байт)
+    и блок метаданных с StreamTitle. Данные подаются порциями любого размера.
+    """
+
+    def __init__(self, metaint):
+        self.metaint = metaint
+        self._audio_left = metaint
+        self._meta_left = None  # None - читаем аудио, число - осталось байт метаданных
+        self._meta = bytearray()
+
+    def feed(self, data):
+        """Разобрать порцию потока. Возвращает (аудиоданные, [названия треков, ...])"""
+        audio = bytearray()
+        titles = []
+        pos = 0
+        size = len(data)
+        while pos < size:
+            if self._meta_left is None:
+                if self._audio_left:
+                    take = min(self._audio_left, size - pos)
+                    audio += data[pos:pos + take]
+                    pos += take
+                    self._audio_left -= take
+                    continue
+                # Байт длины блока метаданных
+                self._meta_left = data[pos] * 16
+                pos += 1
+            else:
+                take = min(self._meta_left, size - pos)
+                self._meta += data[pos:pos + take]
+                pos += take
+                self._meta_left -= take
+
+            if self._meta_left == 0:
+                title = self.parse_title(bytes(self._meta))
+                if title is not None:
+                    titles.append(title)
+                self._meta.clear()
+                self._meta_left = None
+                self._audio_left = self.metaint
+        return bytes(audio), titles
+
+    @staticmethod
+    def parse_title(metadata):
+        """Название трека из блока метаданных или None, если его там нет"""
+        metadata = metadata.rstrip(b'\0')
+        if not metadata:
+            return None
+        try:
+            text = metadata.decode('utf-8')
+        except UnicodeDecodeError:
+            text = metadata.decode('cp1251', errors='ignore')
+        match = re.search(r"StreamTitle='(.*?)';", text, re.DOTALL)
+        return match.group(1) if match else None
+
+
+class NetworkPool:
+    """Общий пул HTTP-соединений (keep-alive) для проверки станций и загрузки плейлистов"""
+    POOL_HOSTS = 100  # Сколько хостов держать в пуле одновременно
+    per_host_limit = 4  # Максимум соединений к одному хосту
+
+    _session = None
+    _users = {}  # сессия -> сколько потоков ее сейчас используют
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure(per_host_limit):
+        """
+        Изменить лимит соединений на хост. Пул пересоздается, только если лимит изменился;
+        прежней сессией могут еще пользоваться другие потоки, поэтому она закрывается,
+        когда ее вернет последний из них.
+        """
+        with NetworkPool._lock:
+            if per_host_limit == NetworkPool.per_host_limit:
+                return
+            NetworkPool.per_host_limit = per_host_limit
+            session, NetworkPool._session = NetworkPool._session, None
+            if session is None or session in NetworkPool._users:
+                return
+        session.close()
+
+    @staticmethod
+    def acquire():
+        """Общая сессия requests, создается при первом обращении. После работы вернуть через release"""
+        with NetworkPool._lock:
+            if NetworkPool._session is None:
+                import requests  # Сетевой стек загружается при первом запросе, а не при запуске
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=NetworkPool.POOL_HOSTS,
+                    pool_maxsize=NetworkPool.per_host_limit
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                # Куки станций не нужны, а общая банка куки - лишняя синхронизация между потоками
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                NetworkPool._session = session
+            session = NetworkPool._session
+            NetworkPool._users[session] = NetworkPool._users.get(session, 0) + 1
+            return session
+
+    @staticmethod
+    def release(session):
+        """Вернуть сессию; замененная в configure сессия закрывается после последнего пользователя"""
+        with NetworkPool._lock:
+            users = NetworkPool._users.pop(session) - 1
+            if users:
+                NetworkPool._users[session] = users
+                return
+            if session is NetworkPool._session:
+                return
+        session.close()
+
+
+class DnsCache:
+    """
+    Общий для процесса кэш разрешения имен. Подменяет socket.getaddrinfo, поэтому
+    им пользуются все сетевые пути: requests, asyncio, плеер и загрузка плейлистов.
+    Одновременные запросы одного имени ждут одного разрешения. Системный getaddrinfo
+    не сообщает TTL записей, поэтому срок хранения фиксированный; ответы "имя не найдено"
+    тоже кэшируются, на меньший срок, временные ошибки DNS не кэшируются.
+    """
+    POSITIVE_TTL = 300   # Срок хранения адресов (сек)
+    NEGATIVE_TTL = 60    # Срок хранения ответа "имя не найдено" (сек)
+    MAX_ENTRIES = 50000
+    PREFETCH_WORKERS = 32
+    NEGATIVE_ERRORS = tuple(getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA')
+                            if hasattr(socket, name))
+
+    _entries = {}   # имя -> (момент устаревания, список адресов или gaierror)
+    _pending = {}   # имя -> Event разрешения, которое уже выполняется
+    _lock = threading.Lock()
+    _system_getaddrinfo = None
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def install():
+        """Подключить кэш вместо socket.getaddrinfo (повторный вызов ничего не делает)"""
+        with DnsCache._lock:
+            if DnsCache._system_getaddrinfo is None:
+                DnsCache._system_getaddrinfo = socket.getaddrinfo
+                socket.getaddrinfo = DnsCache.getaddrinfo
+
+    @staticmethod
+    def is_ip_literal(host):
+        """Адрес записан числом - разрешать нечего"""
+        for family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                socket.inet_pton(family, host)
+                return True
+            except (OSError, ValueError):
+                pass
+        return False
+
+    @staticmethod
+    def host_from_url(url):
+        """Имя хоста из адреса станции без полного разбора URL (вызывается для каждой строки плейлиста)"""
+        hostport = url.strip().partition('://')[2]
+        hostport = hostport.split('/', 1)[0].split('?', 1)[0].split('#', 1)[0].rpartition('@')[2]
+        if hostport.startswith('['):
+            return hostport[1:hostport.find(']')].lower()
+        return (hostport.rpartition(':')[0] or hostport).lower()
+
+    @staticmethod
+    def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+        """Замена socket.getaddrinfo: TCP-запросы к именам хостов отвечаются из кэша"""
+        system = DnsCache._system_getaddrinfo or socket.getaddrinfo
+        if isinstance(port, bytes):
+            port = port.decode('ascii', 'replace')
+        if (not isinstance(host, str) or not host or type != socket.SOCK_STREAM or flags or proto
+                or (port is not None and not str(port).isdigit()) or DnsCache.is_ip_literal(host)):
+            return system(host, port, family, type, proto, flags)
+        addresses = DnsCache.resolve(host.lower())
+        port_number = int(port) if port is not None else 0
+        result = [(af, socktype, sock_proto, '', (sockaddr[0], port_number) + tuple(sockaddr[2:]))
+                  for af, socktype, sock_proto, _, sockaddr in addresses
+                  if not family or af == family]
+        if not result:
+            # Нужного семейства адресов в кэше нет - пусть ответит система
+            return system(host, port, family, type, proto, flags)
+        return result
+
+    @staticmethod
+    def resolve(host):
+        """Адреса хоста из кэша или от системы; при ошибке разрешения - socket.gaierror"""
+        while True:
+            with DnsCache._lock:
+                entry = DnsCache._entries.get(host)
+                if entry is not None and entry[0] > time.monotonic():
+                    DnsCache.hits += 1
+                    value = entry[1]
+                    break
+                event = DnsCache._pending.get(host)
+                owner = event is None
+                if owner:
+                    event = DnsCache._pending[host] = threading.Event()
+                    DnsCache.misses += 1
+            if not owner:
+                # Имя уже разрешается в другом потоке - ждем и берем результат из кэша
+                event.wait()
+                continue
+            system = DnsCache._system_getaddrinfo or socket.getaddrinfo
+            try:
+                value = system(host, None, 0, socket.SOCK_STREAM)
+                ttl = DnsCache.POSITIVE_TTL
+            except socket.gaierror as e:
+                value = e
+                ttl = DnsCache.NEGATIVE_TTL if e.errno in DnsCache.NEGATIVE_ERRORS else 0
+            except BaseException:
+                with DnsCache._lock:
+                    del DnsCache._pending[host]
+                event.set()
+                raise
+            with DnsCache._lock:
+                if ttl:
+                    if len(DnsCache._entries) >= DnsCache.MAX_ENTRIES:
+                        DnsCache._drop_expired()
+                    DnsCache._entries[host] = (time.monotonic() + ttl, value)
+                del DnsCache._pending[host]
+            event.set()
+            break
+        if isinstance(value, socket.gaierror):
+            raise socket.gaierror(*value.args)
+        return value
+
+    @staticmethod
+    def _drop_expired():
+        """Удалить устаревшие записи (вызывается под блокировкой), при переполнении - все"""
+        now = time.monotonic()
+        expired = [host for host, (expires, _) in DnsCache._entries.items() if expires <= now]
+        for host in expired:
+            del DnsCache._entries[host]
+        if len(DnsCache._entries) >= DnsCache.MAX_ENTRIES:
+            DnsCache._entries.clear()
+
+    @staticmethod
+    def prefetch(hosts, cancelled=None):
+        """
+        Разрешить имена заранее в PREFETCH_WORKERS потоков.
+        Возвращает (разрешено, не найдено)
+        """
+        queue = deque(hosts)
+        counts = [0, 0]
+        counts_lock = threading.Lock()
+
+        def worker():
+            while cancelled is None or not cancelled.is_set():
+                try:
+                    host = queue.popleft()
+                except IndexError:
+                    return
+                try:
+                    DnsCache.resolve(host)
+                    failed = 0
+                except (OSError, UnicodeError):
+                    failed = 1
+                with counts_lock:
+                    counts[failed] += 1
+
+        workers = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(min(DnsCache.PREFETCH_WORKERS, len(queue)))]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return counts[0], counts[1]
+
+
+class AdaptiveConcurrency:
+    """
+    Подбор числа одновременных проверок по принципу AIMD: пока задержка ответов
+    и доля таймаутов не хуже лучших замеров, уровень растет, при ухудшении
+    (канал или серверы не справляются) - уменьшается в разы. До первого ухудшения
+    уровень удваивается, после - растет на десятую часть уровня, на котором случилось снижение.
+    Решение принимается по окну из завершенных проверок, не меньшего текущего уровня.
+    """
+    MIN_WINDOW = 20
+    TIMEOUT_MARGIN = 0.1   # Допустимый рост доли таймаутов над лучшим окном
+    LATENCY_FACTOR = 2.0   # Допустимый рост медианной задержки над лучшим окном
+    MIN_LATENCY = 0.2      # Медиана ниже этой (сек) за ухудшение не считается
+    DECREASE = 0.7
+
+    def __init__(self, initial, maximum, minimum=1):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = max(minimum, min(initial, self.maximum))
+        self.step = None  # None - быстрый разгон удвоением
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._timeouts = 0
+        self._best_latency = None
+        self._best_timeout_rate = None
+
+    def record(self, latency, timed_out):
+        """
+        Учесть завершенную проверку (задержка в секундах, был ли таймаут).
+        Возвращает новый уровень, если он изменился, иначе None.
+        """
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._latencies.append(latency)
+            samples = len(self._latencies) + self._timeouts
+            if samples < max(self.MIN_WINDOW, self.limit):
+                return None
+
+            timeout_rate = self._timeouts / samples
+            latencies = sorted(self._latencies)
+            median = latencies[len(latencies) // 2] if latencies else None
+            self._latencies = []
+            self._timeouts = 0
+
+            if self._best_timeout_rate is None or timeout_rate < self._best_timeout_rate:
+                self._best_timeout_rate = timeout_rate
+            if median is not None and (self._best_latency is None or median < self._best_latency):
+                self._best_latency = median
+            degraded = timeout_rate > self._best_timeout_rate + self.TIMEOUT_MARGIN or (
+                median is not None and median > max(self.MIN_LATENCY, self._best_latency * self.LATENCY_FACTOR)
+            )
+
+            if degraded:
+                limit = max(self.minimum, int(self.limit * self.DECREASE))
+                self.step = max(1, limit // 10)
+            elif self.step is None:
+                limit = min(self.maximum, self.limit * 2)
+            else:
+                limit = min(self.maximum, self.limit + self.step)
+            if limit == self.limit:
+                return None
+            self.limit = limit
+            return limit
+
+
+class ResultBatcher:
+    """
+    Буфер результатов проверки. Рабочие потоки и корутины складывают результаты,
+    отдельный поток раз в FLUSH_INTERVAL отправляет накопленное одним вызовом
+    вместе с прогрессом, поэтому число обновлений интерфейса не зависит от скорости проверки.
+    Счетчики проверенных, активных и мертвых станций меняются под той же блокировкой.
+    """
+    FLUSH_INTERVAL = 0.1  # секунд
+
+    def __init__(self, on_results, on_progress, total):
+        self.on_results = on_results     # функция списка [(строка, результат), ...]
+        self.on_progress = on_progress   # функция (проверено, всего)
+        self.total = total
+        self._lock = threading.Lock()
+        self._results = []
+        self._checked = 0
+        self._active = 0
+        self._dead = 0
+        self._reported = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def add(self, row, result):
+        """Добавить результат (из любого потока)"""
+        with self._lock:
+            self._results.append((row, result))
+            self._checked += 1
+            if result['status'] == 'OK':
+                self._active += 1
+            else:
+                self._dead += 1
+
+    def stats(self):
+        """(проверено, активных, мертвых)"""
+        with self._lock:
+            return self._checked, self._active, self._dead
+
+    def flush(self):
+        """Отправить накопленные результаты и прогресс"""
+        with self._lock:
+            results, self._results = self._results, []
+            checked = self._checked
+        if results:
+            self.on_results(results)
+        if checked != self._reported:
+            self._reported = checked
+            self.on_progress(checked, self.total)
+
+    def stop(self):
+        """Остановить отправку по таймеру и отправить остаток"""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+
+class RetryPolicy:
+    """
+    Повтор проверок, не прошедших из-за временного сбоя: таймаута, обрыва соединения
+    или перегрузки сервера. Пауза перед повтором растет вдвое с каждой попыткой,
+    половина ее случайна, чтобы повторы к одному серверу не приходили разом.
+    Счетчики общие для рабочих потоков, поэтому защищены блокировкой.
+    """
+    TRANSIENT_STATUSES = ('Timeout', 'ConnError', '502', '503', '504')
+    MAX_DELAY = 30  # Потолок паузы (сек)
+
+    def __init__(self, max_attempts=2, base_delay=1.0):
+        self.max_attempts = max(1, max_attempts)  # Всего попыток, включая первую
+        self.base_delay = base_delay
+        self.retried = 0     # Назначено повторов
+        self.recovered = 0   # Станций, ответивших на повторе
+        self._lock = threading.Lock()
+
+    def should_retry(self, result, attempt):
+        """Нужен ли повтор после попытки номер attempt (с 1)"""
+        if attempt >= self.max_attempts or result['status'] not in self.TRANSIENT_STATUSES:
+            return False
+        with self._lock:
+            self.retried += 1
+        return True
+
+    def delay(self, attempt):
+        """Пауза перед следующей попыткой после попытки номер attempt"""
+        delay = min(self.MAX_DELAY, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def record_final(self, result, attempt):
+        """Учесть окончательный результат станции"""
+        if attempt > 1 and result['status'] == 'OK':
+            with self._lock:
+                self.recovered += 1
+
+
+class HostFairQueue:
+    """
+    Очередь проверок с ограничением одновременных соединений на хост.
+    Хосты обслуживаются по кругу, поэтому тысячи адресов одного сервера
+    не вытесняют остальные станции и не упираются в его лимиты.
+    Сама по себе не потокобезопасна - синхронизацию делает вызывающий код.
+    """
+    def __init__(self, per_host_limit):
+        self.per_host_limit = max(1, per_host_limit)
+        self._queues = {}       # хост -> очередь заданий
+        self._active = {}       # хост -> число заданий в работе
+        self._ready = deque()   # хосты, у которых есть задания и свободные слоты
+        self._in_ready = set()
+        self._pending = 0
+        self._delayed = []      # куча (момент готовности, номер, хост, задание) отложенных повторов
+        self._delayed_count = 0
+
+    @staticmethod
+    def host_key(url):
+        """Ключ хоста для ограничения соединений"""
+        try:
+            return (urlsplit(url).hostname or '').lower()
+        except ValueError:
+            return ''
+
+    def __len__(self):
+        """Количество заданий, ожидающих выдачи, вместе с отложенными"""
+        return self._pending + len(self._delayed)
+
+    def push(self, host, item):
+        """Добавить задание в конец очереди хоста"""
+        self._queues.setdefault(host, deque()).append(item)
+        self._pending += 1
+        self._mark_ready(host)
+
+    def push_delayed(self, host, item, delay):
+        """Добавить задание в конец очереди хоста не раньше чем через delay секунд"""
+        heapq.heappush(self._delayed, (time.monotonic() + delay, self._delayed_count, host, item))
+        self._delayed_count += 1
+
+    def next_delay(self):
+        """Секунд до готовности ближайшего отложенного задания (None - отложенных нет)"""
+        if not self._delayed:
+            return None
+        return max(0.0, self._delayed[0][0] - time.monotonic())
+
+    def pop(self):
+        """
+        Выдать следующее задание по кругу хостов.
+        Возвращает (хост, задание) или None, если все хосты с заданиями заняты
+        или остались только отложенные задания.
+        """
+        if self._delayed:
+            self._promote_delayed()
+        if not self._ready:
+            return None
+        host = self._ready.popleft()
+        self._in_ready.discard(host)
+        item = self._queues[host].popleft()
+        if not self._queues[host]:
+            del self._queues[host]
+        self._pending -= 1
+        self._active[host] = self._active.get(host, 0) + 1
+        # Хост уходит в конец круга, чтобы не монополизировать выдачу
+        self._mark_ready(host)
+        return host, item
+
+    def release(self, host):
+        """Освободить слот хоста после завершения задания"""
+        active = self._active.get(host, 0) - 1
+        if active > 0:
+            self._active[host] = active
+        else:
+            self._active.pop(host, None)
+        self._mark_ready(host)
+
+    def _promote_delayed(self):
+        """Перенести отложенные задания, время которых пришло, в очереди хостов"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, host, item = heapq.heappop(self._delayed)
+            self.push(host, item)
+
+    def _mark_ready(self, host):
+        if (host in self._queues and host not in self._in_ready
+                and self._active.get(host, 0) < self.per_host_limit):
+            self._ready.append(host)
+            self._in_ready.add(host)
+
+
+class AsyncConnectionPool:
+    """Пул простаивающих keep-alive соединений для движка asyncio"""
+    MAX_IDLE_PER_HOST = 4
+
+    def __init__(self):
+        self._idle = {}  # (схема, хост, порт) -> список (reader, writer)
+
+    def take(self, key):
+        """Взять живое простаивающее соединение, если есть"""
+        connections = self._idle.get(key)
+        while connections:
+            reader, writer = connections.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+    def put(self, key, reader, writer):
+        """Вернуть соединение в пул для повторного использования"""
+        connections = self._idle.setdefault(key, [])
+        if len(connections) < self.MAX_IDLE_PER_HOST:
+            connections.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        """Закрыть все простаивающие соединения"""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class PlaylistParser:
+    """Парсер плейлистов: M3U/M3U8, PLS, XSPF."""
+    MAX_DEPTH = 3  # ограничение вложенности
+
+    @staticmethod
+    def fetch_and_parse(url, depth=0, visited=None):
+        """
+        Загружает и парсит плейлист по URL. Возвращает [{'url':..., 'title':...}, ...].
+        """
+        from urllib.parse import urljoin
+        import xml.etree.ElementTree as ET
+
+        if visited is None:
+            visited = set()
+
+        if depth > PlaylistParser.MAX_DEPTH:
+            return []
+        if url in visited:
+            return []
+
+        visited.add(url)
+
+        try:
+            headers = {'User-Agent': 'Mozilla/5.0', 'Icy-MetaData': '1'}
+            session = NetworkPool.acquire()
+            try:
+                r = session.get(url, headers=headers, timeout=5)
+            finally:
+                NetworkPool.release(session)
+            if r.status_code != 200:
+                return []
+
+            text = r.text
+            s = text.lstrip().lower()
+
+            # M3U
+            if "#extm3u" in s or "#extinf" in s:
+                return PlaylistParser._parse_m3u(text, url)
+            # PLS
+            if "[playlist]" in s or "file1=" in s:
+                return PlaylistParser._parse_pls(text, url)
+            # XSPF
+            if "<playlist" in s and "<tracklist" in s:
+                return PlaylistParser._parse_xspf(text, url)
+
+            # Fallback: просто ссылки
+            entries = []
+            for line in text.splitlines():
+                line = line.strip()
+                if line and not line.startswith("#") and line.lower().startswith("http"):
+                    entries.append({"url": urljoin(url, line), "title": None})
+            return entries
+        except Exception:
+            return []
+
+    @staticmethod
+    def _parse_m3u(content, base_url):
+        from urllib.parse import urljoin
+        entries = []
+        pending_title = None
+        for ln in content.splitlines():
+            ln = ln.strip()
+            if not ln:
+                continue
+            if ln.upper().startswith('#EXTINF'):
+                parts = ln.split(',', 1)
+                if len(parts) == 2:
+                    pending_title = parts[1].strip()
+                continue
+            if ln.startswith('#'):
+                continue
+            entries.append({'url': urljoin(base_url, ln), 'title': pending_title})
+            pending_title = None
+        return entries
+
+    @staticmethod
+    def _parse_pls(content, base_url):
+        from urllib.parse import urljoin
+        entries = []
+        file_map = {}
+        title_map = {}
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or '=' not in line:
+                continue
+            k, v = line.split('=', 1)
+            k = k.strip().lower()
+            v = v.strip()
+            if k.startswith('file'):
+                try:
+                    idx = int(k.replace('file', ''))
+                    file_map[idx] = v
+                except:
+                    pass
+            elif k.startswith('title'):
+                try:
+                    idx = int(k.replace('title', ''))
+                    title_map[idx] = v
+                except:
+                    pass
+        for idx in sorted(file_map.keys()):
+            entries.append({'url': urljoin(base_url, file_map[idx]), 'title': title_map.get(idx)})
+        return entries
+
+    @staticmethod
+    def _parse_xspf(content, base_url):
+        import xml.etree.ElementTree as ET
+        from urllib.parse import urljoin
+        entries = []
+        try:
+            root = ET.fromstring(content.encode('utf-8'))
+            for track in root.iter():
+                if track.tag.lower().endswith('track'):
+                    loc = None
+                    title = None
+                    for ch in track:
+                        tag = ch.tag.lower()
+                        if tag.endswith('location'):
+                            loc = ch.text.strip() if ch.text else None
+                        elif tag.endswith('title'):
+                            title = ch.text.strip() if ch.text else None
+                    if loc:
+                        entries.append({'url': urljoin(base_url, loc), 'title': title})
+        except Exception:
+            pass
+        return entries
+
+
+class ProbeCache:
+    """
+    Постоянный кэш результатов проверки станций в SQLite.
+    Ключ - нормализованный URL, записи старше TTL считаются устаревшими,
+    при превышении лимита удаляются самые старые.
+    """
+    CACHE_FILE = "probe_cache.db"
+    FIELDS = ('status', 'stream_type', 'name', 'codec', 'bitrate', 'genre', 'content_type', 'final_url')
+    # Сетевые сбои могут быть случайными - такие результаты проверка не берет из кэша
+    TRANSIENT_STATUSES = ('Timeout', 'ConnError')
+    FLUSH_EVERY = 500
+    QUERY_CHUNK = 500  # Не больше параметров в одном запросе SQLite
+
+    def __init__(self, path=CACHE_FILE, ttl_hours=24, max_entries=200000):
+        self.ttl_hours = ttl_hours
+        self.max_entries = max_entries
+        self._pending = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS probes ("
+            "url_key TEXT PRIMARY KEY, " + ", ".join(f"{field} TEXT" for field in self.FIELDS) +
+            ", checked_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS probes_checked_at ON probes (checked_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def from_settings(settings):
+        """Кэш с параметрами из настроек (None, если кэш выключен); sqlite3.Error, если база недоступна"""
+        ttl_hours = int(settings.get('cache_ttl_hours', '24'))
+        max_entries = int(settings.get('cache_max_entries', '200000'))
+        if ttl_hours <= 0:
+            return None
+        return ProbeCache(ProbeCache.CACHE_FILE, ttl_hours, max_entries)
+
+    @property
+    def enabled(self):
+        return self.ttl_hours > 0 and self._conn is not None
+
+    @staticmethod
+    def normalize_url(url):
+        """Ключ кэша: схема и хост в нижнем регистре, без порта по умолчанию и фрагмента"""
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            host = (parts.hostname or '').lower()
+            port = parts.port
+        except ValueError:
+            return url
+        if port is None or (scheme, port) in (('http', 80), ('https', 443)):
+            netloc = host
+        else:
+            netloc = f"{host}:{port}"
+        path = parts.path or '/'
+        return f"{scheme}://{netloc}{path}" + (f"?{parts.query}" if parts.query else '')
+
+    def get_many(self, urls, include_transient=False, any_age=False):
+        """
+        Свежие результаты для списка адресов: {url: результат}.
+        Результаты с сетевыми сбоями возвращаются только при include_transient,
+        результаты старше TTL - только при any_age.
+        """
+        if not self.enabled:
+            return {}
+        self.flush()
+        keys = {}
+        for url in urls:
+            keys.setdefault(self.normalize_url(url), []).append(url)
+
+        min_checked_at = 0 if any_age else time.time() - self.ttl_hours * 3600
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            for start in range(0, len(key_list), self.QUERY_CHUNK):
+                chunk = key_list[start:start + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT url_key, {', '.join(self.FIELDS)}, checked_at FROM probes "
+                    f"WHERE checked_at >= ? AND url_key IN ({', '.join('?' * len(chunk))})",
+                    [min_checked_at, *chunk]
+                )
+                for row in rows:
+                    result = dict(zip(self.FIELDS, row[1:-1]))
+                    result['checked_at'] = row[-1]
+                    if result['status'] in self.TRANSIENT_STATUSES and not include_transient:
+                        continue
+                    for url in keys[row[0]]:
+                        found[url] = result
+        return found
+
+    def plan_recheck(self, stations_data, recheck_hours):
+        """
+        План инкрементальной проверки. В проверку попадают станции без результата
+        (новые или с измененным адресом), с результатом старше recheck_hours
+        и со сбоями [Timeout]/[ConnError]. Порядок: сначала недавние сбои,
+        затем новые, затем устаревшие (самые старые первыми).
+        Возвращает (станции для проверки, [(строка, свежий результат), ...], счетчики по группам).
+        """
+        known = self.get_many([url for _, url in stations_data], include_transient=True, any_age=True)
+        min_checked_at = time.time() - recheck_hours * 3600
+        failed = []
+        new = []
+        stale = []
+        fresh = []
+        for row, url in stations_data:
+            result = known.get(url)
+            if result is None:
+                new.append((row, url))
+            elif result['status'] in self.TRANSIENT_STATUSES:
+                failed.append((-result['checked_at'], row, url))
+            elif result['checked_at'] < min_checked_at:
+                stale.append((result['checked_at'], row, url))
+            else:
+                fresh.append((row, result))
+
+        failed.sort()
+        stale.sort()
+        to_check = [(row, url) for _, row, url in failed] + new + [(row, url) for _, row, url in stale]
+        counts = {'failed': len(failed), 'new': len(new), 'stale': len(stale)}
+        return to_check, fresh, counts
+
+    def put(self, url, result):
+        """Запомнить результат проверки (запись на диск пачками)"""
+        record = (self.normalize_url(url), *(result.get(field) for field in self.FIELDS), time.time())
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) < self.FLUSH_EVERY:
+                return
+        self.flush()
+
+    def flush(self):
+        """Записать накопленные результаты и удалить лишние старые записи"""
+        with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            records, self._pending = self._pending, []
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO probes VALUES ({', '.join('?' * (len(self.FIELDS) + 2))})",
+                records
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM probes WHERE url_key IN "
+                    "(SELECT url_key FROM probes ORDER BY checked_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def close(self):
+        """Записать остатки и закрыть базу; дальнейшие обращения игнорируются"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class StationChecker:
+    """
+    Проверка станций. О ходе проверки сообщает вызовами listener(событие, *аргументы)
+    из рабочих потоков; события перечислены в EVENTS.
+    """
+    EVENTS = {
+        'progress_updated': 'проверено, всего',
+        'concurrency_changed': 'текущее число одновременных проверок (адаптивный режим)',
+        'prefilter_finished': 'серверов, недоступных серверов, их станций',
+        'stations_checked': '[(строка, результат проверки), ...] за интервал ResultBatcher',
+        'check_finished': 'проверено, активных, мертвых',
+        'check_cancelled': 'проверено до отмены, активных, мертвых',
+        'retries_finished': 'назначено повторов, станций ответило на повторе',
+    }
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    ENGINES = ('threads', 'asyncio')
+    # Режимы запроса: один GET, только HEAD, HEAD с последующим GET (старый способ)
+    PROBE_MODES = {'get': 'GET', 'head': 'HEAD', 'head_get': 'HEAD+GET'}
+    HEAD_UNSUPPORTED = (400, 405, 501)
+    # Статусы, которые можно удалить кнопкой "Удалить битые"
+    DEAD_STATUSES = ('404', 'Error', 'ConnError', 'Timeout')
+    INFO_PATTERN = re.compile(r"^\[OK\]\[(STREAM|PL: \d+)\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]$")
+    OLD_INFO_PATTERN = re.compile(r"^\[OK\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]$")
+    STATUS_PATTERN = re.compile(r"^\[([^\]\[]+)\]$")  # Ответы серверов, не поддерживающих HEAD
+    MAX_REDIRECTS = 5
+    MAX_HEADER_LINES = 100
+    MAX_DRAIN_BYTES = 65536  # Тела ответов длиннее не дочитываются ради keep-alive
+    # Потолок адаптивного режима для движка потоков (для asyncio - предел настройки)
+    ADAPTIVE_MAX_THREADS = 200
+    ADAPTIVE_MAX_ASYNC = 5000
+    PREFILTER_CONCURRENCY = 256  # Одновременных проверок соединения в первой фазе
+    ENCODING_CACHE_SIZE = 4096  # Исправленных строк в кэше fix_icy_encoding
+
+    # Кэш исправлений кодировки общий для всех проверок: битая строка -> исправленная
+    _encoding_cache = OrderedDict()
+    _encoding_lock = threading.Lock()
+    encoding_hits = 0
+    encoding_misses = 0
+    
+    def __init__(self, max_threads=10, timeout=10, engine='threads', async_concurrency=500, per_host_limit=4,
+                 probe_mode='get', cache=None, listener=None):
+        self.listener = listener  # Получатель событий проверки или None
+        self.max_threads = max_threads
+        self.timeout = timeout  # Таймаут ожидания ответа в секундах
+        self.connect_timeout = 3  # Таймаут установки соединения в секундах
+        self.connect_prefilter = True  # Первая фаза: DNS и TCP-соединение с серверами
+        self.engine = engine  # 'threads' - поток на станцию, 'asyncio' - цикл событий
+        self.async_concurrency = async_concurrency  # Одновременных проверок в режиме asyncio
+        self.per_host_limit = per_host_limit  # Одновременных соединений к одному хосту
+        self.probe_mode = probe_mode  # Режим запроса, см. PROBE_MODES
+        self.cache = cache  # ProbeCache или None
+        self.adaptive = False  # Подбирать число одновременных проверок (AdaptiveConcurrency)
+        self.retry_attempts = 2  # Попыток при временном сбое, включая первую
+        self.retry_delay = 1     # Начальная пауза перед повтором в секундах
+        self.retry_policy = None
+        self.process_workers = 0  # Процессов для разбора ответов 200 (0 - разбор в потоках проверки)
+        self._process_pool = None
+        self.cancel_flag = False
+        self._cancel_event = threading.Event()  # Отмена текущей проверки (у каждой проверки свое)
+        self._inflight = set()                  # Ответы requests, читаемые рабочими потоками
+        self._inflight_lock = threading.Lock()
+        self._async_loop = None
+        self._async_workers = []
+        self._ssl_context = None
+        self._connection_pool = None
+    
+
+    def _notify(self, event, *args):
+        if self.listener is not None:
+            self.listener(event, *args)
+
+    def apply_settings(self, settings):
+        """Параметры проверки из раздела Settings конфигурации"""
+        self.max_threads = int(settings.get('max_check_threads', '10'))
+        self.set_timeout(int(settings.get('check_timeout', '10')))
+        self.engine = settings.get('check_engine', 'threads')
+        self.async_concurrency = int(settings.get('async_concurrency', '500'))
+        self.per_host_limit = int(settings.get('per_host_limit', '4'))
+        self.probe_mode = settings.get('probe_mode', 'get')
+        self.adaptive = settings.get('adaptive_concurrency', '0') == '1'
+        self.connect_timeout = int(settings.get('connect_timeout', '3'))
+        self.connect_prefilter = settings.get('connect_prefilter', '1') == '1'
+        self.retry_attempts = int(settings.get('retry_attempts', '2'))
+        self.retry_delay = int(settings.get('retry_delay', '1'))
+        self.process_workers = int(settings.get('process_workers', '0'))
+
+    def _normalize_format(self, content_type):
+        """Преобразование MIME-типа в читаемый формат"""
+        FORMAT_MAPPING = {
+            'audio/mpeg': 'MP3',
+            'audio/aac': 'AAC',
+            'audio/aacp': 'AAC+',
+            'audio/mp4': 'MP4',
+            'audio/flac': 'FLAC',
+            'audio/ogg': 'OGG',
+            'audio/wav': 'WAV',
+            'audio/x-wav': 'WAV',
+            'audio/vnd.wav': 'WAV',
+            'audio/x-mpegurl': 'M3U',
+            'audio/scpls': 'PLS',
+            'application/vnd.apple.mpegurl': 'M3U8',
+            'application/x-mpegurl': 'M3U',
+            'application/pls+xml': 'PLS',
+            'application/xspf+xml': 'XSPF'
+        }
+        
+        if not content_type or content_type == 'Неизвестно':
+            return 'Неизвестно'
+        
+        # Приводим к нижнему регистру для сравнения
+        content_type = content_type.lower().strip()
+        
+        # Используем словарь для преобразования
+        if content_type in FORMAT_MAPPING:
+            return FORMAT_MAPPING[content_type]
+        
+        # Если тип не найден в словаре, пытаемся извлечь подтип
+        if '/' in content_type:
+            subtype = content_type.split('/')[-1].upper()
+            # Убираем лишние параметры
+            subtype = subtype.split(';')[0].strip()
+            return subtype
+        
+        # Если ничего не помогло, возвращаем как есть
+        return content_type.upper()
+
+
+    def get_timeout(self):
+        """Получить текущий таймаут"""
+        return self.timeout
+
+    def set_timeout(self, timeout):
+        """Установить таймаут для проверки"""
+        self.timeout = timeout
+    
+    def fix_icy_encoding(self, text):
+        """
+        Исправление кодировки ICY данных. Одни и те же битые названия и жанры
+        повторяются в большом плейлисте тысячи раз, поэтому исправления хранятся
+        в общем LRU-кэше на ENCODING_CACHE_SIZE строк.
+        """
+        if text is None or text == 'Неизвестно':
+            return text
+        
+        # Если текст выглядит нормально (нет явных признаков битой кодировки)
+        if not self._has_encoding_issues(text):
+            return text
+
+        cache = StationChecker._encoding_cache
+        with StationChecker._encoding_lock:
+            fixed = cache.get(text)
+            if fixed is not None:
+                cache.move_to_end(text)
+                StationChecker.encoding_hits += 1
+                return fixed
+            StationChecker.encoding_misses += 1
+
+        fixed = self._repair_encoding(text)
+        with StationChecker._encoding_lock:
+            cache[text] = fixed
+            if len(cache) > self.ENCODING_CACHE_SIZE:
+                cache.popitem(last=False)
+        return fixed
+
+    @staticmethod
+    def encoding_cache_stats():
+        """(попаданий, промахов) кэша исправления кодировок с начала текущей проверки"""
+        with StationChecker._encoding_lock:
+            return StationChecker.encoding_hits, StationChecker.encoding_misses
+
+    @staticmethod
+    def _reset_encoding_stats():
+        with StationChecker._encoding_lock:
+            StationChecker.encoding_hits = 0
+            StationChecker.encoding_misses = 0
+
+    @staticmethod
+    def _collect_probe_result(outcome):
+        """Результат разбора из пула процессов; счетчики кэша кодировок процесса добавляются к общим"""
+        result, hits, misses = outcome
+        with StationChecker._encoding_lock:
+            StationChecker.encoding_hits += hits
+            StationChecker.encoding_misses += misses
+        return result
+
+    def _repair_encoding(self, text):
+        """Подбор кодировки для строки с признаками битой кодировки"""
+        try:
+            # Получаем байты как latin-1 (чтобы получить оригинальные байты)
+            text_bytes = text.encode('latin-1')
+
+            # Быстрый путь: чаще всего это UTF-8, прочитанный как latin-1,
+            # строгое декодирование это сразу подтверждает
+            try:
+                decoded_text = text_bytes.decode('utf-8')
+                if self._is_text_valid(decoded_text):
+                    return decoded_text
+            except UnicodeDecodeError:
+                pass
+            
+            # Используем charset-normalizer для определения кодировки
+            # Это более точный и современный метод чем chardet.
+            # Модуль загружается при первой битой строке, а не при запуске
+            import charset_normalizer
+            results = charset_normalizer.from_bytes(text_bytes)
+            
+            if results:
+                # Берем самый вероятный результат
+                best_result = results.best()
+                if best_result:
+                    decoded_text = str(best_result)
+                    # Проверяем, что результат выглядит разумно
+                    if self._is_text_valid(decoded_text):
+                        return decoded_text
+            
+            # Если charset-normalizer не помог, пробуем популярные кодировки вручную
+            fallback_encodings = ['cp1251', 'koi8-r', 'iso-8859-5', 'cp866']
+            for enc in fallback_encodings:
+                try:
+                    decoded_text = text_bytes.decode(enc)
+                    if self._is_text_valid(decoded_text):
+                        return decoded_text
+                except:
+                    continue
+                    
+            return text  # Если ничего не помогло, возвращаем как есть
+            
+        except Exception as e:
+            # print(f"Encoding fix error: {e}")  # Для отладки
+            return text  # Возвращаем как есть в случае ошибок
+    
+    def _has_encoding_issues(self, text):
+        """Проверяет наличие признаков проблем с кодировкой"""
+        if not isinstance(text, str):
+            return False
+        # Типичные признаки битой UTF-8 в кодировках типа cp1251
+        return any(char in text for char in [
+            'Ð', 'Ñ', 'Â', '', '', '', '', '', '', '', '', 
+            '', '', '', '', '', '', '', ''
+        ])
+    
+    def _is_text_valid(self, text):
+        """Проверяет, что декодированный текст выглядит адекватно"""
+        if not text:
+            return False
+            
+        # Считаем "странные" символы
+        strange_chars = 0
+        total_chars = 0
+        
+        for c in text:
+            total_chars += 1
+            # Проверяем на "странные" символы (не ASCII, не кириллица, не знаки препинания)
+            if ord(c) > 127:
+                if not ('\u0400' <= c <= '\u04FF' or  # Кириллица
+                        '\u00C0' <= c <= '\u017F' or  # Латинские дополнения  
+                        c in ' «»—–№ёЁ†‡‰Љ‹ЊЋЏ'):  # Распространенные символы
+                    strange_chars += 1
+        
+        # Если больше 30% странных символов - считаем недействительным
+        return (strange_chars / total_chars) < 0.3 if total_chars > 0 else True
+    
+    def _is_playlist(self, url, content_type):
+        """Определяет, является ли контент плейлистом"""
+        if any(ext in url for ext in ['.m3u', '.m3u8', '.pls', '.xspf']):
+            return True
+        content_type = content_type.lower()
+        return any(key in content_type for key in [
+            'm3u', 'mpegurl', 'playlist', 'audio/x-mpegurl', 
+            'application/vnd.apple.mpegurl', 'audio/scpls',
+            'application/xspf+xml'
+        ])
+    
+    def _is_html_response(self, content, content_type):
+        """Определяет, является ли ответ HTML-страницей"""
+        content_type = content_type.lower()
+        if 'text/html' in content_type:
+            return True
+        
+        # Проверяем первые 100 символов на наличие HTML-тегов
+        sample = content[:100].lower()
+        return any(tag in sample for tag in ['<html', '<!doctype', '<body', '<head', '<title'])
+    
+    @staticmethod
+    def make_result(status, final_url=None, stream_type=None, name=None, codec=None,
+                    bitrate=None, genre=None, content_type=None):
+        """Результат проверки станции: статус ('OK', '404', 'Timeout', ...) и метаданные потока"""
+        return {
+            'status': status,
+            'stream_type': stream_type,
+            'name': name,
+            'codec': codec,
+            'bitrate': bitrate,
+            'genre': genre,
+            'content_type': content_type,
+            'final_url': final_url
+        }
+
+    @staticmethod
+    def format_info(result):
+        """Строка для ячейки «Информация» из результата проверки"""
+        if result['status'] != 'OK':
+            return f"[{result['status']}]"
+        return (f"[OK][{result['stream_type']}][{result['name']}][{result['codec']}]"
+                f"[{result['bitrate']}][{result['genre']}]")
+
+    @staticmethod
+    def parse_info(text):
+        """
+        Результат проверки из текста ячейки «Информация» (обратное format_info).
+        Понимает и старый формат без типа потока. None - станция не проверялась.
+        """
+        # Новый формат: [OK][STREAM][Radio Name][MP3][128][Pop] или [OK][PL: 5][...]...
+        match = StationChecker.INFO_PATTERN.match(text)
+        if match:
+            stream_type, name, codec, bitrate, genre = match.groups()
+            return StationChecker.make_result('OK', stream_type=stream_type, name=name,
+                                              codec=codec, bitrate=bitrate, genre=genre)
+        # Старый формат: [OK][Radio Name][MP3][128][Pop]
+        match = StationChecker.OLD_INFO_PATTERN.match(text)
+        if match:
+            name, codec, bitrate, genre = match.groups()
+            return StationChecker.make_result('OK', stream_type='STREAM', name=name,
+                                              codec=codec, bitrate=bitrate, genre=genre)
+        # Только статус: [404], [Timeout], [DOUBLE]...
+        match = StationChecker.STATUS_PATTERN.match(text)
+        if match:
+            return StationChecker.make_result(match.group(1))
+        return None
+
+    def _build_probe_result(self, status_code, headers, content_sample, final_url):
+        """Формирует результат проверки по ответу сервера"""
+        if status_code != 200:
+            # Считаем все не-200 статусы мертвыми
+            return self.make_result(str(status_code), final_url)
+
+        content_type = headers.get('content-type', 'Неизвестно').lower()
+
+        # Проверяем, не является ли ответ HTML-страницей
+        if self._is_html_response(content_sample.decode('latin-1', errors='ignore'), content_type):
+            return self.make_result('404', final_url, content_type=content_type)
+
+        stream_type = "STREAM"
+        # Проверяем, является ли контент плейлистом
+        if self._is_playlist(final_url, content_type):
+            try:
+                playlist_entries = PlaylistParser.fetch_and_parse(final_url)
+            except Exception:
+                playlist_entries = []
+            if not playlist_entries:
+                return self.make_result('Error', final_url, content_type=content_type)
+            stream_type = f"PL: {len(playlist_entries)}"
+
+        # Получаем метаданные с исправлением кодировки
+        station_name = self.fix_icy_encoding(headers.get('icy-name'))
+        genre = self.fix_icy_encoding(headers.get('icy-genre'))
+        bitrate = headers.get('icy-br', 'Неизвестно')
+
+        # Если значения None, заменяем на 'Неизвестно'
+        station_name = station_name if station_name else 'Неизвестно'
+        genre = genre if genre else 'Неизвестно'
+
+        return self.make_result(
+            'OK', final_url,
+            stream_type=stream_type,
+            name=station_name,
+            codec=self._normalize_format(headers.get('content-type', 'Неизвестно')),  # Нормализуем формат
+            bitrate=bitrate,
+            genre=genre,
+            content_type=content_type
+        )
+
+    def _split_cached(self, stations_data, use_cache):
+        """
+        Отделить станции со свежим результатом в кэше.
+        Возвращает (станции для проверки по сети, [(строка, результат из кэша), ...]).
+        """
+        if not use_cache or self.cache is None or not self.cache.enabled:
+            return stations_data, []
+        cached_results = self.cache.get_many([url for _, url in stations_data])
+        to_check = []
+        cached = []
+        for row, url in stations_data:
+            result = cached_results.get(url)
+            if result is None:
+                to_check.append((row, url))
+            else:
+                cached.append((row, result))
+        return to_check, cached
+
+    def _store_result(self, url, result):
+        """Сохранить результат проверки в кэш"""
+        if self.cache is not None and self.cache.enabled:
+            self.cache.put(url, result)
+
+    def check_stations(self, stations_data, use_cache=True):
+        """
+        Запустить проверку станций выбранным движком.
+        use_cache=False - проверить все переданные станции по сети, не заглядывая в кэш.
+        """
+        self._reset_encoding_stats()
+        self._process_pool = self._create_process_pool()
+        try:
+            if self.engine == 'asyncio':
+                self._check_stations_async(stations_data, use_cache)
+            else:
+                self._check_stations_threaded(stations_data, use_cache)
+        finally:
+            pool, self._process_pool = self._process_pool, None
+            if pool is not None:
+                # После отмены недоразобранные ответы не ждем
+                pool.shutdown(wait=not self._cancel_event.is_set())
+
+    def _create_process_pool(self):
+        """
+        Пул процессов для разбора ответов (None - разбор в потоках проверки).
+        Процессы запускаются через spawn: fork процесса с работающими потоками
+        может унести в дочерний процесс захваченные блокировки.
+        """
+        if self.process_workers <= 0:
+            return None
+        return ProcessPoolExecutor(self.process_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_process_worker)
+
+    def _submit_probe_result(self, status_code, headers, content_sample, final_url):
+        """Отправить разбор ответа в пул процессов; заголовки передаются словарем с ключами в нижнем регистре"""
+        headers = {name.lower(): value for name, value in headers.items()}
+        return self._process_pool.submit(build_probe_result, status_code, headers, content_sample, final_url)
+
+    def _build_host_queue(self, stations_data):
+        """Очередь станций с лимитом соединений на хост и чередованием хостов"""
+        queue = HostFairQueue(self.per_host_limit)
+        for row, url in stations_data:
+            queue.push(HostFairQueue.host_key(url), (row, url, 1))  # 1 - номер попытки
+        return queue
+
+    def _plan_rechecks(self, unreachable, batcher):
+        """
+        Итог предварительной проверки считается первой попыткой станции. При временном сбое
+        сервер после паузы проверяется еще одним соединением, а не полной проверкой каждой его станции;
+        иначе итог окончательный. В кэш итоги проверки соединения не попадают - одно неудачное
+        соединение не должно держать станцию неработающей весь срок хранения кэша.
+        Возвращает {(хост, порт): [(строка, адрес), ...]} серверов для повторной проверки.
+        """
+        rechecks = {}
+        for row, url, result in unreachable:
+            if self.retry_policy.should_retry(result, 1):
+                rechecks.setdefault(self.endpoint_key(url), []).append((row, url))
+            else:
+                self.retry_policy.record_final(result, 1)
+                batcher.add(row, result)
+        return rechecks
+
+    def _apply_recheck(self, queue, stations, status, batcher):
+        """Итог повторного соединения с сервером - общий для всех его станций"""
+        if status is None:
+            # Сервер ответил - его станции проходят полную проверку второй попыткой
+            for row, url in stations:
+                queue.push(HostFairQueue.host_key(url), (row, url, 2))
+            return
+        for row, url in stations:
+            result = self.make_result(status, url)
+            self.retry_policy.record_final(result, 2)
+            batcher.add(row, result)
+
+    def _check_stations_threaded(self, stations_data, use_cache=True):
+        """
+        Проверка станций пулом из max_threads рабочих потоков с общей очередью станций.
+        При отмене ожидание потоков прекращается сразу, результаты, пришедшие после отмены, не учитываются.
+        """
+        cancelled = self._start_check()
+        total_stations = len(stations_data)
+
+        # Результаты уходят в интерфейс пачками, там же ведутся счетчики
+        batcher = ResultBatcher(partial(self._notify, 'stations_checked'), partial(self._notify, 'progress_updated'), total_stations)
+        batcher.start()
+
+        # Станции со свежим результатом в кэше по сети не проверяем
+        stations_data, cached = self._split_cached(stations_data, use_cache)
+        for row, result in cached:
+            batcher.add(row, result)
+
+        # Станции недоступных серверов до HTTP-проверки сразу не доходят
+        unreachable = []
+        if self.connect_prefilter:
+            stations_data, unreachable = asyncio.run(self._prefilter_hosts(stations_data, cancelled))
+
+        # Станции выдаются по кругу хостов, не более per_host_limit на хост
+        queue = self._build_host_queue(stations_data)
+        rechecks = self._plan_rechecks(unreachable, batcher)
+        rechecking = len(rechecks)  # Серверов, ждущих повторного соединения
+        queue_condition = threading.Condition()
+        NetworkPool.configure(self.per_host_limit)
+
+        async def recheck_endpoints():
+            nonlocal rechecking
+            async for endpoint, status in self._recheck_endpoints(rechecks):
+                with queue_condition:
+                    self._apply_recheck(queue, rechecks[endpoint], status, batcher)
+                    rechecking -= 1
+                    queue_condition.notify_all()
+
+        if rechecks:
+            # Повторные соединения идут в своем потоке, не занимая потоки проверки
+            threading.Thread(target=asyncio.run, args=(self._gather_cancellable([recheck_endpoints()], cancelled),),
+                             daemon=True).start()
+
+        def take_task():
+            with queue_condition:
+                while not cancelled.is_set():
+                    task = queue.pop()
+                    if task is not None:
+                        return task
+                    if not len(queue) and not rechecking:
+                        return None
+                    # Все хосты с оставшимися станциями заняты или ждут повтора - ждем слот или паузу
+                    delay = queue.next_delay()
+                    queue_condition.wait(0.5 if delay is None else min(0.5, delay))
+            return None
+
+        # В адаптивном режиме потоков запускается с запасом, работают не больше controller.limit
+        controller = self._create_controller(self.max_threads, self.ADAPTIVE_MAX_THREADS)
+        slots = threading.Condition()
+        running = 0
+
+        def acquire_slot():
+            nonlocal running
+            with slots:
+                while running >= controller.limit and not cancelled.is_set():
+                    slots.wait(0.5)
+                running += 1
+
+        def release_slot(limit_changed):
+            nonlocal running
+            with slots:
+                running -= 1
+                if limit_changed:
+                    slots.notify_all()
+                else:
+                    slots.notify()
+
+        def worker():
+            # Сессию поток держит до выхода: после отмены он еще может дочитывать ответ
+            session = NetworkPool.acquire()
+            try:
+                check_tasks(session)
+            finally:
+                NetworkPool.release(session)
+
+        def check_tasks(session):
+            while True:
+                if controller is not None:
+                    acquire_slot()
+                task = take_task()
+                if task is None:
+                    if controller is not None:
+                        release_slot(False)
+                    return
+                host, (row, url, attempt) = task
+                started = time.monotonic()
+                retry = False
+                try:
+                    result = self._threaded_check_station(session, url)
+                    retry = not cancelled.is_set() and self.retry_policy.should_retry(result, attempt)
+                finally:
+                    with queue_condition:
+                        queue.release(host)
+                        if retry:
+                            # Повтор встает в конец очереди после паузы, поток ее не ждет
+                            queue.push_delayed(host, (row, url, attempt + 1), self.retry_policy.delay(attempt))
+                        queue_condition.notify()
+                if controller is not None:
+                    new_limit = self._record_latency(controller, started, result)
+                    release_slot(new_limit is not None)
+                if cancelled.is_set():
+                    return
+                if retry:
+                    continue
+                self.retry_policy.record_final(result, attempt)
+                self._store_result(url, result)
+                batcher.add(row, result)
+
+        workers_count = controller.maximum if controller is not None else self.max_threads
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(max(1, min(workers_count, len(queue) + len(unreachable))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive() and not cancelled.is_set():
+                thread.join(0.1)
+        batcher.stop()
+
+        if self.cache is not None:
+            self.cache.flush()
+        self._finish_check(cancelled, batcher)
+
+    def _threaded_check_station(self, session, url):
+        """Проверка одной станции через requests; ответ регистрируется, чтобы отмена могла его закрыть"""
+        import requests  # Уже загружен сессией NetworkPool
+        response = None
+        try:
+            response, content_sample = self._session_probe(session, url)
+            if self._process_pool is not None and response.status_code == 200:
+                # Разбор тяжелее ошибок: кодировки, HTML, плейлисты - поток ждет его без GIL
+                return self._collect_probe_result(self._submit_probe_result(
+                    response.status_code, response.headers, content_sample, response.url
+                ).result())
+            return self._build_probe_result(
+                response.status_code, response.headers, content_sample, response.url
+            )
+        except requests.exceptions.Timeout:
+            return self.make_result('Timeout', url)
+        except requests.exceptions.ConnectionError:
+            return self.make_result('ConnError', url)
+        except Exception:
+            return self.make_result('Error', url)
+        finally:
+            if response is not None:
+                with self._inflight_lock:
+                    self._inflight.discard(response)
+                # Недочитанный поток закрывает соединение, дочитанные ответы возвращаются в пул
+                response.close()
+
+    def _create_controller(self, initial, maximum):
+        """Регулятор для адаптивного режима (None - фиксированное число проверок)"""
+        if not self.adaptive:
+            return None
+        controller = AdaptiveConcurrency(initial, maximum)
+        self._notify('concurrency_changed', controller.limit)
+        return controller
+
+    def _record_latency(self, controller, started, result):
+        """Передать регулятору итог проверки; новый уровень сообщается в интерфейс"""
+        new_limit = controller.record(time.monotonic() - started, result['status'] == 'Timeout')
+        if new_limit is not None:
+            self._notify('concurrency_changed', new_limit)
+        return new_limit
+
+    def _start_check(self):
+        """Новый признак отмены и счетчики повторов для начинающейся проверки"""
+        self.cancel_flag = False
+        self._cancel_event = threading.Event()
+        self.retry_policy = RetryPolicy(self.retry_attempts, self.retry_delay)
+        return self._cancel_event
+
+    def _finish_check(self, cancelled, batcher):
+        """Итоговый сигнал с точными счетчиками"""
+        checked_count, active_count, dead_count = batcher.stats()
+        if self.retry_policy.retried:
+            self._notify('retries_finished', self.retry_policy.retried, self.retry_policy.recovered)
+        if cancelled.is_set():
+            self._notify('check_cancelled', checked_count, active_count, dead_count)
+        else:
+            self._notify('check_finished', checked_count, active_count, dead_count)
+
+    def _session_probe(self, session, url):
+        """
+        Запрос к станции через requests в выбранном режиме.
+        Возвращает (ответ, первые байты тела); ответ закрывает вызывающий код.
+        """
+        headers = {
+            'User-Agent': self.USER_AGENT,
+            'Icy-MetaData': '1'
+        }
+
+        if self.probe_mode == 'head':
+            # Только заголовки - быстрая проверка доступности
+            response = session.head(url, headers=headers, allow_redirects=True,
+                                    timeout=(self.connect_timeout, self.timeout))
+            if response.status_code not in self.HEAD_UNSUPPORTED:
+                return response, b''
+            # Сервер не умеет HEAD - проверяем одним GET
+            url = response.url
+            response.close()
+        elif self.probe_mode == 'head_get':
+            # Старый режим: HEAD для перехода по редиректам, затем GET итогового адреса
+            try:
+                redirect_response = session.head(url, headers=headers, allow_redirects=True,
+                                                 timeout=(self.connect_timeout, self.timeout))
+                url = redirect_response.url
+            except Exception:
+                pass  # Если HEAD не работает, сразу пробуем GET
+
+        # Один потоковый GET: редиректы, заголовки и первые байты тела за один запрос
+        response = session.get(url, headers=headers, stream=True, timeout=(self.connect_timeout, self.timeout))
+        with self._inflight_lock:
+            self._inflight.add(response)
+        content_sample = b''
+        try:
+            if response.status_code == 200:
+                for chunk in response.iter_content(1024):
+                    content_sample += chunk
+                    if len(content_sample) > 100:
+                        break
+        except Exception:
+            # Вызывающий код ответа не получит - снимаем его с учета здесь же
+            with self._inflight_lock:
+                self._inflight.discard(response)
+            response.close()
+            raise
+        return response, content_sample
+
+    def _check_stations_async(self, stations_data, use_cache=True):
+        """Проверка станций: цикл событий asyncio с неблокирующими сокетами"""
+        cancelled = self._start_check()
+        self._raise_open_files_limit(self.async_concurrency)
+        asyncio.run(self._run_async_check(stations_data, use_cache, cancelled))
+
+    async def _run_async_check(self, stations_data, use_cache, cancelled):
+        """
+        Пул корутин, разбирающих общую очередь станций.
+        Отмена снимает корутины сразу, их соединения закрываются.
+        """
+        total_stations = len(stations_data)
+
+        # Результаты уходят в интерфейс пачками, там же ведутся счетчики
+        batcher = ResultBatcher(partial(self._notify, 'stations_checked'), partial(self._notify, 'progress_updated'), total_stations)
+        batcher.start()
+
+        # Станции со свежим результатом в кэше по сети не проверяем
+        stations_data, cached = self._split_cached(stations_data, use_cache)
+        for row, result in cached:
+            batcher.add(row, result)
+
+        # Станции недоступных серверов до HTTP-проверки сразу не доходят
+        unreachable = []
+        if self.connect_prefilter:
+            stations_data, unreachable = await self._prefilter_hosts(stations_data, cancelled)
+
+        queue = self._build_host_queue(stations_data)
+        rechecks = self._plan_rechecks(unreachable, batcher)
+        rechecking = len(rechecks)  # Серверов, ждущих повторного соединения
+        queue_condition = asyncio.Condition()
+        self._connection_pool = AsyncConnectionPool()
+
+        async def recheck_endpoints():
+            nonlocal rechecking
+            async for endpoint, status in self._recheck_endpoints(rechecks):
+                self._apply_recheck(queue, rechecks[endpoint], status, batcher)
+                rechecking -= 1
+                async with queue_condition:
+                    queue_condition.notify_all()
+
+        # В адаптивном режиме корутин запускается с запасом, работают не больше controller.limit
+        controller = self._create_controller(self.async_concurrency, self.ADAPTIVE_MAX_ASYNC)
+        slots = asyncio.Condition()
+        running = 0
+
+        async def worker():
+            nonlocal running
+            # Все корутины работают в одном потоке, поэтому очередь и счетчик слотов не требуют блокировок
+            while not cancelled.is_set():
+                if controller is not None and running >= controller.limit:
+                    async with slots:
+                        await slots.wait()
+                    continue
+                task = queue.pop()
+                if task is None:
+                    if not len(queue) and not rechecking:
+                        break
+                    # Все хосты с оставшимися станциями заняты или ждут повтора - ждем слот или паузу
+                    async with queue_condition:
+                        try:
+                            await asyncio.wait_for(queue_condition.wait(), queue.next_delay())
+                        except asyncio.TimeoutError:
+                            pass
+                    continue
+
+                host, (row, url, attempt) = task
+                running += 1
+                started = time.monotonic()
+                retry = False
+                try:
+                    result = await self._async_check_station(url)
+                    retry = not cancelled.is_set() and self.retry_policy.should_retry(result, attempt)
+                finally:
+                    running -= 1
+                    queue.release(host)
+                    if retry:
+                        # Повтор встает в конец очереди после паузы, корутина ее не ждет
+                        queue.push_delayed(host, (row, url, attempt + 1), self.retry_policy.delay(attempt))
+                    async with queue_condition:
+                        if len(queue) and not cancelled.is_set():
+                            queue_condition.notify()
+                        else:
+                            queue_condition.notify_all()
+
+                if controller is not None:
+                    new_limit = self._record_latency(controller, started, result)
+                    async with slots:
+                        # Освободился слот; при росте уровня будим всех ожидающих
+                        if new_limit is not None or not len(queue):
+                            slots.notify_all()
+                        else:
+                            slots.notify()
+
+                if retry:
+                    continue
+                self.retry_policy.record_final(result, attempt)
+                self._store_result(url, result)
+                batcher.add(row, result)
+
+        workers_count = controller.maximum if controller is not None else self.async_concurrency
+        workers_count = max(1, min(workers_count, total_stations))
+        try:
+            # Снятые отменой корутины возвращают CancelledError, остальные ошибки пробрасываются
+            coroutines = [worker() for _ in range(workers_count)]
+            if rechecks:
+                coroutines.append(recheck_endpoints())
+            for outcome in await self._gather_cancellable(coroutines, cancelled):
+                if isinstance(outcome, Exception):
+                    raise outcome
+        finally:
+            batcher.stop()
+            self._connection_pool.close()
+            self._connection_pool = None
+            if self.cache is not None:
+                self.cache.flush()
+        self._finish_check(cancelled, batcher)
+
+    async def _gather_cancellable(self, coroutines, cancelled):
+        """Выполнить корутины, которые cancel_check может снять из другого потока; результаты как у gather"""
+        self._async_workers = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        self._async_loop = asyncio.get_running_loop()
+        if cancelled.is_set():
+            self._cancel_async_workers()
+        try:
+            return await asyncio.gather(*self._async_workers, return_exceptions=True)
+        finally:
+            self._async_loop = None
+            self._async_workers = []
+
+    @staticmethod
+    def endpoint_key(url):
+        """(хост, порт) адреса станции или None, если адрес не разбирается"""
+        try:
+            parts = urlsplit(url.strip())
+            scheme = parts.scheme.lower()
+            if scheme not in ('http', 'https') or not parts.hostname:
+                return None
+            return parts.hostname.lower(), parts.port or (443 if scheme == 'https' else 80)
+        except ValueError:
+            return None
+
+    async def _prefilter_hosts(self, stations_data, cancelled):
+        """
+        Первая фаза проверки: разрешение имен и TCP-соединение с каждым сервером (хост:порт)
+        за connect_timeout, одно на сервер. Станции недоступных серверов получают
+        [ConnError] или [Timeout] сразу, полную HTTP-проверку проходят только остальные.
+        Возвращает (станции для HTTP-проверки, [(строка, адрес, результат), ...]).
+        """
+        endpoints = {}
+        for row, url in stations_data:
+            endpoint = self.endpoint_key(url)
+            if endpoint is not None:
+                endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+        semaphore = asyncio.Semaphore(self.PREFILTER_CONCURRENCY)
+        resolving = {}  # хост -> задача разрешения имени, одна на хост для всех портов
+
+        async def check(endpoint):
+            async with semaphore:
+                return endpoint, await self._async_connect_check(endpoint, resolving)
+
+        outcomes = await self._gather_cancellable([check(endpoint) for endpoint in endpoints], cancelled)
+        # Сервер, проверка которого не завершилась (отмена, ошибка), проверяется как обычно
+        statuses = dict(outcome for outcome in outcomes if isinstance(outcome, tuple) and outcome[1])
+
+        to_check = []
+        unreachable = []
+        for row, url in stations_data:
+            status = statuses.get(self.endpoint_key(url))
+            if status is None:
+                to_check.append((row, url))
+            else:
+                unreachable.append((row, url, self.make_result(status, url)))
+        self._notify('prefilter_finished', len(endpoints), len(statuses), len(unreachable))
+        return to_check, unreachable
+
+    async def _recheck_endpoints(self, rechecks):
+        """
+        Повторное соединение с серверами, недоступными в первой фазе: одно на сервер
+        после паузы повтора. Выдает (сервер, статус или None) по мере готовности.
+        """
+        semaphore = asyncio.Semaphore(self.PREFILTER_CONCURRENCY)
+        resolving = {}
+
+        async def check(endpoint):
+            await asyncio.sleep(self.retry_policy.delay(1))
+            async with semaphore:
+                return endpoint, await self._async_connect_check(endpoint, resolving)
+
+        for future in asyncio.as_completed([check(endpoint) for endpoint in rechecks]):
+            yield await future
+
+    async def _async_connect_check(self, endpoint, resolving):
+        """Статус недоступного сервера ('ConnError', 'Timeout') или None, если соединение установлено"""
+        host, port = endpoint
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.connect_timeout
+        task = resolving.get(host)
+        if task is None:
+            task = resolving[host] = asyncio.ensure_future(loop.getaddrinfo(host, None, type=socket.SOCK_STREAM))
+        try:
+            # shield - разрешение имени общее для всех портов хоста, таймаут одного ожидающего его не снимает
+            addresses = await asyncio.wait_for(asyncio.shield(task), self.connect_timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            return 'Timeout'
+        except OSError:
+            return 'ConnError'  # Имя не разрешается
+
+        status = 'ConnError'
+        for address in dict.fromkeys(info[4][0] for info in addresses):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return 'Timeout'
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), remaining)
+            except (asyncio.TimeoutError, TimeoutError):
+                status = 'Timeout'
+                continue
+            except OSError:
+                continue
+            writer.close()
+            return None
+        return status
+
+    def _cancel_async_workers(self):
+        """Снять корутины проверки (вызывается в потоке цикла событий)"""
+        for task in self._async_workers:
+            task.cancel()
+
+    async def _async_check_station(self, url):
+        """Проверка одной станции без блокировки цикла событий"""
+        try:
+            status_code, headers, content_sample, final_url = await self._async_probe(url)
+            if self._process_pool is not None and status_code == 200:
+                # Разбор ответа в пуле процессов, цикл событий тем временем ведет другие проверки
+                return self._collect_probe_result(await asyncio.wrap_future(
+                    self._submit_probe_result(status_code, headers, content_sample, final_url)
+                ))
+            if status_code == 200 and self._is_playlist(final_url, headers.get('content-type', '')):
+                # Загрузка плейлиста блокирующая - уводим её в пул потоков
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    None, self._build_probe_result, status_code, headers, content_sample, final_url
+                )
+            return self._build_probe_result(status_code, headers, content_sample, final_url)
+        except (asyncio.TimeoutError, TimeoutError):
+            return self.make_result('Timeout', url)
+        except (OSError, asyncio.IncompleteReadError):
+            return self.make_result('ConnError', url)
+        except Exception:
+            return self.make_result('Error', url)
+
+    async def _async_probe(self, url):
+        """Запрос(ы) к станции в выбранном режиме проверки"""
+        if self.probe_mode == 'head':
+            # Только заголовки - быстрая проверка доступности
+            result = await self._async_fetch(url, 'HEAD')
+            if result[0] not in self.HEAD_UNSUPPORTED:
+                return result
+            # Сервер не умеет HEAD - проверяем одним GET
+            url = result[3]
+        elif self.probe_mode == 'head_get':
+            # Старый режим: HEAD для перехода по редиректам, затем GET итогового адреса
+            try:
+                url = (await self._async_fetch(url, 'HEAD'))[3]
+            except Exception:
+                pass  # Если HEAD не работает, сразу пробуем GET
+
+        # Один потоковый GET: редиректы, заголовки и первые байты тела за один запрос
+        return await self._async_fetch(url, 'GET')
+
+    async def _async_fetch(self, url, method='GET'):
+        """
+        Асинхронный HTTP-запрос с переходом по редиректам.
+        Возвращает (код ответа, заголовки в нижнем регистре, первые байты, итоговый URL).
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            if scheme not in ('http', 'https') or not parts.hostname:
+                raise ValueError(f"Неподдерживаемый адрес '{url}'")
+
+            host = parts.hostname.encode('idna').decode('ascii')
+            port = parts.port or (443 if scheme == 'https' else 80)
+            path = quote(parts.path or '/', safe="/%:@!$&'()*+,;=-._~")
+            if parts.query:
+                path += '?' + quote(parts.query, safe="/%:@!$&'()*+,;=-._~?")
+            host_header = host if parts.port is None else f"{host}:{parts.port}"
+            request = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {host_header}\r\n"
+                f"User-Agent: {self.USER_AGENT}\r\n"
+                f"Icy-MetaData: 1\r\n"
+                f"Accept: */*\r\n"
+                f"Connection: keep-alive\r\n\r\n"
+            ).encode('ascii')
+
+            key = (scheme, host, port)
+            reader, writer, http_version, status_code, headers = await self._async_exchange(key, request)
+            keep_alive = False
+            try:
+                if status_code in (301, 302, 303, 307, 308) and headers.get('location'):
+                    keep_alive = await self._async_drain_body(reader, http_version, status_code, headers, method)
+                    url = urljoin(url, headers['location'])
+                    continue
+
+                content_sample = b''
+                if status_code == 200 and method == 'GET':
+                    # Тело потока бесконечно - в пул возвращается только соединение с дочитанным коротким телом
+                    content_sample, complete = await self._async_read_sample(reader, headers)
+                    keep_alive = complete and self._async_keeps_alive(http_version, headers)
+                else:
+                    keep_alive = await self._async_drain_body(reader, http_version, status_code, headers, method)
+                return status_code, headers, content_sample, url
+            finally:
+                if keep_alive and self._connection_pool is not None:
+                    self._connection_pool.put(key, reader, writer)
+                else:
+                    writer.close()
+
+        raise ValueError("Слишком много перенаправлений")
+
+    async def _async_exchange(self, key, request):
+        """
+        Отправить запрос и прочитать строку статуса с заголовками.
+        Использует соединение из пула, если оно есть; при обрыве такого соединения повторяет запрос на новом.
+        """
+        scheme, host, port = key
+        pooled = self._connection_pool.take(key) if self._connection_pool is not None else None
+        while True:
+            if pooled:
+                reader, writer = pooled
+            else:
+                ssl_context = self._get_ssl_context() if scheme == 'https' else None
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=ssl_context), self.connect_timeout
+                )
+            try:
+                writer.write(request)
+                await asyncio.wait_for(writer.drain(), self.timeout)
+
+                # Строка статуса: "HTTP/1.1 200 OK" или "ICY 200 OK" у старых Shoutcast
+                status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if not status_line:
+                    raise ConnectionError("Сервер закрыл соединение")
+                status_parts = status_line.decode('latin-1').split(None, 2)
+                if len(status_parts) < 2 or not status_parts[0].upper().startswith(('HTTP/', 'ICY')):
+                    raise ValueError("Некорректный ответ сервера")
+                http_version = status_parts[0].upper()
+                status_code = int(status_parts[1])
+
+                headers = {}
+                for _ in range(self.MAX_HEADER_LINES):
+                    line = await asyncio.wait_for(reader.readline(), self.timeout)
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    if b':' in line:
+                        name, value = line.decode('latin-1').split(':', 1)
+                        headers.setdefault(name.strip().lower(), value.strip())
+                return reader, writer, http_version, status_code, headers
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                writer.close()
+                if pooled:
+                    # Простаивающее соединение закрыто сервером или испорчено - пробуем заново
+                    pooled = None
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+    async def _async_drain_body(self, reader, http_version, status_code, headers, method):
+        """Дочитать короткое тело ответа. Возвращает True, если соединение можно вернуть в пул"""
+        if not self._async_keeps_alive(http_version, headers):
+            return False
+        if method == 'HEAD' or status_code in (204, 304):
+            return True
+        try:
+            length = int(headers.get('content-length', ''))
+        except ValueError:
+            return False  # Тело без длины или chunked - проще закрыть
+        if length < 0 or length > self.MAX_DRAIN_BYTES:
+            return False
+        if length:
+            await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        return True
+
+    @staticmethod
+    def _async_keeps_alive(http_version, headers):
+        """Оставляет ли сервер соединение открытым после ответа"""
+        connection = headers.get('connection', '').lower()
+        return connection != 'close' and (http_version == 'HTTP/1.1' or connection == 'keep-alive')
+
+    async def _async_read_sample(self, reader, headers):
+        """
+        Прочитать первые байты тела ответа (для распознавания HTML-заглушек).
+        Короткое тело читается по его длине или chunked-разметке: на keep-alive соединении
+        конца файла не будет. Возвращает (байты, дочитано ли тело целиком).
+        """
+        limit = 101
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            content_sample = b''
+            while len(content_sample) < limit:
+                size_line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if not size_line:
+                    return content_sample, False
+                size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    # Последний блок: пропускаем завершающие заголовки
+                    for _ in range(self.MAX_HEADER_LINES):
+                        line = await asyncio.wait_for(reader.readline(), self.timeout)
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                    return content_sample, True
+                if len(content_sample) + size > limit:
+                    content_sample += await self._async_read_up_to(reader, limit - len(content_sample))
+                    return content_sample, False
+                content_sample += await asyncio.wait_for(reader.readexactly(size), self.timeout)
+                await asyncio.wait_for(reader.readline(), self.timeout)  # CRLF после блока
+            return content_sample, False
+
+        try:
+            length = int(headers.get('content-length', ''))
+        except ValueError:
+            length = -1
+        if length >= 0:
+            content_sample = await self._async_read_up_to(reader, min(limit, length))
+            return content_sample, len(content_sample) == length
+        # Длина не указана - тело идет до закрытия соединения (поток)
+        return await self._async_read_up_to(reader, limit), False
+
+    async def _async_read_up_to(self, reader, size):
+        """Прочитать до size байт; меньше - только если сервер закрыл соединение"""
+        data = b''
+        while len(data) < size:
+            chunk = await asyncio.wait_for(reader.read(size - len(data)), self.timeout)
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def _get_ssl_context(self):
+        """Общий SSL-контекст для асинхронных соединений"""
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    @staticmethod
+    def _raise_open_files_limit(needed):
+        """Поднять лимит открытых файлов (Linux/macOS), чтобы хватило сокетов на все проверки"""
+        try:
+            import resource
+        except ImportError:
+            return  # Windows - лимита на сокеты такого вида нет
+        try:
+            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            wanted = needed + 256
+            if soft != resource.RLIM_INFINITY and soft < wanted:
+                if hard != resource.RLIM_INFINITY:
+                    wanted = min(wanted, hard)
+                resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+        except (ValueError, OSError):
+            pass
+    
+    def cancel_check(self):
+        """
+        Отменить проверку. Корутины asyncio снимаются сразу, у рабочих потоков
+        закрываются читаемые ответы; запросы, ждущие соединения, завершатся по таймауту в фоне.
+        """
+        self.cancel_flag = True
+        self._cancel_event.set()
+        loop = self._async_loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancel_async_workers)
+            except RuntimeError:
+                pass  # Цикл уже завершился
+        with self._inflight_lock:
+            responses = list(self._inflight)
+        for response in responses:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+
+_process_checker = None  # Экземпляр для разбора ответов, свой в каждом процессе пула
+
+
+def _init_process_worker():
+    """Подготовка процесса пула: плейлисты он загружает сам, имена разрешаются через общий кэш"""
+    DnsCache.install()
+
+
+def build_probe_result(status_code, headers, content_sample, final_url):
+    """
+    Разбор ответа сервера в процессе пула StationChecker.process_workers.
+    Функция модуля, а не метод: ее можно передать в дочерний процесс по имени.
+    Возвращает (результат, попаданий, промахов кэша кодировок за этот разбор) -
+    счетчики процесса основной процесс не видит и складывает сам.
+    """
+    global _process_checker
+    if _process_checker is None:
+        _process_checker = StationChecker()
+    hits, misses = StationChecker.encoding_cache_stats()
+    result = _process_checker._build_probe_result(status_code, headers, content_sample, final_url)
+    new_hits, new_misses = StationChecker.encoding_cache_stats()
+    return result, new_hits - hits, new_misses - misses
+
+
+class NameFixer:
+    """
+    Класс для переименования станций согласно шаблону.
+    """
+
+    def parse_info_cell(self, info_text: str) -> dict:
+        """
+        Парсит текст из ячейки "Информация" и возвращает словарь с тегами.
+        Поддерживает старый и новый формат (с [STREAM] и [PL: N]).
+        """
+        return self.tags_from_result(StationChecker.parse_info(info_text))
+
+    def tags_from_result(self, result) -> dict:
+        """
+        Словарь тегов REALNAME, CODEC, BITRATE и GENRE из результата проверки.
+        Для неактивной или непроверенной станции - None.
+        """
+        if result is None or result['status'] != 'OK':
+            return None # Станция не активна, пропускаем
+        realname = result['name']
+        codec = result['codec'] or "Неизвестно"
+        bitrate = result['bitrate'] or "Неизвестно"
+        genre = result['genre'] or "Неизвестно"
+        
+        # Обработка "Неизвестно"
+        if realname == "Неизвестно": realname = None # Будет заменено на OLDNAME
+        if bitrate == "Неизвестно": bitrate = "N/A"
+        if codec == "Неизвестно": codec = "N/A"
+        if genre == "Неизвестно": genre = "N/A"
+            
+        # Попытка извлечь чистый формат из content-type
+        if '/' in codec:
+            codec = codec.split('/')[-1].upper()
+        
+        return {
+            "REALNAME": realname,
+            "CODEC": codec,
+            "BITRATE": bitrate,
+            "GENRE": genre
+        }
+
+    def build_new_name(self, template: str, oldname: str, info_dict: dict) -> str:
+        """
+        Формирует новое имя на основе шаблона и данных.
+        """
+        if not info_dict:
+            return oldname # Если не удалось распарсить, оставляем как есть
+    
+        realname = info_dict["REALNAME"] if info_dict["REALNAME"] else oldname
+        # Создаем копию словаря и добавляем OLDNAME
+        tags = info_dict.copy()
+        tags["OLDNAME"] = oldname
+        tags["REALNAME"] = realname
+
+        result = template
+        
+        # Замена всех возможных тегов
+        for tag, value in tags.items():
+            result = result.replace(f"[{tag}]", value if value else "N/A")
+        return result
+
+    def fix_names(self, stations_data: list, template: str, apply_to_all: bool = True):
+        """
+        Основной метод переименования.
+        :param stations_data: Список кортежей (row, oldname, результат проверки или None)
+        :param template: Шаблон строки
+        :param apply_to_all: Если True - обрабатываем все, иначе только первую строку
+        :return: Словарь {row: новое имя} для измененных строк
+        """
+        new_names = {}
+        for row, oldname, result in stations_data:
+            info_dict = self.tags_from_result(result)
+            if info_dict: # Только если станция активна
+                new_name = self.build_new_name(template, oldname, info_dict)
+                if new_name != oldname: # Избегаем ненужного изменения
+                    new_names[row] = new_name
+                
+                if not apply_to_all:
+                    break # Обрабатываем только первую
+       
+        return new_names
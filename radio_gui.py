@@ -0,0 +1,3836 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # Начало запуска, время до показа окна выводится в лог
+import os
+import sys
+import json
+import sqlite3
+import re  
+import threading
+import bisect
+import operator
+import ssl
+import socket
+import select
+import errno
+import http.client
+from pathlib import Path
+from array import array
+from collections import Counter
+from itertools import accumulate, compress
+from urllib.parse import urlsplit, urljoin
+from PyQt6.QtWidgets import *
+from PyQt6.QtCore import *
+from PyQt6.QtGui import *
+from radio_core import (RENAME_VARIABLES, DEFAULT_RENAME_TEMPLATE, ConfigManager, DataProcessor, DnsCache,
+                        IcyDemuxer, NameFixer, ProbeCache, StationChecker, duplicate_key)
+
+
+
+class CsvLoadThread(QThread):
+    """
+    Потоковая загрузка CSV: файл читается построчно в фоне, проверенные станции
+    передаются в таблицу пачками по мере разбора. Загрузку можно отменить.
+    Если передан кэш проверок, сохраненные результаты подставляются в поле 'info' станций.
+    """
+
+    batch_loaded = pyqtSignal(list, list)          # станции, сообщения для лога
+    progress_changed = pyqtSignal(int)             # процент прочитанного файла
+    loading_finished = pyqtSignal(int, int, bool)  # успешно, ошибок, отменено
+
+    FIRST_BATCH_SIZE = 500  # Первая пачка маленькая, чтобы таблица появилась сразу
+    BATCH_SIZE = 20000
+    BATCH_INTERVAL = 0.1    # Не реже раза в 100 мс
+
+    def __init__(self, file_path, parent=None, cache=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.cache = cache
+        self.cancel_flag = False
+        self.cached_count = 0
+        self.cached_dead = 0
+
+    def cancel(self):
+        """Остановить загрузку после текущей строки"""
+        self.cancel_flag = True
+
+    def run(self):
+        processor = DataProcessor()
+        success_count = 0
+        error_count = 0
+        batch = []
+        batch_limit = self.FIRST_BATCH_SIZE
+        last_emit = time.monotonic()
+        last_percent = -1
+
+        try:
+            total_size = max(Path(self.file_path).stat().st_size, 1)
+            read_size = 0
+            line_num = 0
+            with open(self.file_path, 'rb') as f:
+                for raw_line in f:
+                    if self.cancel_flag:
+                        break
+                    read_size += len(raw_line)
+                    # splitlines: разделители кроме \n (например, одиночный \r) тоже разбивают строку
+                    for line in raw_line.decode('utf-8', errors='ignore').splitlines() or ['']:
+                        line_num += 1
+                        try:
+                            station = processor.parse_line(line, line_num)
+                        except Exception as e:
+                            error_count += 1
+                            processor.log(f"Строка {line_num}: Ошибка: {str(e)}")
+                            continue
+                        if station is not None:
+                            batch.append(station)
+                            success_count += 1
+
+                    if len(batch) >= batch_limit or time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                        self._emit_batch(batch, processor)
+                        batch = []
+                        batch_limit = self.BATCH_SIZE
+                        last_emit = time.monotonic()
+                        percent = read_size * 100 // total_size
+                        if percent != last_percent:
+                            last_percent = percent
+                            self.progress_changed.emit(percent)
+
+            if not self.cancel_flag:
+                processor.log(f"Обработано: {success_count} успешно, {error_count} ошибок")
+        except Exception as e:
+            processor.log(f"Ошибка при обработке файла: {str(e)}")
+
+        self._emit_batch(batch, processor)
+        self.loading_finished.emit(success_count, error_count, self.cancel_flag)
+
+    def _emit_batch(self, batch, processor):
+        if batch and self.cache is not None and self.cache.enabled:
+            self._apply_cached_results(batch)
+        if batch or processor.log_messages:
+            self.batch_loaded.emit(batch, processor.log_messages)
+            processor.log_messages = []
+
+    def _apply_cached_results(self, batch):
+        """Подставить результаты прошлых проверок из кэша (в поле 'result' станции)"""
+        cached = self.cache.get_many([station['url'] for station in batch], include_transient=True)
+        if not cached:
+            return
+        for station in batch:
+            result = cached.get(station['url'])
+            if result is None:
+                continue
+            station['result'] = result
+            self.cached_count += 1
+            if result['status'] != 'OK':
+                self.cached_dead += 1
+
+
+class StatusBar(QStatusBar):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        self.setFixedHeight(24)
+        
+        # Текстовое поле для сообщений
+        self.message_label = QLabel()
+        self.message_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        self.message_label.setStyleSheet("QLabel { padding: 0 5px; }")
+        self.message_label.setFixedWidth(300)  # Фиксированная ширина
+        self.message_label.setWordWrap(False)
+        self.addWidget(self.message_label)
+        
+        # Прогресс-бар
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        # self.progress_bar.setFixedWidth(300)
+        self.progress_bar.setFixedHeight(16)
+        #self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        self.addWidget(self.progress_bar, 1)
+
+        # Текущее число одновременных проверок в адаптивном режиме
+        self.concurrency_label = QLabel()
+        self.concurrency_label.setStyleSheet("QLabel { padding: 0 5px; }")
+        self.concurrency_label.hide()
+        self.addPermanentWidget(self.concurrency_label)
+        
+    def show_message(self, text, timeout=0):
+        """Показать сообщение в статус-баре"""
+        self.message_label.setText(text)
+        if timeout > 0:
+            QTimer.singleShot(timeout * 1000, self.clear_message)
+    
+    def clear_message(self):
+        """Очистить сообщение в статус-баре"""
+        self.message_label.setText("")
+    
+    def show_progress(self, show=True):
+        """Показать/скрыть прогресс-бар"""
+        self.progress_bar.setVisible(show)
+        if not show:
+            self.progress_bar.setValue(0)
+    
+    def set_progress(self, value):
+        """Установить значение прогресс-бара"""
+        self.progress_bar.setValue(value)
+    
+    def set_concurrency(self, value):
+        """Показать число одновременных проверок, None - скрыть"""
+        if value is None:
+            self.concurrency_label.hide()
+            return
+        self.concurrency_label.setText(f"Параллельно: {value}")
+        self.concurrency_label.show()
+
+    def set_progress_range(self, min_val, max_val):
+        """Установить диапазон прогресс-бара"""
+        self.progress_bar.setRange(min_val, max_val)
+
+
+class ThemeManager:
+
+    COMMON_STYLE = """
+        /*Поле поиска*/               
+        QLineEdit.search{
+            padding: 5px;
+            font-size: 14px;
+            border: 1px solid #d0d0d0;
+            border-radius: 4px;
+            padding-right: 60px;
+            margin-right: 12px; 
+        }
+        QLabel.searchStatus {
+            color: #666;
+            font-size: 12px;
+            background: transparent;
+            padding-right: 5px;
+        } 
+                        
+        /*Кнопки общий стиль*/
+        QPushButton.norm {
+            background-color: #5c7080;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            font-size: 14px;
+            min-width: 100px;
+        }
+        QPushButton.norm:hover {
+            background-color: #6f8dab;
+        }
+        QPushButton.norm:pressed {
+            background-color: #4a5d6c;
+        }
+        QPushButton.norm:disabled {
+            background-color: #cccccc;
+            color: #666666;
+        }  
+        /*Кнопки крит*/
+        QPushButton.crit {
+            background-color: #c44d58;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            font-size: 14px;
+            min-width: 100px;
+        }
+        QPushButton.crit:hover {
+            background-color: #d66e78;
+        }
+        QPushButton.crit:pressed {
+            background-color: #a33d47;
+        }
+        QPushButton.crit:disabled {
+            background-color: #cccccc;
+            color: #666666;
+        }
+                        
+        /*Кнопки поиска*/
+        QPushButton.navi {
+            background-color: #5c7080;
+            color: white;
+            border: none;
+            padding: 0;
+            border-radius: 4px;
+            font-size: 14px;
+            min-width: 30px;
+            max-width: 30px;
+            height:34px;
+            width:34px;
+            margin-right:6px;
+        }
+        QPushButton.navi:hover {
+            background-color: #6f8dab;
+        }
+        QPushButton.navi:pressed {
+            background-color: #4a5d6c;
+        }
+        QPushButton.navi:disabled {
+            background-color: #cccccc;
+            color: #666666;
+        }
+    """
+
+    @staticmethod
+    def apply_theme(theme_name):
+        app = QApplication.instance()
+        
+        if theme_name == "light":
+            palette = QPalette()
+            palette.setColor(QPalette.ColorRole.Window, QColor(240, 242, 245))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(45, 45, 45))
+            palette.setColor(QPalette.ColorRole.Base, QColor(255, 255, 255))
+            palette.setColor(QPalette.ColorRole.AlternateBase, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(255, 255, 255))
+            palette.setColor(QPalette.ColorRole.ToolTipText, QColor(45, 45, 45))
+            palette.setColor(QPalette.ColorRole.Text, QColor(45, 45, 45))
+            palette.setColor(QPalette.ColorRole.Button, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(45, 45, 45))
+            palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 255, 255))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(92, 112, 128))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+            app.setPalette(palette)
+            # Добавляем цвета для подсветки
+            app.setProperty("highlight_color", QColor(65, 105, 225))  # RoyalBlue для светлой темы
+            app.setProperty("error_color", QColor(220, 20, 60))      # Crimson для светлой темы
+            
+            # Стили для светлой темы
+            theme_style = """
+                QLineEdit {
+                    color: #333333;
+                    background-color: white;
+                    border: 1px solid #d0d0d0;
+                    border-radius: 4px;
+                    padding: 0px;
+                }
+                QTableView {
+                    gridline-color: #e0e0e0;
+                    font-size: 12pt;
+                }
+                QHeaderView::section {
+                    background-color: #f0f0f0;
+                    padding: 4px;
+                    border: 1px solid #d0d0d0;
+                    font-weight: bold;
+                }
+                QTableView::item {
+                    padding: 6px;
+                    border-bottom: 1px solid #e0e0e0;
+                }
+                QStatusBar {
+                    background-color: #f0f0f0;
+                    border-top: 1px solid #d0d0d0;
+                    padding: 2px;
+                }
+                QStatusBar QLabel {
+                    color: #333;
+                    padding: 0 5px;
+                }
+            """
+            
+        elif theme_name == "dark":
+            palette = QPalette()
+            palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.Base, QColor(42, 42, 42))
+            palette.setColor(QPalette.ColorRole.AlternateBase, QColor(66, 66, 66))
+            palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(53, 53, 53))
+            palette.setColor(QPalette.ColorRole.ToolTipText, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.Text, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.Button, QColor(66, 66, 66))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(240, 240, 240))
+            palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 255, 255))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(111, 141, 171))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+            app.setPalette(palette)
+            # Добавляем цвета для подсветки
+            app.setProperty("highlight_color", QColor(100, 149, 237))  # CornflowerBlue для темной темы
+            app.setProperty("error_color", QColor(255, 69, 0))        # OrangeRed для темной темы
+
+
+            # Стили для темной темы
+            theme_style ="""
+        
+                QLineEdit {
+                     color: #e0e0e0;
+                     background-color: #424242;
+                     border: 1px solid #555;
+                     border-radius: 4px;
+                     padding: 0px;
+                 }
+                QTableView {
+                    gridline-color: #444;
+                    font-size: 12pt;
+                }
+                QHeaderView::section {
+                    background-color: #444;
+                    color: #eee;
+                    padding: 4px;
+                    border: 1px solid #555;
+                    font-weight: bold;
+                }
+                QTableView::item {
+                    padding: 4px;
+                    border-bottom: 1px solid #444;
+                }
+                QStatusBar {
+                    background-color: #333;
+                    border-top: 1px solid #555;
+                    padding: 2px;
+                }
+                QStatusBar QLabel {
+                    color: #e0e0e0;
+                    padding: 0 5px;
+                }
+            """
+        full_style = ThemeManager.COMMON_STYLE + theme_style
+        app.setStyleSheet(full_style)
+
+
+class DeleteInactiveDialog(QDialog):
+    def __init__(self, config_flags, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Удаление неактивных станций")
+        self.setFixedSize(300, 200)
+        
+        layout = QVBoxLayout()
+        
+        # Текстовое сообщение
+        layout.addWidget(QLabel("Выберите флаги для удаления:"))
+        
+        # Список флагов с чекбоксами
+        self.flags_layout = QVBoxLayout()
+        self.checkboxes = {}
+        flags = [
+            ("404", "HTTP 404 (Страница не найдена)"),
+            ("Error", "Любая ошибка сервера"), 
+            ("ConnError", "Ошибка соединения"),
+            ("Timeout", "Таймаут запроса")
+        ]
+        
+        # Создаем чекбоксы для каждого флага
+        for flag_key, flag_label in flags:
+            checkbox = QCheckBox(flag_label)
+            checkbox.setChecked(config_flags.get(flag_key, True))  # По умолчанию включены
+            self.checkboxes[flag_key] = checkbox
+            self.flags_layout.addWidget(checkbox)
+        
+        layout.addLayout(self.flags_layout)
+        layout.addSpacing(10)
+        
+        # Сообщение подтверждения
+        layout.addWidget(QLabel("Удалить неактивные станции?"))
+        
+        # Кнопки
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | 
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.setLayout(layout)
+    
+    def get_selected_flags(self):
+        """Возвращает список выбранных флагов в формате [Тип]"""
+        flags = []
+        for flag_key, checkbox in self.checkboxes.items():
+            if checkbox.isChecked():
+                flags.append(f"[{flag_key}]")
+        return flags
+    
+
+class SettingsDialog(QDialog):
+    def __init__(self, current_theme, max_threads, current_timeout, current_rename_template, parent=None,
+                 current_engine='threads', async_concurrency=500, per_host_limit=4, probe_mode='get',
+                 cache_ttl_hours=24, check_mode='full', recheck_hours=24, player_proxy=False,
+                 duplicates_by_final_url=False, adaptive_concurrency=False, connect_timeout=3,
+                 connect_prefilter=True, retry_attempts=2, retry_delay=1):
+        super().__init__(parent)
+        self.setWindowTitle("Настройки")
+        self.setMinimumWidth(400)
+
+        layout = QVBoxLayout()
+
+        # Настройки разложены по вкладкам, чтобы окно помещалось на небольших экранах
+        tabs = QTabWidget()
+        general_layout = QVBoxLayout()
+        check_layout = QVBoxLayout()
+        network_layout = QVBoxLayout()
+        cache_layout = QVBoxLayout()
+        
+        # Выбор темы
+        general_layout.addWidget(QLabel("Тема оформления:"))
+        self.theme_combo = QComboBox()
+        self.theme_combo.addItem("Светлая", "light")
+        self.theme_combo.addItem("Темная", "dark")
+        
+        # Устанавливаем текущую тему
+        index = self.theme_combo.findData(current_theme)
+        if index >= 0:
+            self.theme_combo.setCurrentIndex(index)
+            
+        general_layout.addWidget(self.theme_combo)
+
+        # Плеер через локальный прокси
+        self.player_proxy_check = QCheckBox("Плеер: одно соединение со станцией (локальный прокси)")
+        self.player_proxy_check.setChecked(player_proxy)
+        general_layout.addWidget(self.player_proxy_check)
+
+        # Дубли по адресу потока после редиректов
+        self.final_url_duplicates_check = QCheckBox("Дубли: сравнивать адреса потоков после редиректов")
+        self.final_url_duplicates_check.setChecked(duplicates_by_final_url)
+        general_layout.addWidget(self.final_url_duplicates_check)
+
+        # Шаблон переименования 
+        general_layout.addWidget(QLabel("Шаблон \"Фикса Названий\":"))
+        self.rename_template_edit = QTextEdit()
+        self.rename_template_edit.setMaximumHeight(80)
+        self.rename_template_edit.setPlainText(current_rename_template)
+        general_layout.addWidget(self.rename_template_edit)
+
+        # Кнопки вставки переменных в настройках
+        general_layout.addWidget(QLabel("Вставить переменную:"))
+        variables_layout = QHBoxLayout()
+        for var in RENAME_VARIABLES:
+            btn = QPushButton(var)
+            # Очень важно зафиксировать значение 'var' в лямбда-выражении!
+            btn.clicked.connect(lambda checked, v=var: self.insert_variable_to_settings(v))
+            variables_layout.addWidget(btn)
+        variables_layout.addStretch()
+        general_layout.addLayout(variables_layout)
+
+        # Количество потоков для проверки
+        check_layout.addWidget(QLabel("Потоков для проверки станций:"))
+        self.threads_spin = QSpinBox()
+        self.threads_spin.setRange(1, 50)
+        self.threads_spin.setValue(max_threads)
+        check_layout.addWidget(self.threads_spin)
+
+        # Адаптивный режим: заданные значения - начальный уровень
+        self.adaptive_check = QCheckBox("Подбирать число проверок автоматически")
+        self.adaptive_check.setChecked(adaptive_concurrency)
+        check_layout.addWidget(self.adaptive_check)
+
+        # Движок проверки
+        check_layout.addWidget(QLabel("Движок проверки станций:"))
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("Потоки (пул рабочих потоков)", "threads")
+        self.engine_combo.addItem("asyncio (неблокирующие сокеты)", "asyncio")
+        index = self.engine_combo.findData(current_engine)
+        if index >= 0:
+            self.engine_combo.setCurrentIndex(index)
+        check_layout.addWidget(self.engine_combo)
+
+        # Количество одновременных проверок для asyncio
+        check_layout.addWidget(QLabel("Одновременных проверок (asyncio):"))
+        self.async_concurrency_spin = QSpinBox()
+        self.async_concurrency_spin.setRange(1, 5000)
+        self.async_concurrency_spin.setValue(async_concurrency)
+        check_layout.addWidget(self.async_concurrency_spin)
+
+        # Режим запроса к станции
+        check_layout.addWidget(QLabel("Режим запроса:"))
+        self.probe_mode_combo = QComboBox()
+        self.probe_mode_combo.addItem("GET (один запрос, полная информация)", "get")
+        self.probe_mode_combo.addItem("HEAD (только доступность, быстрее)", "head")
+        self.probe_mode_combo.addItem("HEAD + GET (старый способ)", "head_get")
+        index = self.probe_mode_combo.findData(probe_mode)
+        if index >= 0:
+            self.probe_mode_combo.setCurrentIndex(index)
+        check_layout.addWidget(self.probe_mode_combo)
+
+        # Таймаут проверки
+        check_layout.addWidget(QLabel("Таймаут проверки (сек.):"))
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(1, 60)
+        self.timeout_spin.setValue(current_timeout)
+        self.timeout_spin.setSuffix(" сек")
+        check_layout.addWidget(self.timeout_spin)
+
+        # Повторы при таймауте, обрыве соединения и перегрузке сервера
+        check_layout.addWidget(QLabel("Попыток при временном сбое (1 - без повторов):"))
+        self.retry_attempts_spin = QSpinBox()
+        self.retry_attempts_spin.setRange(1, 5)
+        self.retry_attempts_spin.setValue(retry_attempts)
+        check_layout.addWidget(self.retry_attempts_spin)
+
+        check_layout.addWidget(QLabel("Пауза перед первым повтором (сек.):"))
+        self.retry_delay_spin = QSpinBox()
+        self.retry_delay_spin.setRange(1, 30)
+        self.retry_delay_spin.setValue(retry_delay)
+        self.retry_delay_spin.setSuffix(" сек")
+        check_layout.addWidget(self.retry_delay_spin)
+
+        # Лимит соединений на один сервер
+        network_layout.addWidget(QLabel("Соединений к одному серверу:"))
+        self.per_host_spin = QSpinBox()
+        self.per_host_spin.setRange(1, 64)
+        self.per_host_spin.setValue(per_host_limit)
+        network_layout.addWidget(self.per_host_spin)
+
+        # Таймаут установки соединения, отдельно от ожидания ответа
+        network_layout.addWidget(QLabel("Таймаут соединения (сек.):"))
+        self.connect_timeout_spin = QSpinBox()
+        self.connect_timeout_spin.setRange(1, 30)
+        self.connect_timeout_spin.setValue(connect_timeout)
+        self.connect_timeout_spin.setSuffix(" сек")
+        network_layout.addWidget(self.connect_timeout_spin)
+
+        # Первая фаза: DNS и TCP-соединение с каждым сервером
+        self.connect_prefilter_check = QCheckBox("Сначала проверять доступность серверов (DNS и соединение)")
+        self.connect_prefilter_check.setChecked(connect_prefilter)
+        network_layout.addWidget(self.connect_prefilter_check)
+
+        # Срок хранения результатов проверки
+        cache_layout.addWidget(QLabel("Хранить результаты проверки (0 - не хранить):"))
+        self.cache_ttl_spin = QSpinBox()
+        self.cache_ttl_spin.setRange(0, 720)
+        self.cache_ttl_spin.setValue(cache_ttl_hours)
+        self.cache_ttl_spin.setSuffix(" ч")
+        cache_layout.addWidget(self.cache_ttl_spin)
+
+        # Инкрементальная проверка
+        self.incremental_check = QCheckBox("Проверять только новые, измененные, устаревшие и сбойные")
+        self.incremental_check.setChecked(check_mode == 'incremental')
+        cache_layout.addWidget(self.incremental_check)
+        cache_layout.addWidget(QLabel("Перепроверять станции старше:"))
+        self.recheck_spin = QSpinBox()
+        self.recheck_spin.setRange(1, 720)
+        self.recheck_spin.setValue(recheck_hours)
+        self.recheck_spin.setSuffix(" ч")
+        cache_layout.addWidget(self.recheck_spin)
+
+        for title, tab_layout in (("Общие", general_layout), ("Проверка", check_layout),
+                                  ("Сеть", network_layout), ("Кэш", cache_layout)):
+            tab_layout.addStretch()
+            tab = QWidget()
+            tab.setLayout(tab_layout)
+            tabs.addTab(tab, title)
+        layout.addWidget(tabs)
+
+        # Кнопки
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | 
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.setLayout(layout)
+
+    def insert_variable_to_settings(self, variable):
+        """Вставить переменную в поле шаблона настроек"""
+        cursor = self.rename_template_edit.textCursor()
+        cursor.insertText(variable)
+        self.rename_template_edit.setFocus()
+
+    def get_selected_theme(self):
+        return self.theme_combo.currentData()
+    
+    def get_max_threads(self):
+        return self.threads_spin.value()
+    
+    def get_timeout(self):
+        return self.timeout_spin.value()
+
+    def get_connect_timeout(self):
+        return self.connect_timeout_spin.value()
+
+    def get_connect_prefilter(self):
+        return self.connect_prefilter_check.isChecked()
+
+    def get_retry_attempts(self):
+        return self.retry_attempts_spin.value()
+
+    def get_retry_delay(self):
+        return self.retry_delay_spin.value()
+
+    def get_adaptive_concurrency(self):
+        return self.adaptive_check.isChecked()
+
+    def get_engine(self):
+        return self.engine_combo.currentData()
+
+    def get_async_concurrency(self):
+        return self.async_concurrency_spin.value()
+
+    def get_per_host_limit(self):
+        return self.per_host_spin.value()
+
+    def get_probe_mode(self):
+        return self.probe_mode_combo.currentData()
+
+    def get_cache_ttl(self):
+        return self.cache_ttl_spin.value()
+
+    def get_check_mode(self):
+        return 'incremental' if self.incremental_check.isChecked() else 'full'
+
+    def get_recheck_hours(self):
+        return self.recheck_spin.value()
+
+    def get_player_proxy(self):
+        return self.player_proxy_check.isChecked()
+
+    def get_duplicates_by_final_url(self):
+        return self.final_url_duplicates_check.isChecked()
+
+    def get_rename_template(self):
+        return self.rename_template_edit.toPlainText().strip()
+
+
+class RenameTemplateDialog(QDialog):
+    def __init__(self, current_template, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Фикс Названий - Шаблон")
+        self.setFixedSize(500, 350)
+        
+        layout = QVBoxLayout()
+        
+        # Предупреждающий текст
+        warning_label = QLabel(
+            "Внимание! Это действие изменит названия активных станций.\n"
+            "Используйте переменные для задания шаблона."
+        )
+        warning_label.setWordWrap(True)
+        layout.addWidget(warning_label)
+        
+        # Поле шаблона
+        layout.addWidget(QLabel("Шаблон переименования:"))
+        self.template_edit = QTextEdit()
+        self.template_edit.setPlainText(current_template)
+        self.template_edit.setMaximumHeight(100)
+        layout.addWidget(self.template_edit)
+        
+        # Кнопки вставки переменных
+        layout.addWidget(QLabel("Вставить переменную:"))
+        variables_layout = QHBoxLayout()
+        for var in RENAME_VARIABLES:
+            btn = QPushButton(var)
+            btn.clicked.connect(lambda checked, v=var: self.insert_variable(v))
+            variables_layout.addWidget(btn)
+        variables_layout.addStretch()
+        layout.addLayout(variables_layout)
+        
+        # Кнопки выбора действия
+        buttons_layout = QHBoxLayout()
+        self.all_btn = QPushButton("Все")
+        self.selected_btn = QPushButton("Выбранный")
+        self.cancel_btn = QPushButton("Отмена")
+        
+        self.all_btn.clicked.connect(lambda: self.done(1)) # Вернём 1
+        self.selected_btn.clicked.connect(lambda: self.done(2)) # Вернём 2
+        self.cancel_btn.clicked.connect(self.reject) # Вернём QDialog.Rejected
+        
+        buttons_layout.addWidget(self.all_btn)
+        buttons_layout.addWidget(self.selected_btn)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.cancel_btn)
+        layout.addLayout(buttons_layout)
+        
+        self.setLayout(layout)
+
+    def insert_variable(self, variable):
+        """Вставить переменную в текущую позицию курсора"""
+        cursor = self.template_edit.textCursor()
+        cursor.insertText(variable)
+        self.template_edit.setFocus()
+
+    def get_template(self):
+        """Получить текущий шаблон из текстового поля"""
+        return self.template_edit.toPlainText().strip()
+    
+
+class EditDialog(QDialog):
+    def __init__(self, row_data, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Редактирование записи")
+        self.setFixedSize(400, 300)
+        
+        layout = QVBoxLayout()
+        
+        # Название
+        layout.addWidget(QLabel("Название станции:"))
+        self.name_edit = QLineEdit(row_data[0])
+        layout.addWidget(self.name_edit)
+        
+        # Адрес (большое поле)
+        layout.addWidget(QLabel("Адрес станции:"))
+        self.address_edit = QTextEdit(row_data[1])
+        self.address_edit.setAcceptRichText(False)
+        self.address_edit.setMinimumHeight(100)
+        layout.addWidget(self.address_edit)
+        
+        # Volume
+        layout.addWidget(QLabel("Volume:"))
+        self.volume_spin = QSpinBox()
+        self.volume_spin.setRange(-64, 64)
+        self.volume_spin.setValue(int(row_data[2]))
+        layout.addWidget(self.volume_spin)
+        
+        # Кнопки
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | 
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.setLayout(layout)
+    
+    def get_data(self):
+        return [
+            self.name_edit.text(),
+            self.address_edit.toPlainText(),
+            str(self.volume_spin.value())
+        ]
+
+
+class HelpDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Справка - Radio Manager")
+        self.setFixedSize(600, 700)
+        
+        layout = QVBoxLayout()
+        
+        # Заголовок
+        title_label = QLabel("Radio Manager v1.0.0")
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title_label.setStyleSheet("""
+            QLabel {
+                font-size: 24px;
+                font-weight: bold;
+                color: #5c7080;
+                margin: 10px;
+            }
+        """)
+        layout.addWidget(title_label)
+        
+        # Описание
+        description_label = QLabel("Приложение для управления плейлистами интернет-радиостанций")
+        description_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        description_label.setStyleSheet("""
+            QLabel {
+                font-size: 14px;
+                color: #666;
+                margin-bottom: 20px;
+            }
+        """)
+        layout.addWidget(description_label)
+        
+        # Основной текст справки с встроенными стилями
+        help_text = """
+        <style>
+            h2 {
+                color: #5c7080;
+                border-bottom: 1px solid #e0e0e0;
+                padding-bottom: 5px;
+                margin-top: 20px;
+            }
+            ul {
+                margin-top: 10px;
+                margin-bottom: 15px;
+            }
+            li {
+                margin-bottom: 5px;
+            }
+            a {
+                color: #5c7080;
+                text-decoration: none;
+                text-decoration: underline;
+
+            }
+            a:hover {
+                color: #6f8dab;
+                text-decoration: underline;
+            }
+            p{
+                font-size:16px;
+            }
+        </style>
+        
+        <h2>Возможности:</h2>
+        <ul>
+            <li>Проверка файла CSV при открытии, устранение проблем синтаксиса.</li>
+            <li>Многопоточная проверка станций на существование</li>
+            <li>Сбор информации о станциях (название, контейнер, качество потока).</li>
+            <li>Удаление неактивных станций.</li>
+            <li>Массовое переименование станций по шаблонам.</li>
+            <li>Живой поиск станций по имени, адресу, или информации.</li>
+            <li>Поиск и удаление дубликатов станций по адресам.</li>
+            <li>Массовое переименование протоколов (https->http).</li>
+            <li>Редактирование станции через окно редактора, или по щелчку на ячейку таблицы.</li>
+            <li>Сортировка плейлиста мышью.</li>
+            <li>Интерактивный обмен станциями между плейлистами (копиями программы).</li>
+            <li>Прослушивание потоков в приложении.</li>
+            <li>Светлая и темная тема оформления.</li>
+            <li>Сохранение плейлиста в формате CSV для ёрадио.</li>
+        </ul>
+        
+        <h2><a href="https://github.com/leowerd/radio-manager/blob/main/README.md#%D1%81%D0%BF%D1%80%D0%B0%D0%B2%D0%BA%D0%B0">Мануал с картинками</a></h2>
+        <p>Скачать свежую версию, или сообщить об ошибке можно на <a href="https://github.com/leowerd/radio-manager/"><b>гитхабе</b></a>.</p>
+        
+        <p><b>Автор: werdes</b></p>
+        """
+        
+        help_browser = QTextBrowser()
+        help_browser.setOpenExternalLinks(True)
+        help_browser.setHtml(help_text)
+        
+        # Установка стилей для текстового браузера
+        help_browser.setStyleSheet("""
+            QTextBrowser {
+                border: none;
+                background: transparent;
+                font-size: 13px;
+                selection-background-color: #5c7080;
+                selection-color: white;
+            }
+        """)
+        
+        layout.addWidget(help_browser)
+        
+        # Кнопка закрытия
+        close_button = QPushButton("Закрыть")
+        close_button.setProperty("class", "norm")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+        
+        self.setLayout(layout)
+
+class IntegerValidatorDelegate(QStyledItemDelegate):
+    """Делегат для валидации целых чисел"""
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setValidator(QIntValidator(-64, 64, editor))  # Ограничение 
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, Qt.ItemDataRole.EditRole)
+        editor.setText(str(value))
+
+    def setModelData(self, editor, model, index):
+        value = editor.text()
+        model.setData(index, value, Qt.ItemDataRole.EditRole)
+
+
+class UIStateManager(QObject):
+    def update_state(self):
+        """Обновляет состояние UI на основе текущих флагов"""
+        base_enabled = not self.is_checking and not self.is_loading
+        
+        # Во время загрузки кнопка открытия работает как "Отмена"
+        self.main.open_csv_btn.setEnabled(not self.is_checking)
+        self.main.save_csv_btn.setEnabled(base_enabled and self.has_data)
+        self.main.add_btn.setEnabled(base_enabled)
+        self.main.edit_btn.setEnabled(base_enabled and self.row_selected)
+        self.main.del_btn.setEnabled(base_enabled and self.row_selected)
+        self.main.find_duplicates_btn.setEnabled(base_enabled and self.has_data)
+        self.main.find_inactive_btn.setEnabled(self.has_data and not self.is_loading)
+        self.main.fix_https_btn.setEnabled(base_enabled and self.has_data)
+        self.main.player_btn.setEnabled(base_enabled and self.row_selected)
+        self.main.settings_btn.setEnabled(base_enabled)
+        self.main.search_edit.setEnabled(base_enabled)
+        
+        # Новые состояния кнопок удаления
+        self.main.remove_duplicates_btn.setEnabled(
+            base_enabled and self.has_duplicates
+        )
+        self.main.remove_inactive_btn.setEnabled(
+            base_enabled and (self.check_completed or (self.is_checking and self.found_inactive))
+        )
+        
+        # Кнопка "Фикс названий"
+        self.main.fix_names_btn.setEnabled(base_enabled and self.check_completed)
+    
+    def __init__(self, main_window):
+        super().__init__()
+        self.main = main_window
+        
+        # Инициализация состояний
+        self.has_data = False
+        self.row_selected = False
+        self.is_checking = False
+        self.is_loading = False
+        self.check_completed = False
+        self.has_duplicates = False
+        self.found_inactive = False  # Новый флаг: найдены ли битые станции
+        
+        self.update_state()
+
+
+
+class StationTableModel(QAbstractTableModel):
+    """
+    Модель таблицы станций. Данные хранятся по колонкам (списки строк и массив громкостей),
+    объекты на каждую ячейку не создаются, представление запрашивает только видимые строки.
+    Результат проверки кроме текста «Информации» хранится по полям (статус, кодек, битрейт...),
+    фильтры и переименование работают с полями, не разбирая текст.
+    """
+
+    HEADERS = ["Название", "Адрес", "Volume", "Информация"]
+    NAME, URL, VOLUME, INFO = range(4)
+    DEFAULT_INFO = "-"
+
+    # Подсветка строк хранится кодом в bytearray: 0 - обычная, 1 - найдено, 2 - ошибка
+    HIGHLIGHT_CODES = {"default": 0, "highlight": 1, "error": 2}
+    HIGHLIGHT_COLORS = {1: "highlight_color", 2: "error_color"}
+    # При большем числе блоков удаляемых строк колонки пересобираются целиком
+    MAX_REMOVE_BLOCKS = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.urls = []
+        self.volumes = array('b')
+        self.infos = []
+        self.highlights = bytearray()
+        self._highlighted = set()  # Номера подсвеченных строк, None - пересчитать по highlights
+        self._changed_rows = None  # Измененные строки текущего dataChanged, если изменен не весь диапазон
+        self._reset_result_fields(0)
+
+    def _reset_result_fields(self, row_count):
+        """Поля результатов проверки: None (или 0 для битрейта) - нет данных"""
+        self.statuses = [None] * row_count
+        self.stream_types = [None] * row_count
+        self.real_names = [None] * row_count
+        self.codecs = [None] * row_count
+        self.genres = [None] * row_count
+        self.bitrates = array('i', bytes(4 * row_count))
+        self.final_urls = [None] * row_count  # Адрес потока после редиректов, сбрасывается при смене адреса
+
+    def _columns(self):
+        """Все параллельные хранилища строк (для вставки, удаления и перемещения)"""
+        return (self.names, self.urls, self.volumes, self.infos, self.highlights,
+                self.statuses, self.stream_types, self.real_names, self.codecs, self.genres, self.bitrates,
+                self.final_urls)
+
+    @staticmethod
+    def parse_bitrate(value):
+        """Битрейт числом (первое число в icy-br, например "128,64"), 0 - неизвестен"""
+        match = re.match(r'\s*(\d+)', value or '')
+        return int(match.group(1)) if match else 0
+
+    def _store_result(self, row, result):
+        """Записать поля результата проверки (None - очистить)"""
+        if result is None:
+            self.statuses[row] = self.stream_types[row] = self.real_names[row] = None
+            self.codecs[row] = self.genres[row] = None
+            self.bitrates[row] = 0
+            return
+        self.statuses[row] = result['status']
+        self.stream_types[row] = result['stream_type']
+        self.real_names[row] = result['name']
+        self.codecs[row] = result['codec']
+        self.genres[row] = result['genre']
+        self.bitrates[row] = self.parse_bitrate(result['bitrate'])
+        if result['final_url']:
+            self.final_urls[row] = result['final_url']
+
+    def result(self, row):
+        """Результат проверки строки словарем (как StationChecker.make_result) или None"""
+        status = self.statuses[row]
+        if status is None:
+            return None
+        bitrate = self.bitrates[row]
+        return StationChecker.make_result(
+            status, stream_type=self.stream_types[row], name=self.real_names[row],
+            codec=self.codecs[row], bitrate=str(bitrate) if bitrate else 'Неизвестно',
+            genre=self.genres[row], final_url=self.final_urls[row]
+        )
+
+    def set_results(self, results_by_row):
+        """Массово записать результаты проверки {строка: результат}"""
+        if not results_by_row:
+            return
+        for row, result in results_by_row.items():
+            self.infos[row] = StationChecker.format_info(result)
+            self._store_result(row, result)
+        self._emit_rows_changed(results_by_row, self.INFO)
+
+    @staticmethod
+    def parse_volume(value):
+        """Громкость из текста ячейки, вне диапазона -64..64 - 0"""
+        try:
+            volume = int(str(value).strip())
+        except ValueError:
+            return 0
+        return volume if -64 <= volume <= 64 else 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.urls)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def value(self, row, column):
+        """Текст ячейки"""
+        if column == self.NAME:
+            return self.names[row]
+        if column == self.URL:
+            return self.urls[row]
+        if column == self.VOLUME:
+            return str(self.volumes[row])
+        return self.infos[row]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.value(row, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == self.VOLUME:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.ForegroundRole:
+            code = self.highlights[row]
+            if code:
+                return QApplication.instance().property(self.HIGHLIGHT_COLORS[code])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if not index.isValid():
+            return flags
+        flags |= Qt.ItemFlag.ItemIsDragEnabled
+        # Информация заполняется проверкой, вручную не редактируется
+        if index.column() != self.INFO:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() == self.INFO:
+            return False
+        self._set_value(index.row(), index.column(), value)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def _set_value(self, row, column, value):
+        if column == self.NAME:
+            self.names[row] = str(value)
+        elif column == self.URL:
+            self.urls[row] = str(value)
+            self.final_urls[row] = None
+        elif column == self.VOLUME:
+            self.volumes[row] = self.parse_volume(value)
+        else:
+            # Текст из другого источника (метка дубля, перенос из другого окна) разбирается один раз
+            self.infos[row] = str(value)
+            self._store_result(row, StationChecker.parse_info(self.infos[row]))
+
+    def set_value(self, row, column, value):
+        """Изменить одну ячейку"""
+        self.set_column(column, {row: value})
+
+    def set_column(self, column, values_by_row):
+        """Массово изменить колонку: {строка: значение}, одно уведомление представлению на весь диапазон"""
+        if not values_by_row:
+            return
+        for row, value in values_by_row.items():
+            self._set_value(row, column, value)
+        self._emit_rows_changed(values_by_row, column)
+
+    def _emit_rows_changed(self, rows, column):
+        """
+        Уведомить об изменении колонки в строках rows одним сигналом на весь их диапазон.
+        Строки пачки результатов проверки идут вразброс, поэтому индексы поиска и дублей
+        берут точный список из changed_rows и не пересчитывают строки между ними.
+        """
+        rows = sorted(rows)
+        self._changed_rows = rows
+        try:
+            self.dataChanged.emit(self.index(rows[0], column), self.index(rows[-1], column))
+        finally:
+            self._changed_rows = None
+
+    def changed_rows(self, top_left, bottom_right):
+        """Строки, действительно измененные в обрабатываемом сейчас dataChanged"""
+        if self._changed_rows is not None:
+            return self._changed_rows
+        return range(top_left.row(), bottom_right.row() + 1)
+
+    def set_row(self, row, values):
+        """Изменить строку: [название, адрес, громкость(, информация)]"""
+        for column, value in enumerate(values[:len(self.HEADERS)]):
+            self._set_value(row, column, value)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def row_values(self, row):
+        """Тексты всех ячеек строки"""
+        return [self.value(row, column) for column in range(len(self.HEADERS))]
+
+    def set_stations(self, stations):
+        """Заменить все данные списком станций-словарей {'name', 'url', 'volume'}"""
+        self.beginResetModel()
+        self.names = [station['name'] for station in stations]
+        self.urls = [station['url'] for station in stations]
+        self.volumes = array('b', (self.parse_volume(station['volume']) for station in stations))
+        self.infos = [self.DEFAULT_INFO] * len(stations)
+        self.highlights = bytearray(len(stations))
+        self._highlighted = set()
+        self._reset_result_fields(len(stations))
+        self.endResetModel()
+
+    def append_stations(self, stations):
+        """Добавить станции-словари в конец таблицы (с результатом проверки в 'result', если есть)"""
+        if not stations:
+            return
+        first = len(self.urls)
+        self.beginInsertRows(QModelIndex(), first, first + len(stations) - 1)
+        self.names.extend(station['name'] for station in stations)
+        self.urls.extend(station['url'] for station in stations)
+        self.volumes.extend(self.parse_volume(station['volume']) for station in stations)
+        self.highlights.extend(bytes(len(stations)))
+        self.infos.extend([self.DEFAULT_INFO] * len(stations))
+        self.statuses.extend([None] * len(stations))
+        self.stream_types.extend([None] * len(stations))
+        self.real_names.extend([None] * len(stations))
+        self.codecs.extend([None] * len(stations))
+        self.genres.extend([None] * len(stations))
+        self.bitrates.extend([0] * len(stations))
+        self.final_urls.extend([None] * len(stations))
+        for row, station in enumerate(stations, first):
+            result = station.get('result')
+            if result is not None:
+                self.infos[row] = StationChecker.format_info(result)
+                self._store_result(row, result)
+        self.endInsertRows()
+
+    def stations(self):
+        """Список станций-словарей для сохранения"""
+        return [
+            {'name': name.strip(), 'url': url.strip(), 'volume': volume}
+            for name, url, volume in zip(self.names, self.urls, self.volumes)
+        ]
+
+    def insert_rows(self, row, rows_values):
+        """Вставить строки [название, адрес, громкость, информация] начиная с позиции row"""
+        if not rows_values:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(rows_values) - 1)
+        self.names[row:row] = [str(values[0]) for values in rows_values]
+        self.urls[row:row] = [str(values[1]) for values in rows_values]
+        self.volumes[row:row] = array('b', (self.parse_volume(values[2]) for values in rows_values))
+        self.infos[row:row] = [str(values[3]) if len(values) > 3 else self.DEFAULT_INFO for values in rows_values]
+        self.highlights[row:row] = bytes(len(rows_values))
+        self._highlighted = None
+        results = [StationChecker.parse_info(info) for info in self.infos[row:row + len(rows_values)]]
+        self.statuses[row:row] = [None] * len(results)
+        self.stream_types[row:row] = [None] * len(results)
+        self.real_names[row:row] = [None] * len(results)
+        self.codecs[row:row] = [None] * len(results)
+        self.genres[row:row] = [None] * len(results)
+        self.bitrates[row:row] = array('i', [0] * len(results))
+        self.final_urls[row:row] = [None] * len(results)
+        for offset, result in enumerate(results):
+            self._store_result(row + offset, result)
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """
+        Удалить строки по номерам. Сплошные блоки удаляются по одному уведомлению на блок,
+        если блоков много (разрозненные дубли, битые станции) - колонки пересобираются
+        за один проход без удаленных строк, а представление получает один сброс модели.
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        blocks = []
+        for row in rows:
+            if blocks and blocks[-1][1] == row - 1:
+                blocks[-1][1] = row
+            else:
+                blocks.append([row, row])
+        if len(blocks) > self.MAX_REMOVE_BLOCKS:
+            self._compact(rows)
+            return
+        # С конца, чтобы номера еще не удаленных блоков не сдвигались
+        for first, last in reversed(blocks):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in self._columns():
+                del column[first:last + 1]
+            self._highlighted = None
+            self.endRemoveRows()
+
+    def _compact(self, rows):
+        """Оставить в колонках только строки не из rows, одним сбросом модели"""
+        keep = bytearray(b'\x01') * len(self.urls)
+        for row in rows:
+            keep[row] = 0
+        self.beginResetModel()
+        for column in self._columns():
+            kept = compress(column, keep)
+            # Срез массива присваивается только массивом того же типа
+            column[:] = array(column.typecode, kept) if isinstance(column, array) else kept
+        self._highlighted = None
+        self.endResetModel()
+
+    def move_row(self, source, destination):
+        """Переместить строку source на позицию destination"""
+        if source == destination:
+            return
+        # beginMoveRows ожидает позицию до перемещения
+        target = destination + 1 if destination > source else destination
+        self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target)
+        for column in self._columns():
+            value = column[source]
+            del column[source]
+            column.insert(destination, value)
+        self._highlighted = None
+        self.endMoveRows()
+
+    def set_highlight(self, row, state):
+        """Подсветка строки: default, highlight или error"""
+        self.set_highlights([row], state)
+
+    def set_highlights(self, rows, state):
+        """Подсветить список строк одним уведомлением"""
+        rows = list(rows)
+        if not rows:
+            return
+        code = self.HIGHLIGHT_CODES.get(state.lower(), 0)
+        highlighted = self.highlighted_rows()
+        for row in rows:
+            self.highlights[row] = code
+        if code:
+            highlighted.update(rows)
+        else:
+            highlighted.difference_update(rows)
+        self._emit_highlight_changed(min(rows), max(rows))
+
+    def highlight_only(self, rows, state):
+        """
+        Подсветить только указанные строки: снимается подсветка лишь с ранее подсвеченных,
+        уведомление охватывает диапазон старых и новых строк, а не всю таблицу.
+        """
+        rows = list(rows)
+        code = self.HIGHLIGHT_CODES.get(state.lower(), 0)
+        previous = self.highlighted_rows()
+        for row in previous:
+            self.highlights[row] = 0
+        for row in rows:
+            self.highlights[row] = code
+        self._highlighted = set(rows) if code else set()
+        changed = [min(rows), max(rows)] if rows else []
+        if previous:
+            changed += [min(previous), max(previous)]
+        if changed:
+            self._emit_highlight_changed(min(changed), max(changed))
+
+    def highlighted_rows(self):
+        """Множество подсвеченных строк"""
+        if self._highlighted is None:
+            self._highlighted = {row for row, code in enumerate(self.highlights) if code}
+        return self._highlighted
+
+    def reset_highlighting(self):
+        """Сбросить подсветку всех строк"""
+        self.highlight_only([], "default")
+
+    def _emit_highlight_changed(self, first, last):
+        self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1),
+                              [Qt.ItemDataRole.ForegroundRole])
+
+
+class StationSearchIndex:
+    """
+    Индекс живого поиска по названию, адресу и информации.
+    Для каждой строки хранится склеенный текст колонок в нижнем регистре, индекс
+    обновляется по сигналам модели только для измененных строк. Для поиска
+    тексты склеиваются в один блок, совпадения ищутся str.find и переводятся
+    в номера строк по таблице смещений.
+    Фильтры по результатам проверки (codec:aac bitrate>=128 genre:rock status:timeout)
+    считаются по индексам полей модели {значение: строки}.
+    """
+
+    COLUMN_SEPARATOR = '\x00'  # Совпадение не может захватить соседнюю колонку
+    ROW_SEPARATOR = '\x01'
+    FILTER_PATTERN = re.compile(r'(?<!\S)(status|codec|bitrate|genre|name|type)(:|>=|<=|>|<|=)("[^"]*"|\S+)', re.I)
+    # Поле фильтра -> атрибут модели
+    FILTER_FIELDS = {
+        'status': 'statuses',
+        'codec': 'codecs',
+        'genre': 'genres',
+        'name': 'real_names',
+        'type': 'stream_types',
+    }
+    BITRATE_OPERATORS = {
+        ':': operator.eq, '=': operator.eq,
+        '>': operator.gt, '>=': operator.ge,
+        '<': operator.lt, '<=': operator.le,
+    }
+
+    def __init__(self, model):
+        self.model = model
+        self.row_texts = None   # None - построить заново при следующем поиске
+        self._blob = None
+        self._row_starts = None
+        self.version = 0        # Меняется при любом изменении текстов
+        self._field_indexes = {}
+        self._field_version = None
+
+        model.modelReset.connect(self.invalidate)
+        model.rowsMoved.connect(self.invalidate)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+
+    def invalidate(self, *args):
+        self.row_texts = None
+        self._blob = None
+        self.version += 1
+
+    def _row_text(self, row):
+        model = self.model
+        return self.COLUMN_SEPARATOR.join((model.names[row], model.urls[row], model.infos[row])).lower()
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self.row_texts is not None:
+            self.row_texts[first:first] = [self._row_text(row) for row in range(first, last + 1)]
+            self._blob = None
+        self.version += 1
+
+    def _on_rows_removed(self, parent, first, last):
+        if self.row_texts is not None:
+            del self.row_texts[first:last + 1]
+            self._blob = None
+        self.version += 1
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        # Подсветка текст не меняет
+        if roles and Qt.ItemDataRole.DisplayRole not in roles and Qt.ItemDataRole.EditRole not in roles:
+            return
+        if top_left.column() == StationTableModel.VOLUME == bottom_right.column():
+            return
+        self.version += 1
+        if self.row_texts is None:
+            return
+        for row in self.model.changed_rows(top_left, bottom_right):
+            self.row_texts[row] = self._row_text(row)
+        self._blob = None
+
+    def _ensure_blob(self):
+        model = self.model
+        if self.row_texts is None:
+            # Склейка и перевод в нижний регистр одним вызовом быстрее, чем построчно
+            self._blob = self.ROW_SEPARATOR.join(
+                map(self.COLUMN_SEPARATOR.join, zip(model.names, model.urls, model.infos))
+            ).lower()
+            self.row_texts = self._blob.split(self.ROW_SEPARATOR) if model.rowCount() else []
+            self._row_starts = None
+        elif self._blob is None:
+            self._blob = self.ROW_SEPARATOR.join(self.row_texts)
+            self._row_starts = None
+        if self._row_starts is None:
+            # Начало строки i: суммарная длина предыдущих текстов плюс i разделителей
+            lengths = accumulate(map(len, self.row_texts), initial=0)
+            self._row_starts = array('q', map(operator.add, lengths, range(len(self.row_texts) + 1)))
+
+    def search(self, text, within=None):
+        """
+        Номера строк, содержащих text (без учета регистра), по возрастанию.
+        within - строки прошлого результата, если новый запрос его уточняет.
+        """
+        text = text.lower()
+        if not text:
+            return []
+        self._ensure_blob()
+        texts = self.row_texts
+
+        if within is not None and len(within) * 8 < len(texts):
+            return [row for row in within if text in texts[row]]
+
+        # Частые совпадения быстрее отфильтровать списком, редкие - найти в общем блоке
+        blob = self._blob
+        if blob.count(text) * 4 > len(texts):
+            return [row for row, row_text in enumerate(texts) if text in row_text]
+
+        rows = []
+        starts = self._row_starts
+        row_count = len(starts)
+        position = blob.find(text)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            rows.append(row)
+            if row + 1 >= row_count:
+                break
+            position = blob.find(text, starts[row + 1])
+        return rows
+
+    @classmethod
+    def has_filters(cls, text):
+        """Есть ли в запросе фильтры по полям"""
+        return cls.FILTER_PATTERN.search(text) is not None
+
+    def query(self, text, within=None):
+        """
+        Номера строк по запросу с фильтрами, по возрастанию. Условия объединяются по И,
+        оставшийся после фильтров текст ищется как обычно по всем колонкам.
+        name:, codec:, genre:, status:, type: - часть значения, с "=" - точное значение,
+        bitrate - число с операторами : = > >= < <=. Значения с пробелами - в кавычках.
+        """
+        filters = self.FILTER_PATTERN.findall(text)
+        if not filters:
+            return self.search(text, within)
+
+        rows = None
+        phrase = ' '.join(self.FILTER_PATTERN.sub(' ', text).split())
+        if phrase:
+            rows = set(self.search(phrase))
+        for field, op, value in filters:
+            value = value.strip('"').lower()
+            if field.lower() == 'bitrate':
+                matched = self._match_bitrate(op, value)
+            else:
+                matched = self._match_field(field.lower(), op, value)
+            rows = matched if rows is None else rows & matched
+            if not rows:
+                return []
+        return sorted(rows)
+
+    def _field_index(self, field):
+        """Индекс {значение в нижнем регистре: [строки]} для поля, строится при первом запросе"""
+        if self._field_version != self.version:
+            self._field_indexes = {}
+            self._field_version = self.version
+        index = self._field_indexes.get(field)
+        if index is None:
+            index = {}
+            values = self.model.bitrates if field == 'bitrate' else getattr(self.model, self.FILTER_FIELDS[field])
+            for row, value in enumerate(values):
+                if not value:
+                    continue
+                key = value if field == 'bitrate' else value.lower()
+                rows = index.get(key)
+                if rows is None:
+                    index[key] = [row]
+                else:
+                    rows.append(row)
+            self._field_indexes[field] = index
+        return index
+
+    def _match_field(self, field, op, value):
+        index = self._field_index(field)
+        if op == ':':
+            keys = [key for key in index if value in key]
+        elif op == '=':
+            keys = [value] if value in index else []
+        else:
+            return set()  # Сравнение больше/меньше только для битрейта
+        rows = set()
+        for key in keys:
+            rows.update(index[key])
+        return rows
+
+    def _match_bitrate(self, op, value):
+        try:
+            limit = int(value)
+        except ValueError:
+            return set()
+        compare = self.BITRATE_OPERATORS[op]
+        rows = set()
+        for bitrate, bitrate_rows in self._field_index('bitrate').items():
+            if compare(bitrate, limit):
+                rows.update(bitrate_rows)
+        return rows
+
+
+class StationDuplicateIndex:
+    """
+    Индекс дублей по нормализованным адресам. Ключи строк считаются один раз
+    при первом поиске, дальше обновляются по сигналам модели только для вставленных
+    и измененных строк, вместе с ними обновляется счетчик ключей - при отсутствии
+    дублей поиск отвечает сразу, без прохода по таблице.
+    by_final_url - сравнивать адреса потоков после редиректов (известны после проверки).
+    """
+
+    def __init__(self, model, by_final_url=False):
+        self.model = model
+        self.by_final_url = by_final_url
+        self.keys = None            # None - построить заново при следующем поиске
+        self.counts = Counter()
+        self.duplicate_count = 0    # Сколько строк повторяют более ранние
+
+        model.modelReset.connect(self.invalidate)
+        model.rowsMoved.connect(self._on_rows_moved)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+
+    normalize_url = staticmethod(duplicate_key)
+
+    def set_by_final_url(self, enabled):
+        if enabled != self.by_final_url:
+            self.by_final_url = enabled
+            self.invalidate()
+
+    def invalidate(self, *args):
+        self.keys = None
+
+    def _row_key(self, row):
+        model = self.model
+        url = model.final_urls[row] if self.by_final_url else None
+        return self.normalize_url(url or model.urls[row])
+
+    def _add_key(self, key):
+        if key is None:
+            return
+        if self.counts[key]:
+            self.duplicate_count += 1
+        self.counts[key] += 1
+
+    def _remove_key(self, key):
+        if key is None:
+            return
+        self.counts[key] -= 1
+        if self.counts[key]:
+            self.duplicate_count -= 1
+        else:
+            del self.counts[key]
+
+    def _ensure_keys(self):
+        if self.keys is not None:
+            return
+        self.keys = [self._row_key(row) for row in range(self.model.rowCount())]
+        self.counts = Counter(key for key in self.keys if key is not None)
+        self.duplicate_count = sum(self.counts.values()) - len(self.counts)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self.keys is None:
+            return
+        keys = [self._row_key(row) for row in range(first, last + 1)]
+        self.keys[first:first] = keys
+        for key in keys:
+            self._add_key(key)
+
+    def _on_rows_removed(self, parent, first, last):
+        if self.keys is None:
+            return
+        for key in self.keys[first:last + 1]:
+            self._remove_key(key)
+        del self.keys[first:last + 1]
+
+    def _on_rows_moved(self, parent, start, end, destination, row):
+        if self.keys is None:
+            return
+        # Модель перемещает по одной строке, row - позиция до перемещения
+        key = self.keys.pop(start)
+        self.keys.insert(row - 1 if row > start else row, key)
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if self.keys is None:
+            return
+        if roles and Qt.ItemDataRole.DisplayRole not in roles and Qt.ItemDataRole.EditRole not in roles:
+            return
+        # Ключ зависит от адреса, а с by_final_url - и от результата проверки
+        columns = range(top_left.column(), bottom_right.column() + 1)
+        if StationTableModel.URL not in columns and not (self.by_final_url and StationTableModel.INFO in columns):
+            return
+        for row in self.model.changed_rows(top_left, bottom_right):
+            key = self._row_key(row)
+            if key != self.keys[row]:
+                self._remove_key(self.keys[row])
+                self._add_key(key)
+                self.keys[row] = key
+
+    def duplicate_groups(self):
+        """Группы строк с одинаковым адресом (только из двух и более строк), строки по возрастанию"""
+        self._ensure_keys()
+        if not self.duplicate_count:
+            return []
+        counts = self.counts
+        groups = {}
+        for row, key in enumerate(self.keys):
+            if key is not None and counts[key] > 1:
+                rows = groups.get(key)
+                if rows is None:
+                    groups[key] = [row]
+                else:
+                    rows.append(row)
+        return list(groups.values())
+
+
+class TableWidgetWithDrag(QTableView):
+    # Сигнал для уведомления об изменении количества строк
+    row_count_changed = pyqtSignal(int)
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        # Настройки основного виджета
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        
+        # Разрешаем оба формата перетаскивания - внутреннее и внешнее
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DragDrop)
+        self.setDefaultDropAction(Qt.DropAction.CopyAction)
+        
+        # Настраиваем перемещение строк через заголовок (внутри приложения)
+        self.verticalHeader().setSectionsMovable(True)
+        self.verticalHeader().setDragEnabled(True)
+        self.verticalHeader().setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        
+        # Подключаем обработчик перемещения внутренних строк
+        self.verticalHeader().sectionMoved.connect(self.recreateRowsAfterMove)
+
+    def rowCount(self):
+        return self.model().rowCount()
+
+    def currentRow(self):
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+    
+    # Захват данных для перетаскивания
+    def startDrag(self, supportedActions):
+        # Проверяем наличие выбранных строк
+        selected_rows = self.selectionModel().selectedRows()
+        if not selected_rows:
+            return
+            
+        # Находим первую выбранную строку
+        row = selected_rows[0].row()
+        if row < 0:
+            return
+            
+        # Собираем данные выбранной строки
+        row_data = self.model().row_values(row)
+        
+        # Создаем MIME-объект с данными таблицы в формате JSON
+        mime_data = QMimeData()
+        json_data = json.dumps(row_data, ensure_ascii=False)
+        mime_data.setData(
+            "application/json", 
+            QByteArray(json_data.encode('utf-8'))
+        )
+        
+        # Добавляем обычный текст для совместимости в виде CSV (на всякий случай)
+        mime_data.setText("\t".join(row_data))
+        
+        # Создаем объект перетаскивания
+        drag = QDrag(self)
+        drag.setMimeData(mime_data)
+        
+        # Параметры выполняемой операции
+        drag.exec(Qt.DropAction.CopyAction | Qt.DropAction.MoveAction, Qt.DropAction.CopyAction)
+
+    # Проверка возможности приема перетаскивания
+    def dragEnterEvent(self, event):
+        # Проверяем наличие наших данных в MIME
+        if (event.mimeData().hasFormat("application/json") or 
+            event.mimeData().hasText()):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    # Реакция на движение курсора при перетаскивании
+    def dragMoveEvent(self, event):
+        if (event.mimeData().hasFormat("application/json") or 
+            event.mimeData().hasText()):
+            event.accept()
+        else:
+            event.ignore()
+
+    # Обработка события "бросания" объекта
+    def dropEvent(self, event):
+        # Используем наш кастомный обработчик для перетаскивания из другого приложения
+        if event.source() != self:
+            self.handleExternalDrop(event)
+            event.accept()
+        else:
+            # Для внутреннего перетаскивания игнорируем событие
+            event.ignore()
+    
+    def handleExternalDrop(self, event):
+        """Обработка перетаскивания из других приложений"""
+        mime_data = event.mimeData()
+        row_data = []
+        
+        # Определяем позицию курсора для вставки
+        pos = event.position().toPoint() if hasattr(event.position(), 'toPoint') else event.pos()
+        drop_row = self.indexAt(pos).row()
+        
+        # Если курсор между строк или ниже последней строки
+        if drop_row < 0:
+            drop_row = self.rowCount()
+        
+        # Пробуем получить данные в формате JSON
+        if mime_data.hasFormat("application/json"):
+            byte_data = mime_data.data("application/json").data()
+            try:
+                row_data = json.loads(byte_data.decode('utf-8'))
+            except:
+                pass
+        
+        # Если не получилось JSON, пробуем получить как текст
+        if not row_data and mime_data.hasText():
+            text = mime_data.text()
+            if "\t" in text:  # Tab-delimited
+                row_data = text.split("\t")
+            elif "," in text:  # CSV
+                row_data = text.split(",")
+            else:  # Используем всю строку как первый столбец
+                row_data = [text]
+        
+        if row_data:
+            # Дообираем недостающие данные
+            while len(row_data) < 4:
+                row_data.append("")
+            
+            # Вставляем новую строку в указанную позицию
+            values = [str(value).strip() for value in row_data[:4]]
+            self.model().insert_rows(drop_row, [values])
+            
+            # Выделяем добавленную строку
+            self.selectRow(drop_row)
+            # Отправляем сигнал об изменении количества строк
+            self.row_count_changed.emit(self.rowCount())
+
+
+    def recreateRowsAfterMove(self, logicalIndex, oldIndex, newIndex):
+        """Сортировка строк после перемещения"""
+        # Вычисляем реальные позиции строк
+        srcRow = oldIndex
+        dstRow = newIndex
+        
+        if srcRow == dstRow:
+            return
+            
+        # Возвращаем заголовок в исходный порядок, данные переставляет модель
+        # Блокируем рекурсивные вызовы
+        self.verticalHeader().sectionMoved.disconnect(self.recreateRowsAfterMove)
+        self.verticalHeader().moveSection(dstRow, srcRow)
+        self.verticalHeader().sectionMoved.connect(self.recreateRowsAfterMove)
+
+        self.model().move_row(srcRow, dstRow)
+        
+        # Выделяем перемещенную строку
+        self.selectRow(dstRow)
+        
+        # Отправляем сигнал об изменении количества строк
+        self.row_count_changed.emit(self.rowCount())
+
+
+    def highlight_row(self, row, state="default"):
+        """Подсветка строки в зависимости от состояния"""
+        if row < 0 or row >= self.rowCount():
+            return
+        self.model().set_highlight(row, state)
+    
+    def reset_all_highlighting(self):
+        """Сбросить всю подсветку к стандартным цветам"""
+        self.model().reset_highlighting()
+
+
+class IcyMetadataWatcher(QThread):
+    """
+    Чтение метаданных играющей станции в отдельном потоке.
+    Держит одно соединение со станцией и сообщает о каждой смене трека,
+    при обрыве переподключается с нарастающей паузой.
+    """
+
+    info_received = pyqtSignal(str, str, str, str)  # станция, трек, content-type, битрейт
+    error_occurred = pyqtSignal(str)
+
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 15
+    RETRY_DELAYS = (1, 2, 5, 10, 30)
+    MAX_REDIRECTS = 5
+    MAX_HEADER_SIZE = 16384
+    READ_SIZE = 8192
+    FORWARD_AUDIO = False
+
+    def __init__(self, url, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self._stop_event = threading.Event()
+        self._socket = None
+        self._socket_lock = threading.Lock()
+        self._attempt = 0
+        self._reconnect = True  # False - переподключаться незачем
+        self._upstream_status = None  # Код последнего ответа станции
+        # Сокет пробуждения: select ждет его вместе с сокетом станции, пока идет соединение
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+
+    def stop(self):
+        """Прервать соединение или чтение: сокет пробуждения и закрытие сокета будят поток"""
+        self._stop_event.set()
+        try:
+            self._wakeup_writer.send(b'\0')
+        except OSError:
+            pass  # Поток уже завершился
+        with self._socket_lock:
+            if self._socket is not None:
+                try:
+                    self._socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def run(self):
+        try:
+            self._watch_loop()
+        finally:
+            self._close_wakeup()
+
+    def _watch_loop(self):
+        """Чтение потока с переподключениями до остановки"""
+        while not self._stop_event.is_set():
+            try:
+                if self._watch():
+                    return  # У станции нет метаданных, следить не за чем
+                error = "Сервер закрыл соединение"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            if self._stop_event.is_set():
+                return
+
+            if self._attempt == 0:
+                self.error_occurred.emit(error)
+            if not self._reconnect:
+                return
+            delay = self.RETRY_DELAYS[min(self._attempt, len(self.RETRY_DELAYS) - 1)]
+            self._attempt += 1
+            if self._stop_event.wait(delay):
+                return
+
+    def _watch(self):
+        """
+        Одно соединение со станцией. Возвращает True, если станция не отдает метаданные,
+        и False, если поток оборвался и нужно переподключиться.
+        """
+        url = self.url
+        self._upstream_status = None
+        for _ in range(self.MAX_REDIRECTS + 1):
+            sock, status, headers, body = self._open(url)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                self._close(sock)
+                url = urljoin(url, headers['location'])
+                continue
+            break
+        else:
+            raise ConnectionError("Слишком много перенаправлений")
+        self._upstream_status = status
+
+        try:
+            if status != 200:
+                raise ConnectionError(f"HTTP {status}")
+
+            station_name = headers.get('icy-name', 'Неизвестно')
+            content_type = headers.get('content-type', 'Неизвестно')
+            bitrate = headers.get('icy-br', 'Неизвестно')
+            stream_title = 'Неизвестно'
+            self._attempt = 0
+            self.info_received.emit(station_name, stream_title, content_type, bitrate)
+
+            try:
+                metaint = int(headers.get('icy-metaint', '0'))
+            except ValueError:
+                metaint = 0
+            if metaint <= 0 and not self.FORWARD_AUDIO:
+                return True
+
+            if not self._begin_audio(content_type, url):
+                return True
+            demuxer = IcyDemuxer(metaint) if metaint > 0 else None
+            data = body
+            while not self._stop_event.is_set():
+                if data:
+                    if demuxer is not None:
+                        audio, titles = demuxer.feed(data)
+                    else:
+                        audio, titles = data, []
+                    self._write_audio(audio)
+                    for title in titles:
+                        if title != stream_title:
+                            stream_title = title
+                            self.info_received.emit(station_name, stream_title, content_type, bitrate)
+                data = sock.recv(self.READ_SIZE)
+                if not data:
+                    return False
+            return False
+        finally:
+            self._close(sock)
+
+    def _begin_audio(self, content_type, url):
+        """Начало аудиоданных после заголовков (для наследников). False - поток читать не нужно"""
+        return True
+
+    def _write_audio(self, audio):
+        """Аудиоданные без метаданных (наблюдателю не нужны, отбрасываются)"""
+        pass
+
+    def _open(self, url):
+        """Подключиться и прочитать заголовки. Возвращает (сокет, код, заголовки, начало тела)"""
+        parts = urlsplit(url)
+        host = parts.hostname
+        if not host:
+            raise ValueError(f"Некорректный адрес: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        sock = self._connect(host, port)
+        try:
+            if parts.scheme == 'https':
+                sock = self._handshake(sock, host)
+            sock.settimeout(self.READ_TIMEOUT)
+            with self._socket_lock:
+                self._socket = sock
+            if self._stop_event.is_set():
+                raise ConnectionError("Остановлено")
+
+            request = f"GET {path} HTTP/1.0\r\n" \
+                      f"Host: {parts.netloc.rsplit('@', 1)[-1]}\r\n" \
+                      f"Icy-MetaData: 1\r\n" \
+                      f"User-Agent: Mozilla/5.0\r\n\r\n"
+            sock.sendall(request.encode())
+
+            response = b''
+            while b'\r\n\r\n' not in response:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise ConnectionError("Сервер закрыл соединение")
+                response += chunk
+                if len(response) > self.MAX_HEADER_SIZE:
+                    raise ConnectionError("Слишком длинные заголовки ответа")
+        except BaseException:
+            self._close(sock)
+            raise
+
+        head, body = response.split(b'\r\n\r\n', 1)
+        lines = head.decode('utf-8', errors='ignore').split('\r\n')
+        # Строка статуса: "HTTP/1.1 200 OK" или "ICY 200 OK"
+        status_parts = lines[0].split()
+        try:
+            status = int(status_parts[1])
+        except (IndexError, ValueError):
+            self._close(sock)
+            raise ConnectionError(f"Некорректный ответ сервера: {lines[0][:100]}")
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        return sock, status, headers, body
+
+    def _connect(self, host, port):
+        """
+        Неблокирующее соединение со станцией за CONNECT_TIMEOUT.
+        В отличие от socket.create_connection, stop() прерывает его сразу.
+        """
+        deadline = time.monotonic() + self.CONNECT_TIMEOUT
+        error = None
+        for family, sock_type, proto, _, address in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, sock_type, proto)
+            try:
+                sock.setblocking(False)
+                code = sock.connect_ex(address)
+                if code in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    self._wait_socket(sock, deadline, write=True)
+                    code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code:
+                    raise OSError(code, os.strerror(code))
+                return sock
+            except socket.timeout:
+                sock.close()
+                raise
+            except OSError as e:
+                sock.close()
+                if self._stop_event.is_set():
+                    raise
+                error = e  # Пробуем следующий адрес
+        raise error or ConnectionError(f"Не удалось разрешить имя: {host}")
+
+    def _handshake(self, sock, host):
+        """TLS-рукопожатие на неблокирующем сокете, stop() прерывает и его"""
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host, do_handshake_on_connect=False)
+        deadline = time.monotonic() + self.READ_TIMEOUT
+        while True:
+            try:
+                sock.do_handshake()
+                return sock
+            except ssl.SSLWantReadError:
+                self._wait_socket(sock, deadline)
+            except ssl.SSLWantWriteError:
+                self._wait_socket(sock, deadline, write=True)
+            except BaseException:
+                sock.close()
+                raise
+
+    def _wait_socket(self, sock, deadline, write=False):
+        """Дождаться готовности сокета к чтению (write=True - к записи) до deadline или остановки"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("timed out")
+        readable, writable, _ = select.select([self._wakeup_reader] + ([] if write else [sock]),
+                                              [sock] if write else [], [], remaining)
+        if self._stop_event.is_set():
+            raise ConnectionError("Остановлено")
+        if not readable and not writable:
+            raise socket.timeout("timed out")
+
+    def _close(self, sock):
+        with self._socket_lock:
+            if self._socket is sock:
+                self._socket = None
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _close_wakeup(self):
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+
+class IcyStreamProxy(IcyMetadataWatcher):
+    """
+    Локальный прокси для плеера: один раз забирает поток со станции, вырезает
+    блоки ICY-метаданных и отдает чистое аудио QMediaPlayer по адресу local_url.
+    Смена трека сообщается сразу, второго соединения со станцией не нужно.
+    Плейлисты плеер получает со станции напрямую, ошибку станции - как есть.
+    """
+
+    FORWARD_AUDIO = True
+    ACCEPT_TIMEOUT = 30
+    # Плейлисты (в том числе HLS) и страницы отдаются перенаправлением на станцию:
+    # относительные адреса в них должны разрешаться от адреса станции, а не прокси
+    PASSTHROUGH_TYPES = ('mpegurl', 'm3u', 'scpls', 'pls', 'xspf', 'playlist', 'text/', 'html', 'xml', 'json')
+    PASSTHROUGH_EXTENSIONS = ('.m3u', '.m3u8', '.pls', '.xspf')
+
+    def __init__(self, url, parent=None):
+        super().__init__(url, parent)
+        # Порт занимаем сразу, чтобы адрес для плеера был известен до запуска потока
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(2)
+        self._server.settimeout(0.5)
+        self._client = None
+        self._client_fresh = False  # Подключению плеера еще не отправлены заголовки ответа
+        self._client_connected = threading.Event()
+        self._content_type = None  # Известен после ответа станции
+        self.local_url = f"http://127.0.0.1:{self._server.getsockname()[1]}/stream"
+
+    @classmethod
+    def is_passthrough(cls, content_type, url):
+        """Плейлист или страница, которые плеер должен загрузить со станции сам"""
+        content_type = content_type.lower()
+        return (any(key in content_type for key in cls.PASSTHROUGH_TYPES)
+                or urlsplit(url).path.lower().endswith(cls.PASSTHROUGH_EXTENSIONS))
+
+    def stop(self):
+        super().stop()
+        with self._socket_lock:
+            if self._client is not None:
+                try:
+                    self._client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def run(self):
+        # Подключения плеера принимает отдельный поток, чтение станции их не ждет
+        threading.Thread(target=self._accept_clients, daemon=True).start()
+        try:
+            if self._wait_client(self.ACCEPT_TIMEOUT):
+                self._watch_loop()
+        finally:
+            self._close_wakeup()
+            self._stop_event.set()  # Заодно прекращает прием подключений
+            with self._socket_lock:
+                client = self._client
+                self._client = None
+            if client is not None:
+                client.close()
+
+    def _wait_client(self, timeout):
+        """Дождаться первого подключения плеера"""
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            if self._client_connected.wait(0.5):
+                return True
+            if time.monotonic() > deadline:
+                return False
+        return False
+
+    def _accept_clients(self):
+        """Прием подключений плеера в отдельном потоке. Новое подключение заменяет предыдущее"""
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    client, _ = self._server.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+                try:
+                    # Запрос плеера не важен, отдаем поток с текущей позиции
+                    client.settimeout(self.CONNECT_TIMEOUT)
+                    request = b''
+                    while b'\r\n\r\n' not in request and len(request) < self.MAX_HEADER_SIZE:
+                        chunk = client.recv(4096)
+                        if not chunk:
+                            break
+                        request += chunk
+                    client.settimeout(self.READ_TIMEOUT)
+                except OSError:
+                    client.close()
+                    continue
+
+                with self._socket_lock:
+                    if self._stop_event.is_set():
+                        old_client = client
+                    else:
+                        old_client, self._client = self._client, client
+                        self._client_fresh = True
+                if old_client is not None:
+                    old_client.close()
+                self._client_connected.set()
+        finally:
+            self._server.close()
+
+    def _current_client(self):
+        """Текущее подключение плеера; новому сначала отправляются заголовки ответа"""
+        with self._socket_lock:
+            client, fresh = self._client, self._client_fresh
+            self._client_fresh = False
+        if fresh:
+            response = f"HTTP/1.0 200 OK\r\n" \
+                       f"Content-Type: {self._content_type}\r\n" \
+                       f"Cache-Control: no-cache\r\n\r\n"
+            client.sendall(response.encode('latin-1', errors='ignore'))
+        return client
+
+    def _reply(self, status, headers=''):
+        """Ответить плееру без потока (перенаправление, ошибка станции); переподключаться после этого незачем"""
+        self._reconnect = False
+        with self._socket_lock:
+            client = self._client
+            self._client_fresh = False
+        response = f"HTTP/1.0 {status} {http.client.responses.get(status, '')}\r\n{headers}" \
+                   f"Content-Length: 0\r\n\r\n"
+        try:
+            client.sendall(response.encode('latin-1', errors='ignore'))
+        except OSError:
+            pass
+
+    def _watch(self):
+        try:
+            return super()._watch()
+        except Exception:
+            # Плеер, еще не получивший поток, получает ошибку станции, а не ждет переподключений
+            if self._content_type is None and not self._stop_event.is_set():
+                status = self._upstream_status
+                self._reply(status if status is not None and status >= 400 else 502)
+            raise
+
+    def _begin_audio(self, content_type, url):
+        if self._content_type is None and self.is_passthrough(content_type, url):
+            self._reply(302, f"Location: {url}\r\n")
+            return False
+        self._content_type = content_type if content_type != 'Неизвестно' else 'audio/mpeg'
+        self._write_audio(b'')
+        return True
+
+    def _write_audio(self, audio):
+        client = None
+        try:
+            client = self._current_client()
+            if audio:
+                client.sendall(audio)
+        except OSError:
+            with self._socket_lock:
+                replaced = self._client is not client
+            if replaced:
+                return  # Плеер переподключился, дальше данные уходят новому подключению
+            # Плеер закрыл соединение - дальше качать поток незачем
+            self._stop_event.set()
+            raise
+
+
+class StreamPlayer(QObject):
+
+    # Словарь для преобразования MIME-типов в читаемые названия
+    FORMAT_MAPPING = {
+        'audio/mpeg': 'MP3',
+        'audio/aac': 'AAC',
+        'audio/aacp': 'AAC+',
+        'audio/mp4': 'MP4',
+        'audio/flac': 'FLAC',
+        'audio/ogg': 'OGG',
+        'audio/wav': 'WAV',
+        'audio/x-wav': 'WAV',
+        'audio/vnd.wav': 'WAV',
+        'audio/x-mpegurl': 'M3U',
+        'audio/scpls': 'PLS',
+        'application/vnd.apple.mpegurl': 'M3U8',
+        'application/x-mpegurl': 'M3U',
+        'application/pls+xml': 'PLS',
+        'application/xspf+xml': 'XSPF'
+    }
+    
+    # Сигналы для обновления UI
+    info_updated = pyqtSignal(str, str, str)  # станция, трек, формат/битрейт
+    playback_toggled = pyqtSignal(bool)       # состояние воспроизведения
+    
+    def __init__(self, config_manager):
+        super().__init__()
+        self.config_manager = config_manager
+        # Плеер создается при первом воспроизведении, см. _ensure_player
+        self.player = None
+        self.audio_output = None
+        
+        # Текущее состояние
+        self.current_url = None
+        self.current_row = -1
+        self.is_playing = False
+        self.metadata_watcher = None
+        self._watchers = set()  # Потоки метаданных, еще не завершившиеся (в том числе остановленные)
+
+    def _ensure_player(self):
+        """
+        Создать QMediaPlayer при первом воспроизведении: загрузка QtMultimedia
+        и аудиобэкенда заметно удлиняет запуск, а консольному режиму они не нужны.
+        """
+        if self.player is None:
+            from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+            self.audio_output = QAudioOutput()
+            self.audio_output.setVolume(self.get_saved_volume())
+            self.player = QMediaPlayer()
+            self.player.setAudioOutput(self.audio_output)
+            self.player.playbackStateChanged.connect(self._on_playback_state_changed)
+        return self.player
+    
+    def toggle_playback(self, row, url):
+        """Переключение воспроизведения"""
+        # Если та же станция или нет станции - останавливаем
+        if (row == self.current_row and self.is_playing) or row < 0:
+            self.stop()
+            return False
+        else:
+            # Играем новую станцию
+            self.play(row, url)
+            return True
+    
+    def play(self, row, url):
+        """Начать воспроизведение"""
+        self.stop()  # Останавливаем текущее воспроизведение
+        
+        self.current_row = row
+        self.current_url = url
+
+        # Информация о потоке читается в фоне, обновления приходят сигналами.
+        # Через прокси плеер получает тот же поток, что и чтение метаданных.
+        watcher = None
+        source = url
+        if self._use_proxy() and not IcyStreamProxy.is_passthrough('', url):
+            try:
+                watcher = IcyStreamProxy(url, self)
+                source = watcher.local_url
+            except OSError:
+                watcher = None
+        if watcher is None:
+            watcher = IcyMetadataWatcher(url, self)
+        self._start_watcher(watcher)
+
+        player = self._ensure_player()
+        player.setSource(QUrl(source))
+        player.play()
+        self.is_playing = True
+        self.playback_toggled.emit(True)
+    
+    def stop(self):
+        """Остановить воспроизведение"""
+        self._stop_watcher()
+            
+        if self.player is not None:
+            self.player.stop()
+        self.is_playing = False
+        self.current_url = None
+        self.current_row = -1
+        self.playback_toggled.emit(False)
+    
+    def set_volume(self, volume):
+        """Установить громкость (0.0 - 1.0) и сохранить в настройках"""
+        if self.audio_output is not None:
+            self.audio_output.setVolume(volume)
+        # Сохраняем в настройках
+        config = self.config_manager.load_config()
+        config['Settings']['player_volume'] = str(volume)
+        self.config_manager.save_config(config)
+    
+    def get_saved_volume(self):
+        """Получить сохраненную громкость"""
+        config = self.config_manager.load_config()
+        return float(config['Settings'].get('player_volume', '0.5'))
+    
+    def _normalize_format(self, content_type):
+        """Преобразование MIME-типа в читаемый формат"""
+        if not content_type or content_type == 'Неизвестно':
+            return 'Неизвестно'
+        
+        # Приводим к нижнему регистру для сравнения
+        content_type = content_type.lower().strip()
+        
+        # Используем словарь для преобразования
+        if content_type in self.FORMAT_MAPPING:
+            return self.FORMAT_MAPPING[content_type]
+        
+        # Если тип не найден в словаре, пытаемся извлечь подтип
+        if '/' in content_type:
+            subtype = content_type.split('/')[-1].upper()
+            # Убираем лишние параметры (например, "mpeg; charset=utf-8" -> "mpeg")
+            subtype = subtype.split(';')[0].strip()
+            return subtype
+        
+        # Если ничего не помогло, возвращаем как есть
+        return content_type.upper()
+
+
+    def _use_proxy(self):
+        """Воспроизводить через локальный прокси с вырезанием метаданных"""
+        config = self.config_manager.load_config()
+        return config['Settings'].get('player_proxy', '0') == '1'
+
+    def _start_watcher(self, watcher):
+        """Запустить фоновое чтение метаданных текущей станции"""
+        self.metadata_watcher = watcher
+        self._watchers.add(watcher)
+        watcher.info_received.connect(self._on_watcher_info)
+        watcher.error_occurred.connect(self._on_watcher_error)
+        watcher.finished.connect(lambda: self._watchers.discard(watcher))
+        watcher.finished.connect(watcher.deleteLater)
+        watcher.start()
+
+    def _stop_watcher(self):
+        """Остановить чтение метаданных, не дожидаясь завершения потока"""
+        watcher = self.metadata_watcher
+        self.metadata_watcher = None
+        if watcher is not None:
+            watcher.stop()
+
+    def _on_watcher_info(self, station_name, stream_title, content_type, bitrate):
+        """Метаданные от фонового потока"""
+        # Ответ от станции, которую уже переключили, игнорируем
+        if self.sender() is not self.metadata_watcher:
+            return
+
+        # Нормализовать формат
+        normalized_format = self._normalize_format(content_type)
+
+        # Сформировать строку информации
+        if bitrate != 'Неизвестно':
+            format_info = f"{normalized_format} / {bitrate} kbps"
+        else:
+            format_info = normalized_format
+
+        self.info_updated.emit(station_name, stream_title, format_info)
+
+    def _on_watcher_error(self, message):
+        """Ошибка соединения в фоновом потоке метаданных"""
+        if self.sender() is not self.metadata_watcher:
+            return
+        self.info_updated.emit("Ошибка", message, "Неизвестно")
+
+    def shutdown(self):
+        """Остановить воспроизведение перед закрытием программы"""
+        if self.player is not None:
+            self.player.stop()
+        self._stop_watcher()
+        # Остановленные потоки завершаются быстро, дольше таймаутов ждать нечего.
+        # Без ожидания QThread уничтожился бы работающим и программа аварийно завершилась.
+        deadline = time.monotonic() + IcyMetadataWatcher.CONNECT_TIMEOUT + IcyMetadataWatcher.READ_TIMEOUT
+        for watcher in list(self._watchers):
+            watcher.stop()
+            watcher.wait(max(0, int((deadline - time.monotonic()) * 1000)))
+
+    def _on_playback_state_changed(self, state):
+        """Обработчик изменения состояния воспроизведения"""
+        pass
+    
+    def is_currently_playing(self):
+        """Проверить, играет ли сейчас что-то"""
+        return self.is_playing
+    
+    def get_current_row(self):
+        """Получить текущую строку"""
+        return self.current_row
+
+
+class DnsPrefetchThread(QThread):
+    """Фоновое разрешение имен всех хостов загруженного плейлиста"""
+    prefetch_finished = pyqtSignal(int, int, int, float)  # хостов, разрешено, не найдено, секунд
+
+    def __init__(self, urls):
+        super().__init__()
+        self.urls = urls
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        started = time.monotonic()
+        hosts = [host for host in {DnsCache.host_from_url(url) for url in self.urls}
+                 if host and not DnsCache.is_ip_literal(host)]
+        resolved, failed = DnsCache.prefetch(hosts, self._cancelled)
+        self.prefetch_finished.emit(len(hosts), resolved, failed, time.monotonic() - started)
+
+
+class CheckerSignals(QObject):
+    """
+    Сигналы Qt для событий StationChecker (см. StationChecker.EVENTS).
+    События приходят из рабочих потоков проверки, сигналы доставляют их в поток интерфейса.
+    """
+    progress_updated = pyqtSignal(int, int)  # проверено, всего
+    concurrency_changed = pyqtSignal(int)    # текущее число одновременных проверок (адаптивный режим)
+    prefilter_finished = pyqtSignal(int, int, int)  # серверов, недоступных серверов, их станций
+    stations_checked = pyqtSignal(list)      # [(строка, результат проверки), ...] за интервал ResultBatcher
+    check_finished = pyqtSignal(int, int, int)  # проверено, активных, мертвых
+    check_cancelled = pyqtSignal(int, int, int)  # проверено до отмены, активных, мертвых
+    retries_finished = pyqtSignal(int, int)  # назначено повторов, станций ответило на повторе
+
+    def relay(self, event, *args):
+        """Получатель событий для StationChecker.listener"""
+        getattr(self, event).emit(*args)
+
+
+class StationCheckThread(QThread):
+    """Рабочий поток Qt для проверки станций (в нём же работает цикл событий asyncio)"""
+    def __init__(self, station_checker, stations_data, parent=None, use_cache=True):
+        super().__init__(parent)
+        self.station_checker = station_checker
+        self.stations_data = stations_data
+        self.use_cache = use_cache
+
+    def run(self):
+        self.station_checker.check_stations(self.stations_data, self.use_cache)
+
+
+class MainWindow(QMainWindow):
+    SEARCH_DELAY_MS = 200  # Пауза в наборе перед поиском
+    def __init__(self):
+        super().__init__()
+        
+        # Загружаем конфигурацию
+        self.config = ConfigManager.load_config()
+        
+        # Устанавливаем размер окна из конфига
+        width = int(self.config['Settings'].get('window_width', '800'))
+        height = int(self.config['Settings'].get('window_height', '600'))
+        self.setGeometry(100, 100, width, height)
+        #self.setWindowTitle("Радио менеджер")
+        self.current_file_name = "Новый плейлист"
+        self.update_window_title() 
+
+        
+
+        # Инициализация плеера
+        self.stream_player = StreamPlayer(ConfigManager)
+        self.stream_player.info_updated.connect(self.update_station_info)
+        self.stream_player.playback_toggled.connect(self.on_playback_toggled)
+
+        # Инициализация проверки станций
+        self.checker_signals = CheckerSignals(self)
+        self.station_checker = StationChecker(listener=self.checker_signals.relay)
+        self.checker_signals.progress_updated.connect(self.update_check_progress)
+        self.checker_signals.stations_checked.connect(self.update_station_info_cells)
+        self.checker_signals.check_finished.connect(self.on_check_finished)
+        self.checker_signals.check_cancelled.connect(self.on_check_cancelled)
+        self.checker_signals.concurrency_changed.connect(self.update_check_concurrency)
+        self.checker_signals.prefilter_finished.connect(self.on_prefilter_finished)
+        self.checker_signals.retries_finished.connect(self.on_retries_finished)
+
+
+        # Лог
+        self.log_widget = QTextEdit()
+        self.log_widget.setReadOnly(True)
+        self.log_widget.setMaximumHeight(60)  # Примерно 4 строки
+        self.log_widget.setMinimumHeight(60)
+        #self.log_widget.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.log_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.log_widget.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.log_widget.setFont(QFont("Consolas", 10))  # Удобный шрифт
+        
+        # Создаем статус-бар
+        self.status_bar = StatusBar()
+        self.setStatusBar(self.status_bar)
+        
+              
+        # Создаем кастомную таблицу
+        self.station_model = StationTableModel(self)
+        self.table = TableWidgetWithDrag(self.station_model)
+        # Подключаем сигнал об изменении количества строк
+        self.table.row_count_changed.connect(self.on_table_row_count_changed)
+        # self.table.window = lambda: self
+
+        # Настройка внешнего вида таблицы
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(True)
+        self.table.setAlternatingRowColors(True)
+        self.table.setItemDelegateForColumn(2, IntegerValidatorDelegate(self.table))
+        self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+       
+        # self.table.addAction("Прослушать")
+        # self.table.addAction("Проверить станцию")
+        # self.table.addAction("Изменить")
+        # self.table.addAction("Удалить")
+    
+        
+        # Верхняя панель с кнопками (над таблицей)
+        top_panel_layout = QHBoxLayout()
+        
+        # Кнопки открыть/сохранить слева
+        self.open_csv_btn = QPushButton("Открыть CSV")
+        self.open_csv_btn.setProperty("class", "norm")
+        self.open_csv_btn.clicked.connect(self.open_csv)
+        
+        self.save_csv_btn = QPushButton("Сохранить CSV")
+        self.save_csv_btn.setProperty("class", "norm")
+        self.save_csv_btn.clicked.connect(self.save_csv)
+        
+        # Кнопки справа (справка, плеер, настройки)
+        # Создаем кнопку плеера и громкость
+        player_layout = QVBoxLayout()
+        self.player_btn = QPushButton("♫ Поток (F7)")
+        self.player_btn.setProperty("class", "norm")
+        self.player_btn.setShortcut(QKeySequence("F7"))
+        self.player_btn.clicked.connect(self.toggle_playback)
+
+           
+        # Создаем кнопку справки
+        self.help_btn = QPushButton("Справка")
+        self.help_btn.setProperty("class", "norm")
+        self.help_btn.clicked.connect(self.show_help)
+        
+        self.settings_btn = QPushButton("Настройки")
+        self.settings_btn.setProperty("class", "norm")
+        self.settings_btn.clicked.connect(self.open_settings)
+        
+        top_panel_layout.addWidget(self.open_csv_btn)
+        top_panel_layout.addWidget(self.save_csv_btn)
+        top_panel_layout.addStretch()
+        top_panel_layout.addWidget(self.help_btn)
+        #top_panel_layout.addWidget(self.player_btn)
+        top_panel_layout.addWidget(self.settings_btn)
+        
+        # Поле поиска и кнопки навигации (под таблицей)
+        search_layout = QHBoxLayout()
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        search_layout.setSpacing(5)
+        
+
+        self.prev_search_btn = QPushButton("▲")
+        self.prev_search_btn.setProperty("class", "navi")
+        # self.prev_search_btn.setStyleSheet(nav_button_style)
+        self.prev_search_btn.clicked.connect(self.prev_search_result)
+        self.prev_search_btn.setEnabled(0)
+        
+        self.next_search_btn = QPushButton("▼")
+        self.next_search_btn.setProperty("class", "navi")
+        # self.next_search_btn.setStyleSheet(nav_button_style)
+        self.next_search_btn.clicked.connect(self.next_search_result)
+        self.next_search_btn.setEnabled(0)
+
+        # Создаем поле поиска с индикатором результатов внутри
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Поиск...")
+        self.search_edit.setProperty("class", "search")
+        # self.search_edit.setObjectName("searchField") #searchField
+        self.search_edit.setFixedHeight(34)
+        
+        # Создаем лейбл для отображения статуса поиска (внутри поля поиска)
+        self.search_status_label = QLabel(self.search_edit)
+        self.search_status_label.setProperty("class", "searchStatus")
+        self.search_status_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+
+
+        # Инициализируем позицию лейбла
+        def update_label_position():
+            self.search_status_label.move(self.search_edit.width() - 60, 0)
+            self.search_status_label.resize(50, self.search_edit.height())
+
+        # Обработчик изменения размера поля поиска
+        self.search_edit.resizeEvent = lambda event: update_label_position()
+
+        # Первоначальная установка позиции
+        update_label_position()
+
+        # Вместо добавления search_edit в layout, добавляем контейнер
+        search_layout.addWidget(self.prev_search_btn)
+        search_layout.addWidget(self.next_search_btn)
+        search_layout.addWidget(self.search_edit) 
+        search_layout.addWidget(self.player_btn)
+
+        # Плеер 
+
+        # Громкость под кнопкой слушать
+        self.volume_slider = QSlider(Qt.Orientation.Horizontal)
+        self.volume_slider.setRange(0, 100)
+        self.volume_slider.setValue(int(self.stream_player.get_saved_volume() * 100))
+        self.volume_slider.valueChanged.connect(self.change_volume)
+        # self.volume_slider.setFixedWidth(130)
+        self.volume_slider.setMinimumWidth(130)
+        self.volume_slider.setMaximumWidth(290)
+
+        # Создаем слой для информации о станции
+        station_info_layout = QHBoxLayout()
+        station_info_layout.setContentsMargins(0, 0, 0, 0)  # Отступ сверху
+        # station_info_layout.setMaximumHeight(100)
+        # Создаем вертикальный layout для текстовых меток
+        station_labels_layout = QVBoxLayout()
+        station_labels_layout.setSpacing(0)
+        #station_labels_layout.setFixedWidth(0)
+        
+        # Получаем ширину кнопки плеера
+        button_width = self.player_btn.sizeHint().width()
+
+        # Создаем виджет-контейнер для меток с фиксированной шириной
+        station_info_container = QWidget()
+        station_info_container.setLayout(station_labels_layout)
+        # station_info_container.setFixedWidth(140)  # Устанавливаем ширину как у кнопки
+        station_info_container.setMinimumWidth(140)
+        station_info_container.setMaximumWidth(300)
+        station_info_container.setContentsMargins(0, 0, 0, 0)
+        # Метки для информации о станции
+        self.station_label = QLabel("Станция:")
+        self.station_name_label = QLabel("Неизвестно")
+        self.track_label = QLabel("Композиция:")
+        self.track_name_label = QLabel("Неизвестно")
+        self.format_label = QLabel("Формат/Битрейт:")
+        self.format_value_label = QLabel("Неизвестно")
+        
+        # Устанавливаем стиль для меток
+        label_style = """
+            QLabel {
+                font-size: 12px;
+                color: #666;
+            }
+            QLabel[title="true"] {
+                font-weight: bold;
+                color: #444;
+            }
+        """
+        
+        # Применяем стиль и устанавливаем свойство для заголовков
+        for label in [self.station_label, self.track_label, self.format_label]:
+            label.setStyleSheet(label_style)
+            label.setProperty("title", "true")
+        
+        for label in [self.station_name_label, self.track_name_label, self.format_value_label]:
+            label.setStyleSheet(label_style)
+        
+        # Добавляем метки в layout
+        station_labels_layout.addWidget(self.volume_slider)
+        station_labels_layout.addWidget(self.station_label)
+        station_labels_layout.addWidget(self.station_name_label)
+        station_labels_layout.addWidget(self.track_label)
+        station_labels_layout.addWidget(self.track_name_label)
+        station_labels_layout.addWidget(self.format_label)
+        station_labels_layout.addWidget(self.format_value_label)
+        station_info_layout.addWidget(station_info_container)
+        #station_info_layout.addLayout(station_labels_layout)
+        
+
+        # Кнопки управления строками
+        self.add_btn = QPushButton("Добавить (Ins)")
+        self.add_btn.setShortcut(QKeySequence(Qt.Key.Key_Insert))
+        self.add_btn.setProperty("class", "norm")
+        self.add_btn.clicked.connect(self.add_row)
+        #self.add_btn.setEnabled(0)
+
+        self.edit_btn = QPushButton("Изменить (F2)")
+        self.edit_btn.setShortcut(QKeySequence(Qt.Key.Key_F2))
+        self.edit_btn.setProperty("class", "norm")
+        self.edit_btn.clicked.connect(self.edit_row)
+        
+        self.del_btn = QPushButton("Удалить (Del)")
+        self.del_btn.setShortcut(QKeySequence(Qt.Key.Key_Delete))
+        self.del_btn.setProperty("class", "crit")
+        self.del_btn.clicked.connect(self.delete_row)
+        
+        # Кнопки операций
+        self.find_duplicates_btn = QPushButton("Найти дубли")
+        self.find_duplicates_btn.setProperty("class", "norm")
+        self.find_duplicates_btn.clicked.connect(self.find_duplicates)
+        
+        self.find_inactive_btn = QPushButton("Поиск битых")
+        self.find_inactive_btn.setProperty("class", "norm")
+        self.find_inactive_btn.clicked.connect(self.find_inactive)
+        
+        self.remove_duplicates_btn = QPushButton("Удалить дубли")
+        self.remove_duplicates_btn.setProperty("class", "crit")
+        self.remove_duplicates_btn.clicked.connect(self.remove_duplicates)
+        
+        self.remove_inactive_btn = QPushButton("Удалить битые")
+        self.remove_inactive_btn.setProperty("class", "crit")
+        self.remove_inactive_btn.clicked.connect(self.remove_inactive)
+        
+        self.fix_names_btn = QPushButton("Фикс Названий")
+        self.fix_names_btn.setProperty("class", "norm")
+        self.fix_names_btn.clicked.connect(self.fix_names)
+
+        self.fix_https_btn = QPushButton("Фикс HTTPS")
+        self.fix_https_btn.setProperty("class", "norm")
+        self.fix_https_btn.clicked.connect(self.fix_https)
+        
+        # Группировка кнопок в колонки
+        buttons_layout = QHBoxLayout()
+        
+        # Левая колонка (добавление и поиск дублей)
+        left_buttons = QVBoxLayout()
+        left_buttons.addWidget(self.add_btn)
+        left_buttons.addWidget(self.find_duplicates_btn)
+        left_buttons.addWidget(self.remove_duplicates_btn)
+        
+        # Средняя колонка (изменение и поиск битых)
+        middle_buttons = QVBoxLayout()
+        middle_buttons.addWidget(self.edit_btn)
+        middle_buttons.addWidget(self.find_inactive_btn)
+        #middle_buttons.addWidget(self.fix_https_btn)  # Фикс HTTPS теперь здесь
+        middle_buttons.addWidget(self.remove_inactive_btn)
+        
+        # Правая колонка (удаление и удаление битых)
+        right_buttons = QVBoxLayout()
+        right_buttons.addWidget(self.del_btn)  # Удалить теперь на одном уровне с Изменить
+        #right_buttons.addWidget(self.remove_inactive_btn)
+        right_buttons.addWidget(self.fix_https_btn)
+        right_buttons.addWidget(self.fix_names_btn)
+        #right_buttons.addStretch()
+        
+        
+        # Добавляем все колонки в основной лейаут
+        buttons_layout.addLayout(left_buttons)
+        buttons_layout.addLayout(middle_buttons)
+        buttons_layout.addLayout(right_buttons)
+        # buttons_layout.addStretch()
+        
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addLayout(buttons_layout)
+        bottom_layout.addStretch()
+        bottom_layout.addLayout(station_info_layout)
+        
+        # Основной лейаут
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(top_panel_layout)  # Верхняя панель с кнопками
+        main_layout.addWidget(self.table, 1)     # Таблица
+        main_layout.addLayout(search_layout)     # Строка поиска с кнопкой плеер
+        main_layout.addLayout(bottom_layout)     #Кнопки редактирования с информацией
+        main_layout.addWidget(self.log_widget)   #Лог
+        main_layout.setSpacing(12)
+        main_layout.setContentsMargins(12, 12, 12, 12)
+        container = QWidget()
+        container.setLayout(main_layout)
+        self.setCentralWidget(container)
+        
+        
+        # Добавляем переменные для хранения результатов поиска
+        self.search_results = []
+        self.current_search_index = -1
+        
+        # Поиск запускается после паузы в наборе текста
+        self.search_index = StationSearchIndex(self.station_model)
+        self.last_search_text = ""
+        self.last_search_version = -1
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.perform_search)
+
+        # Индекс дублей обновляется вместе с таблицей
+        self.duplicate_index = StationDuplicateIndex(
+            self.station_model, by_final_url=self.config['Settings'].get('duplicates_by_final_url', '0') == '1'
+        )
+        self.search_edit.textChanged.connect(self.search_timer.start)
+
+        # Менеджер состояния UI
+        self.ui_state_manager = UIStateManager(self)
+        self.table.selectionModel().selectionChanged.connect(self.update_selection_state)
+
+        # Фоновая загрузка файла
+        self.csv_load_thread = None
+        self.loading_file_path = None
+        # Заблаговременное разрешение имен хостов загруженного плейлиста
+        self.dns_prefetch_thread = None
+        # Поток проверки станций
+        self.check_thread = None
+
+        # Кэш результатов проверки станций
+        self.has_checked_stations = False
+        self.probe_cache = self.create_probe_cache()
+        self.station_checker.cache = self.probe_cache
+
+    def create_probe_cache(self):
+        """Открыть кэш результатов проверки (None, если кэш выключен или недоступен)"""
+        try:
+            return ProbeCache.from_settings(self.config['Settings'])
+        except sqlite3.Error as e:
+            self.log(f"Кэш проверок недоступен: {str(e)}")
+            return None
+
+    def show_help(self):
+        """Показать окно справки"""
+        help_dialog = HelpDialog(self)
+        help_dialog.exec()
+
+    def on_table_row_count_changed(self, row_count):
+        """Обработчик изменения количества строк в таблице"""
+        self.ui_state_manager.has_data = row_count > 0
+        self.ui_state_manager.update_state()
+        self.update_selection_state()
+        
+    def update_window_title(self):
+        """Обновление заголовка окна с именем файла"""
+        self.setWindowTitle(f"Радио менеджер [{self.current_file_name}]")
+
+    def update_search_nav_buttons(self):
+        """Обновить состояние кнопок навигации и статус поиска"""
+        has_results = len(self.search_results) > 0
+        self.prev_search_btn.setEnabled(has_results)
+        self.next_search_btn.setEnabled(has_results)
+
+        if has_results:
+            status = f"{self.current_search_index + 1}/{len(self.search_results)}"
+            self.search_status_label.setText(status)
+        else:
+            self.search_status_label.setText("")
+        
+    def perform_search(self):
+        """Выполнить поиск по таблице"""
+        self.search_timer.stop()
+        search_text = self.search_edit.text().lower()
+        self.current_search_index = -1
+        self.search_status_label.setText("")  # Сбрасываем статус
+
+        if not search_text:
+            self.search_results = []
+            self.last_search_text = ""
+            self.station_model.reset_highlighting()
+            self.update_search_nav_buttons()
+            return
+
+        # Уточнение прошлого запроса по неизменной таблице ищем только среди прошлых результатов
+        # (для запросов с фильтрами дописанный текст может ослабить условие, например bitrate>1 -> bitrate>12)
+        within = None
+        if (self.last_search_text and self.last_search_text in search_text
+                and self.last_search_version == self.search_index.version
+                and not self.search_index.has_filters(search_text)):
+            within = self.search_results
+        self.search_results = self.search_index.query(search_text, within)
+        self.last_search_text = search_text
+        self.last_search_version = self.search_index.version
+
+        # Определяем стиль подсветки в зависимости от запроса
+        highlight_style = "error" if search_text == "[double]" else "highlight"
+        self.station_model.highlight_only(self.search_results, highlight_style)
+
+        if self.search_results:
+            self.current_search_index = 0
+            self.table.selectRow(self.search_results[self.current_search_index])
+        
+        self.update_search_nav_buttons()
+    
+    def prev_search_result(self):
+        """Перейти к предыдущему результату поиска"""
+        if not self.search_results:
+            return
+            
+        self.current_search_index -= 1
+        if self.current_search_index < 0:
+            self.current_search_index = len(self.search_results) - 1
+            
+        self.table.selectRow(self.search_results[self.current_search_index])
+        self.update_search_nav_buttons()
+    
+    def next_search_result(self):
+        """Перейти к следующему результату поиска"""
+        if not self.search_results:
+            return
+            
+        self.current_search_index += 1
+        if self.current_search_index >= len(self.search_results):
+            self.current_search_index = 0
+            
+        self.table.selectRow(self.search_results[self.current_search_index])
+        self.update_search_nav_buttons()
+    
+    def open_csv(self):
+        """Открытие CSV-файла: разбор в фоновом потоке, станции появляются в таблице по мере загрузки"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Открыть файл", "", "CSV Files (*.csv)"
+        )
+        if not file_path:
+            return
+
+        self.log("Открытие файла...")
+        
+        # Очищаем таблицу перед загрузкой
+        self.station_model.set_stations([])
+        self.update_selection_state()
+        self.has_checked_stations = False
+        self.ui_state_manager.is_loading = True
+        self.ui_state_manager.has_data = False
+        self.ui_state_manager.check_completed = False
+        self.ui_state_manager.found_inactive = False
+        self.ui_state_manager.has_duplicates = False
+        self.ui_state_manager.update_state()
+
+        self.open_csv_btn.setText("Отмена")
+        self.open_csv_btn.clicked.disconnect()
+        self.open_csv_btn.clicked.connect(self.cancel_loading)
+        
+        # Показываем прогресс в статусбаре
+        self.status_bar.show_message("Обработка файла...")
+        self.status_bar.set_progress_range(0, 100)
+        self.status_bar.show_progress(True)
+
+        self.loading_file_path = file_path
+        self.csv_load_thread = CsvLoadThread(file_path, self, cache=self.probe_cache)
+        self.csv_load_thread.batch_loaded.connect(self.on_csv_batch_loaded)
+        self.csv_load_thread.progress_changed.connect(self.status_bar.set_progress)
+        self.csv_load_thread.loading_finished.connect(self.on_csv_loading_finished)
+        self.csv_load_thread.start()
+
+    def cancel_loading(self):
+        """Отмена загрузки файла"""
+        if self.csv_load_thread is not None:
+            self.csv_load_thread.cancel()
+
+    def on_csv_batch_loaded(self, stations, log_messages):
+        """Очередная пачка станций из фоновой загрузки"""
+        self.station_model.append_stations(stations)
+        if log_messages:
+            # Одной вставкой: построчное добавление в лог заметно тормозит на больших файлах
+            self.log("\n".join(log_messages))
+        if stations and not self.ui_state_manager.has_data:
+            self.ui_state_manager.has_data = True
+            self.ui_state_manager.update_state()
+        self.status_bar.show_message(f"Загружено станций: {self.station_model.rowCount()}")
+
+    def on_csv_loading_finished(self, success_count, error_count, cancelled):
+        """Завершение фоновой загрузки файла"""
+        # Результаты прошлых проверок подставлены из кэша во время загрузки
+        cached_count = self.csv_load_thread.cached_count
+        cached_dead = self.csv_load_thread.cached_dead
+        self.csv_load_thread = None
+        self.open_csv_btn.setText("Открыть CSV")
+        self.open_csv_btn.clicked.disconnect()
+        self.open_csv_btn.clicked.connect(self.open_csv)
+        self.status_bar.show_progress(False)
+
+        self.has_checked_stations = cached_count > 0
+        self.ui_state_manager.is_loading = False
+        self.ui_state_manager.check_completed = cached_count > 0
+        self.ui_state_manager.found_inactive = cached_dead > 0
+        self.ui_state_manager.has_data = self.table.rowCount() > 0
+        self.ui_state_manager.update_state()
+        if cached_count:
+            self.log(f"Результаты из кэша проверок: {cached_count} станций, из них битых: {cached_dead}")
+        # Обновляем заголовок окна
+        self.current_file_name = Path(self.loading_file_path).name
+        self.update_window_title()
+
+        if cancelled:
+            self.log(f"Загрузка отменена, загружено станций: {self.station_model.rowCount()}")
+            self.status_bar.show_message("Загрузка отменена", 3)
+        else:
+            self.status_bar.show_message("Файл загружен", 3)
+            self.start_dns_prefetch()
+
+    def start_dns_prefetch(self):
+        """Заранее разрешить имена хостов плейлиста, пока пользователь не начал проверку"""
+        if self.dns_prefetch_thread is not None or not self.station_model.rowCount():
+            return
+        self.dns_prefetch_thread = DnsPrefetchThread(list(self.station_model.urls))
+        self.dns_prefetch_thread.prefetch_finished.connect(self.on_dns_prefetch_finished)
+        self.dns_prefetch_thread.start()
+
+    def on_dns_prefetch_finished(self, hosts, resolved, failed, elapsed):
+        self.dns_prefetch_thread = None
+        if hosts:
+            self.log(f"Имена серверов разрешены заранее: {resolved} из {hosts}, "
+                     f"не найдено: {failed}, за {elapsed:.1f} с")
+
+    def save_csv(self):
+        """Сохранение таблицы в формате CSV"""
+        if self.table.rowCount() == 0:
+            QMessageBox.information(self, "Сохранение", "Таблица пуста.")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить файл", "", "CSV Files (*.csv)"
+        )
+        if not file_path:
+            return
+
+        # Собираем данные из таблицы
+        stations = self.station_model.stations()
+        
+        # Сохраняем файл
+        try:
+            data_processor = DataProcessor()
+            success, message = data_processor.save_csv_file(file_path, stations)
+            
+            if success:
+                self.log(message)
+                # Обновляем заголовок окна
+                self.current_file_name = Path(file_path).name
+                self.update_window_title()
+
+            else:
+                self.log(message)
+                QMessageBox.critical(self, "Ошибка", message)
+                
+        except Exception as e:
+            error_msg = f"Ошибка при сохранении файла: {str(e)}"
+            self.log(error_msg)
+            QMessageBox.critical(self, "Ошибка", error_msg)
+    # Заглушки для новых методов (реализацию добавите позже)
+ 
+    def find_duplicates(self):
+        """Поиск дубликатов станций по URL"""
+        if self.table.rowCount() == 0:
+            QMessageBox.information(self, "Поиск дублей", "Таблица пуста.")
+            return
+        
+        # Сбрасываем предыдущие результаты
+        self.table.reset_all_highlighting()
+        self.duplicates = []
+        self.has_duplicates = False
+        
+        # Группы одинаковых адресов из индекса, первую строку группы не трогаем, остальные помечаем как дубли
+        groups = self.duplicate_index.duplicate_groups()
+        for rows in groups:
+            self.duplicates.extend(rows[1:])
+        self.duplicates.sort()
+        duplicate_count = len(self.duplicates)
+        self.station_model.set_column(StationTableModel.INFO, {row: "[DOUBLE]" for row in self.duplicates})
+        self.station_model.set_highlights(self.duplicates, "error")
+        
+        self.has_duplicates = duplicate_count > 0
+        self.ui_state_manager.has_duplicates = self.has_duplicates  # Обновляем флаг
+        self.ui_state_manager.update_state()
+
+        
+        # Обновляем UI
+        # self.update_remove_buttons_state()
+        
+        if duplicate_count > 0:
+            # Устанавливаем текст поиска для навигации
+            self.search_edit.setText("[DOUBLE]")
+            self.perform_search()
+            self.log(f"Найдено {duplicate_count} дублей в {len(groups)} группах из {self.table.rowCount()} станций")
+            # self.button_states.has_duplicates = duplicate_count > 0
+            # self.button_states.update_states()
+        else:
+            self.log("Дубликаты не найдены")
+
+    def remove_duplicates(self):
+        """Удаление всех найденных дубликатов"""
+        if not self.has_duplicates or not self.duplicates:
+            QMessageBox.information(self, "Удаление дублей", "Дубликаты не найдены.")
+            return
+        
+        reply = QMessageBox.question(
+            self, 
+            "Удаление дублей", 
+            f"Вы действительно хотите удалить {len(self.duplicates)} дубликатов?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            started = time.monotonic()
+            self.station_model.remove_rows(self.duplicates)
+            elapsed = time.monotonic() - started
+            
+            removed_count = len(self.duplicates)
+            self.duplicates = []
+            self.has_duplicates = False
+            # self.button_states.has_duplicates = False
+            # self.button_states.update_states()
+            
+            # Очищаем поиск и подсветку
+            # self.search_edit.clear()
+            self.table.reset_all_highlighting()
+            self.has_duplicates = False
+            self.ui_state_manager.has_duplicates = False
+            self.ui_state_manager.update_state()
+            self.log(f"Удалено {removed_count} дубликатов за {elapsed:.2f} с")
+            # Очищаем поиск и подсветку
+            self.search_edit.clear()  # Добавлено очищение поля поиска
+            self.table.reset_all_highlighting()
+
+    
+    def fix_https(self):
+        """Простая замена https на http в URL"""
+        if self.table.rowCount() == 0:
+            QMessageBox.information(self, "Фикс HTTPS", "Таблица пуста.")
+            return
+
+        # Простое сообщение с подтверждением
+        reply = QMessageBox.question(
+            self,
+            "Фикс HTTPS",
+            "Для поддержки старых прошивок рекомендуется изменить\n"
+            "протокол в адресах с HTTPS на HTTP.\n\n"
+            "Продолжить?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        changed_count = 0
+        total_count = self.table.rowCount()
+
+        new_urls = {}
+        for row, url in enumerate(self.station_model.urls):
+            url = url.strip()
+            if url.startswith("https://"):
+                new_urls[row] = url.replace("https://", "http://", 1)
+        self.station_model.set_column(StationTableModel.URL, new_urls)
+        changed_count = len(new_urls)
+
+        # Простой отчет в лог
+        if changed_count > 0:
+            self.log(f"Заменено HTTPS на HTTP: {changed_count}/{total_count} станций")
+        else:
+            self.log("URL с HTTPS не найдены")
+
+    def fix_names(self):
+        """Фикс Названий"""
+        if self.table.rowCount() == 0:
+            QMessageBox.information(self, "Фикс Названий", "Таблица пуста.")
+            return
+
+        # Получаем текущий шаблон из настроек
+        template = self.config['Settings'].get('rename_template', DEFAULT_RENAME_TEMPLATE)
+
+        # Создаем и открываем диалог
+        dialog = RenameTemplateDialog(template, self)
+        result = dialog.exec()
+
+        if result == QDialog.DialogCode.Rejected: # Отменено
+            return
+
+        # Получаем шаблон из диалога (он мог измениться)
+        new_template = dialog.get_template()
+
+        # Собираем данные для переименования
+        model = self.station_model
+        stations_data_for_renaming = [(row, name, model.result(row)) for row, name in enumerate(model.names)]
+
+        if not stations_data_for_renaming:
+            self.log("Нет данных станций для переименования.")
+            return
+
+        # Определяем, применять ко всем или к выделенному
+        apply_to_all = (result == 1) # 1 это "Все"
+        # Если "Выбранный", то найдем выделенную строку
+        selected_row = self.table.currentRow()
+        if not apply_to_all:
+            if selected_row < 0 or selected_row >= len(stations_data_for_renaming):
+                 QMessageBox.warning(self, "Фикс Названий", "Выберите строку для применения.")
+                 return
+            # Фильтруем список до одной строки
+            stations_data_for_renaming = [stations_data_for_renaming[selected_row]]
+
+        # Применяем переименование
+        self.log(f"Начинаем фикс названий по шаблону: {new_template}")
+        name_fixer = NameFixer()
+        try:
+            new_names = name_fixer.fix_names(stations_data_for_renaming, new_template, apply_to_all)
+            self.station_model.set_column(StationTableModel.NAME, new_names)
+            self.log("Фикс названий завершён.")
+        except Exception as e:
+            self.log(f"Ошибка при фиксе названий: {e}")
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при фиксе названий:\n{e}")
+    
+
+    
+    def toggle_playback(self):
+        """Переключение воспроизведения"""
+        # if self.is_checking:
+        #     return
+            
+        row = self.table.currentRow()
+        
+        if row < 0:
+            # Если нет выделенной строки, останавливаем воспроизведение
+            if self.stream_player.is_currently_playing():
+                self.stream_player.stop()
+            return
+        
+        # Получаем URL из выделенной строки
+        url = self.station_model.urls[row].strip()
+        if not url:
+            return
+        
+        # Переключаем воспроизведение
+        if self.stream_player.toggle_playback(row, url):
+
+            oldname = self.station_model.names[row] or "Неизвестно"
+            result = self.station_model.result(row)
+            if result is not None and result['status'] == 'OK':
+                station_name = result['name'] or oldname
+                bitrate = result['bitrate'] or "N/A"
+                codec = result['codec'] or "N/A"
+                self.station_name_label.setText(station_name)
+                self.format_value_label.setText(f"{codec}/{bitrate}")
+                self.track_name_label.setText("-")     # пока нет трека
+            else:
+                self.station_name_label.setText(oldname)
+                self.format_value_label.setText("-")
+                self.track_name_label.setText("-")
+
+        else:
+            # Остановили воспроизведение
+            self.station_name_label.setText("Неизвестно")
+            self.track_name_label.setText("Неизвестно")
+            self.format_value_label.setText("Неизвестно")
+
+    def on_playback_toggled(self, is_playing):
+        """Обработчик изменения состояния воспроизведения"""
+        if is_playing:
+            self.player_btn.setText("■ Поток (F7)")
+        else:
+            self.player_btn.setText("♫ Поток (F7)")
+        self.player_btn.setShortcut(QKeySequence("F7"))    
+
+    def update_station_info(self, station_name, track_name, format_info):
+        """Обновление информации о станции"""
+        self.station_name_label.setText(station_name)
+        self.track_name_label.setText(track_name)
+        self.format_value_label.setText(format_info)
+
+    def change_volume(self, value):
+        """Изменение громкости"""
+        volume = value / 100.0
+        self.stream_player.set_volume(volume)
+
+    def find_inactive(self):
+        """Поиск битых станций"""
+
+        # Останавливаем плеер, если он запущен
+        if self.stream_player.is_currently_playing():
+            self.log("Останавливаем плеер перед началом проверки")
+            self.stream_player.stop()
+
+
+        self.ui_state_manager.is_checking = True
+        self.ui_state_manager.update_state()
+
+        if self.table.rowCount() == 0:
+            QMessageBox.information(self, "Проверка", "Таблица пуста.")
+            return
+        
+        # if self.is_checking:
+        #     return
+        
+        # Получаем настройки из конфига
+        self.station_checker.apply_settings(self.config['Settings'])
+        
+
+        self.find_inactive_btn.setText("Отмена")
+        self.find_inactive_btn.clicked.disconnect()
+        self.find_inactive_btn.clicked.connect(self.cancel_check)
+        
+        # Блокируем таблицу
+        
+        
+        # Инициализируем переменные
+        # self.is_checking = True
+        self.has_checked_stations = False
+        
+        # Собираем данные для проверки
+        stations_data = []
+        for row, url in enumerate(self.station_model.urls):
+            url = url.strip()
+            if url:
+                stations_data.append((row, url))
+        
+        if not stations_data:
+            self.log("Нет станций для проверки")
+            # self.finish_check()
+            return
+        
+        self.check_started_at = time.monotonic()
+        use_cache = True
+        if self.config['Settings'].get('check_mode', 'full') == 'incremental':
+            if self.probe_cache is not None and self.probe_cache.enabled:
+                stations_data = self.plan_incremental_check(stations_data)
+                use_cache = False  # План уже учел кэш
+                if not stations_data:
+                    self.log("Все станции проверены недавно, проверять нечего")
+                    self.on_check_finished(0, 0, 0)
+                    return
+            else:
+                self.log("Инкрементальная проверка требует кэша результатов, выполняется полная проверка")
+
+        self.log(f"Запущен поиск битых станций. Всего: {len(stations_data)}")
+        self.status_bar.show_message(f"Проверено 0 из {len(stations_data)}")
+        self.status_bar.show_progress(True)
+        self.status_bar.set_progress_range(0, len(stations_data))
+        
+        # Запускаем проверку в отдельном потоке (прошлая, уже отмененная, могла еще не выйти)
+        self.stop_check_thread()
+        self.check_thread = StationCheckThread(self.station_checker, stations_data, self, use_cache=use_cache)
+        self.check_thread.start()
+
+    def plan_incremental_check(self, stations_data):
+        """
+        Оставить для проверки только новые, измененные, устаревшие и сбойные станции.
+        Свежие результаты из кэша сразу выводятся в таблицу.
+        """
+        recheck_hours = int(self.config['Settings'].get('recheck_hours', '24'))
+        to_check, fresh, counts = self.probe_cache.plan_recheck(stations_data, recheck_hours)
+
+        for row, result in fresh:
+            if result['status'] != 'OK':
+                self.ui_state_manager.found_inactive = True
+        self.station_model.set_results(dict(fresh))
+        # Свежие результаты из кэша - тоже итог проверки, по ним можно удалять битые станции
+        self.has_checked_stations = bool(fresh)
+
+        self.log(f"Инкрементальная проверка: {len(to_check)} из {len(stations_data)} станций "
+                 f"(сбои: {counts['failed']}, новые и измененные: {counts['new']}, "
+                 f"старше {recheck_hours} ч: {counts['stale']}), пропущено свежих: {len(fresh)}")
+        return to_check
+
+    def cancel_check(self):
+        """Отмена проверки"""
+        # if not self.is_checking:
+        #     return
+            
+        reply = QMessageBox.question(self, "Отмена", "Остановить проверку станций?",
+                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.log("Остановка проверки, ожидаем ответа станций")
+            self.station_checker.cancel_check()
+
+    def stop_check_thread(self):
+        """Отменить идущую проверку и дождаться выхода ее потока"""
+        if self.check_thread is None:
+            return
+        if self.check_thread.isRunning():
+            self.station_checker.cancel_check()
+        self.check_thread.quit()
+        self.check_thread.wait()
+        self.check_thread = None
+
+    def update_check_progress(self, checked, total):
+        """Обновление прогресса проверки"""
+        self.status_bar.set_progress(checked)
+        self.status_bar.show_message(f"Проверено {checked} из {total}")
+
+    def on_prefilter_finished(self, endpoints, unreachable, stations):
+        """Итог первой фазы проверки (DNS и соединение с серверами)"""
+        self.log(f"Доступность серверов: {endpoints - unreachable} из {endpoints} отвечают, "
+                 f"станций недоступных серверов: {stations}")
+
+    def on_retries_finished(self, retried, recovered):
+        """Итог повторных проверок после временных сбоев"""
+        self.log(f"Повторных проверок после временных сбоев: {retried}, станций ответило на повторе: {recovered}")
+
+    def update_check_concurrency(self, value):
+        """Текущее число одновременных проверок (адаптивный режим)"""
+        self.status_bar.set_concurrency(value)
+
+    def update_station_info_cells(self, results):
+        """Обновление ячеек информации пачкой результатов проверки [(строка, результат), ...]"""
+        row_count = self.station_model.rowCount()
+        results = {row: result for row, result in results if 0 <= row < row_count}
+        self.station_model.set_results(results)
+        # Если найдены битые станции
+        if not self.ui_state_manager.found_inactive and any(
+                result['status'] in StationChecker.DEAD_STATUSES for result in results.values()):
+            self.ui_state_manager.found_inactive = True
+            self.ui_state_manager.update_state()
+
+    def on_check_finished(self, checked_count, active_count, dead_count):
+        """Завершение проверки"""
+
+        self.ui_state_manager.is_checking = False
+        self.ui_state_manager.check_completed = True
+        self.ui_state_manager.update_state()
+
+        # self.is_checking = False
+        self.has_checked_stations = self.has_checked_stations or checked_count > 0
+        
+        self.log(f"Проверка окончена. Проверено: {checked_count}, Активных: {active_count}, Мертвых: {dead_count}")
+        if checked_count:
+            self.log_check_throughput(checked_count)
+            self.log_encoding_cache_stats()
+        
+        # Восстанавливаем UI
+        # self.finish_check()
+        # Восстанавливаем кнопки
+
+        self.find_inactive_btn.setText("Поиск битых")
+        self.find_inactive_btn.clicked.disconnect()
+        self.find_inactive_btn.clicked.connect(self.find_inactive)
+        
+        # Скрываем прогрессбар
+        self.status_bar.show_progress(False)
+        self.status_bar.set_concurrency(None)
+
+    def log_check_throughput(self, checked_count):
+        """Вывести в лог скорость проверки для текущего режима запроса и движка"""
+        elapsed = time.monotonic() - self.check_started_at
+        mode = StationChecker.PROBE_MODES.get(self.station_checker.probe_mode, self.station_checker.probe_mode)
+        rate = checked_count / elapsed if elapsed > 0 else 0
+        self.log(f"Режим {mode} ({self.station_checker.engine}): {checked_count} станций за {elapsed:.1f} с, "
+                 f"{rate:.1f} станций/с")
+
+    def log_encoding_cache_stats(self):
+        """Доля битых названий и жанров, исправленных из кэша"""
+        hits, misses = StationChecker.encoding_cache_stats()
+        if hits + misses:
+            self.log(f"Кэш исправления кодировок: попаданий {hits} из {hits + misses} "
+                     f"({100 * hits / (hits + misses):.1f}%)")
+
+    def on_check_cancelled(self, checked_count, active_count, dead_count):
+        """Отмена проверки пользователем"""
+        self.ui_state_manager.is_checking = False
+        self.ui_state_manager.update_state()
+
+        # self.is_checking = False
+        self.has_checked_stations = True  # Раз проверка началась, делаем кнопки активными
+        
+        self.log(f"Проверка отменена пользователем. Проверено: {checked_count}, "
+                 f"Активных: {active_count}, Мертвых: {dead_count}")
+        # self.finish_check()
+        self.ui_state_manager.is_checking = False
+        self.ui_state_manager.check_completed = True
+        self.ui_state_manager.update_state()
+
+        """Завершение проверки и восстановление UI"""
+        # Восстанавливаем кнопки
+
+        self.find_inactive_btn.setText("Поиск битых")
+        self.find_inactive_btn.clicked.disconnect()
+        self.find_inactive_btn.clicked.connect(self.find_inactive)
+        
+        # Скрываем прогрессбар
+        self.status_bar.show_progress(False)
+        self.status_bar.set_concurrency(None)
+
+
+    def remove_inactive(self):
+        """Удаление неактивных станций с выбором флагов"""
+        if not self.has_checked_stations:
+            QMessageBox.information(
+                self, "Удаление", 
+                "Сначала выполните проверку станций."
+            )
+            return
+        
+        # Загружаем текущие настройки флагов из конфига
+        config = ConfigManager.load_config()
+        selected_flags = {}
+        for flag in ["404", "Error", "ConnError", "Timeout"]:
+            value = config['Settings'].get(f'delete_{flag}', 'True')
+            selected_flags[flag] = value.lower() in ['true', '1', 'yes']
+        
+        # Диалог выбора флагов
+        dialog = DeleteInactiveDialog(selected_flags, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        # Получаем выбранные флаги
+        selected_flags = dialog.get_selected_flags()
+        if not selected_flags:
+            QMessageBox.information(
+                self, "Удаление", 
+                "Не выбрано ни одного флага для удаления."
+            )
+            return
+        
+        # Сохраняем выбор пользователя в конфиг
+        for flag in ["404", "Error", "ConnError", "Timeout"]:
+            config['Settings'][f'delete_{flag}'] = str(f"[{flag}]" in selected_flags).lower()
+        ConfigManager.save_config(config)
+
+        # Подсчитываем станции с выбранными флагами
+        statuses = {flag.strip('[]') for flag in selected_flags}
+        dead_rows = [row for row, status in enumerate(self.station_model.statuses) if status in statuses]
+        
+        if not dead_rows:
+            QMessageBox.information(
+                self, "Удаление", 
+                "Станций с выбранными флагами не найдено."
+            )
+            return
+        
+        # Подтверждение удаления
+        reply = QMessageBox.question(
+            self, "Удаление",
+            f"Удалить {len(dead_rows)} станций со следующими флагами:\n" +
+            ", ".join(selected_flags) + "?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            started = time.monotonic()
+            self.station_model.remove_rows(dead_rows)
+            elapsed = time.monotonic() - started
+            
+            self.log(f"Удалено {len(dead_rows)} неактивных станций за {elapsed:.2f} с")
+            self.has_checked_stations = False  # Сбрасываем статус проверки
+            self.ui_state_manager.check_completed = False
+            self.ui_state_manager.has_data = self.table.rowCount() > 0
+            self.ui_state_manager.update_state()
+            # Сбрасываем флаги после удаления
+            self.ui_state_manager.found_inactive = False
+            self.ui_state_manager.check_completed = False
+            self.ui_state_manager.update_state()
+
+    def closeEvent(self, event):
+        # Сохраняем размер окна перед закрытием
+        self.config['Settings']['window_width'] = str(self.width())
+        self.config['Settings']['window_height'] = str(self.height())
+        ConfigManager.save_config(self.config)
+        self.stream_player.shutdown()
+        self.stop_check_thread()
+        if self.csv_load_thread is not None:
+            self.csv_load_thread.cancel()
+            self.csv_load_thread.wait()
+        if self.dns_prefetch_thread is not None:
+            self.dns_prefetch_thread.cancel()
+            self.dns_prefetch_thread.wait()
+        if self.probe_cache is not None:
+            self.probe_cache.close()
+        event.accept()        
+        
+    def open_settings(self):
+        current_theme = self.config['Settings'].get('theme', 'light')
+        max_threads = int(self.config['Settings'].get('max_check_threads', '10'))
+        current_timeout = int(self.config['Settings'].get('check_timeout', '10'))
+        current_template = self.config['Settings'].get('rename_template', DEFAULT_RENAME_TEMPLATE)
+        current_engine = self.config['Settings'].get('check_engine', 'threads')
+        async_concurrency = int(self.config['Settings'].get('async_concurrency', '500'))
+        per_host_limit = int(self.config['Settings'].get('per_host_limit', '4'))
+        probe_mode = self.config['Settings'].get('probe_mode', 'get')
+        cache_ttl = int(self.config['Settings'].get('cache_ttl_hours', '24'))
+        check_mode = self.config['Settings'].get('check_mode', 'full')
+        recheck_hours = int(self.config['Settings'].get('recheck_hours', '24'))
+        player_proxy = self.config['Settings'].get('player_proxy', '0') == '1'
+        duplicates_by_final_url = self.config['Settings'].get('duplicates_by_final_url', '0') == '1'
+        adaptive_concurrency = self.config['Settings'].get('adaptive_concurrency', '0') == '1'
+        connect_timeout = int(self.config['Settings'].get('connect_timeout', '3'))
+        connect_prefilter = self.config['Settings'].get('connect_prefilter', '1') == '1'
+        retry_attempts = int(self.config['Settings'].get('retry_attempts', '2'))
+        retry_delay = int(self.config['Settings'].get('retry_delay', '1'))
+        
+        # Передать current_template в диалог
+        dialog = SettingsDialog(current_theme, max_threads, current_timeout, current_template, self,
+                                current_engine=current_engine, async_concurrency=async_concurrency,
+                                per_host_limit=per_host_limit, probe_mode=probe_mode,
+                                cache_ttl_hours=cache_ttl, check_mode=check_mode, recheck_hours=recheck_hours,
+                                player_proxy=player_proxy, duplicates_by_final_url=duplicates_by_final_url,
+                                adaptive_concurrency=adaptive_concurrency, connect_timeout=connect_timeout,
+                                connect_prefilter=connect_prefilter, retry_attempts=retry_attempts,
+                                retry_delay=retry_delay)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            new_theme = dialog.get_selected_theme()
+            new_threads = dialog.get_max_threads()
+            new_timeout = dialog.get_timeout()
+            new_engine = dialog.get_engine()
+            new_async_concurrency = dialog.get_async_concurrency()
+            new_per_host_limit = dialog.get_per_host_limit()
+            new_probe_mode = dialog.get_probe_mode()
+            new_cache_ttl = dialog.get_cache_ttl()
+            new_check_mode = dialog.get_check_mode()
+            new_recheck_hours = dialog.get_recheck_hours()
+            new_player_proxy = dialog.get_player_proxy()
+            new_duplicates_by_final_url = dialog.get_duplicates_by_final_url()
+            new_adaptive_concurrency = dialog.get_adaptive_concurrency()
+            new_connect_timeout = dialog.get_connect_timeout()
+            new_connect_prefilter = dialog.get_connect_prefilter()
+            new_retry_attempts = dialog.get_retry_attempts()
+            new_retry_delay = dialog.get_retry_delay()
+            new_template = dialog.get_rename_template() # Получаем шаблон
+            
+            changed = False
+            
+            if new_theme != current_theme:
+                self.config['Settings']['theme'] = new_theme
+                changed = True
+                ThemeManager.apply_theme(new_theme)
+            
+            if new_threads != max_threads:
+                self.config['Settings']['max_check_threads'] = str(new_threads)
+                changed = True
+                
+            if new_timeout != current_timeout:
+                self.config['Settings']['check_timeout'] = str(new_timeout)
+                changed = True
+                self.station_checker.set_timeout(new_timeout)
+
+            if new_connect_timeout != connect_timeout:
+                self.config['Settings']['connect_timeout'] = str(new_connect_timeout)
+                changed = True
+
+            if new_connect_prefilter != connect_prefilter:
+                self.config['Settings']['connect_prefilter'] = '1' if new_connect_prefilter else '0'
+                changed = True
+
+            if new_retry_attempts != retry_attempts:
+                self.config['Settings']['retry_attempts'] = str(new_retry_attempts)
+                changed = True
+
+            if new_retry_delay != retry_delay:
+                self.config['Settings']['retry_delay'] = str(new_retry_delay)
+                changed = True
+
+            if new_adaptive_concurrency != adaptive_concurrency:
+                self.config['Settings']['adaptive_concurrency'] = '1' if new_adaptive_concurrency else '0'
+                changed = True
+
+            if new_engine != current_engine:
+                self.config['Settings']['check_engine'] = new_engine
+                changed = True
+
+            if new_async_concurrency != async_concurrency:
+                self.config['Settings']['async_concurrency'] = str(new_async_concurrency)
+                changed = True
+
+            if new_per_host_limit != per_host_limit:
+                self.config['Settings']['per_host_limit'] = str(new_per_host_limit)
+                changed = True
+
+            if new_probe_mode != probe_mode:
+                self.config['Settings']['probe_mode'] = new_probe_mode
+                changed = True
+
+            if new_cache_ttl != cache_ttl:
+                self.config['Settings']['cache_ttl_hours'] = str(new_cache_ttl)
+                changed = True
+                if self.probe_cache is not None:
+                    self.probe_cache.ttl_hours = new_cache_ttl
+                else:
+                    self.probe_cache = self.create_probe_cache()
+                    self.station_checker.cache = self.probe_cache
+
+            if new_check_mode != check_mode:
+                self.config['Settings']['check_mode'] = new_check_mode
+                changed = True
+
+            if new_recheck_hours != recheck_hours:
+                self.config['Settings']['recheck_hours'] = str(new_recheck_hours)
+                changed = True
+
+            # Применяется со следующего запуска воспроизведения
+            if new_player_proxy != player_proxy:
+                self.config['Settings']['player_proxy'] = '1' if new_player_proxy else '0'
+                changed = True
+
+            if new_duplicates_by_final_url != duplicates_by_final_url:
+                self.config['Settings']['duplicates_by_final_url'] = '1' if new_duplicates_by_final_url else '0'
+                changed = True
+                self.duplicate_index.set_by_final_url(new_duplicates_by_final_url)
+
+            # Сохраняем шаблон, если он изменился
+            if new_template != current_template:
+                self.config['Settings']['rename_template'] = new_template
+                changed = True
+            
+            if changed:
+                ConfigManager.save_config(self.config)
+            
+
+    def insert_row(self, row_position, data):
+        self.station_model.insert_rows(row_position, [data])
+        self.table.selectRow(row_position)
+    def update_selection_state(self):
+        """Обновляет состояние выделенной строки"""
+        self.ui_state_manager.row_selected = self.table.currentRow() >= 0
+        self.ui_state_manager.update_state()
+
+    def add_row(self):
+        current_row = self.table.currentRow()
+        if current_row >= 0:
+            insert_position = current_row + 1  # После выделенной строки
+        else:
+            insert_position = 0  # В начало таблицы
+            
+        default_data = ["Новая станция", "Введите адрес", "0", "-"]
+        self.insert_row(insert_position, default_data)
+
+        self.ui_state_manager.has_data = self.table.rowCount() > 0
+        self.ui_state_manager.update_state()
+        self.update_selection_state()
+
+    def edit_row(self):
+        row = self.table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "Ошибка", "Выберите строку для редактирования")
+            return
+        
+        data = self.station_model.row_values(row)[:3]
+        
+        dialog = EditDialog(data, self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            new_data = dialog.get_data()
+            self.station_model.set_row(row, new_data)
+
+    def delete_row(self):
+        row = self.table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "Ошибка", "Выберите строку для удаления")
+            return
+        
+        self.station_model.remove_rows([row])
+        if self.table.rowCount() > 0:
+            self.table.selectRow(min(row, self.table.rowCount()-1))
+
+        # self.ui_state_manager.has_data = self.table.rowCount() > 0
+        self.update_selection_state()    
+
+    def log_startup_time(self):
+        """Время от запуска программы до показа окна"""
+        self.log(f"Запуск программы: {time.perf_counter() - STARTUP_STARTED:.2f} с")
+
+    def log(self, message):
+        """Добавляет сообщение в лог с автопрокруткой вниз"""
+        self.log_widget.append(message)
+        self.log_widget.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_widget.ensureCursorVisible()       
+
+
+def main():
+    """Запуск окна программы из radio-manager.py"""
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    
+    # Загружаем конфигурацию
+    config = ConfigManager.load_config()
+    
+    # Применяем тему из конфига
+    ThemeManager.apply_theme(config['Settings'].get('theme', 'light'))
+    
+    # Все сетевые пути разрешают имена через общий кэш
+    DnsCache.install()
+
+    window = MainWindow()
+    window.show()
+    # Первая итерация цикла событий - окно уже на экране
+    QTimer.singleShot(0, window.log_startup_time)
+    return app.exec()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Общие приспособления тестов: путь к модулям программы и локальный HTTP-сервер
+с радиостанциями для проверки движков.
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class StationHandler(BaseHTTPRequestHandler):
+    """
+    Ответы тестовых станций. Сервер держит соединения открытыми (HTTP/1.1 keep-alive),
+    поэтому короткое тело проверка должна дочитать по длине, а не до закрытия соединения.
+    """
+    protocol_version = 'HTTP/1.1'
+    STREAM_SECONDS = 5  # Поток обрывается сам, если клиент его не закрыл
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, content_type, body, status=200, extra_headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in extra_headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_stream(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('icy-name', 'Test FM')
+        self.send_header('icy-genre', 'Rock')
+        self.send_header('icy-br', '128')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        self.close_connection = True
+        deadline = time.monotonic() + self.STREAM_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                self.wfile.write(b'\xff\xfb' * 512)
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass  # Проверка прочитала начало потока и закрыла соединение
+
+    def send_chunked(self, content_type, chunks):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        for chunk in chunks:
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode('ascii') + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def do_GET(self):
+        port = self.server.server_address[1]
+        if self.path == '/stream':
+            self.send_stream()
+        elif self.path == '/redirect':
+            self.send_body('text/html', b'', status=302, extra_headers=[('Location', '/stream')])
+        elif self.path == '/html':
+            self.send_body('text/plain', b'<html><body>Off air</body>')
+        elif self.path == '/chunked-html':
+            self.send_chunked('text/plain', [b'<html>', b'<body>Off air</body>', b'</html>'])
+        elif self.path == '/pl.m3u':
+            self.send_body('audio/x-mpegurl', f'#EXTM3U\nhttp://127.0.0.1:{port}/stream\n'.encode('ascii'))
+        else:
+            self.send_body('text/plain', b'not found', status=404)
+
+    do_HEAD = do_GET
+
+
+@pytest.fixture(scope='session')
+def station_server():
+    """Базовый адрес локального сервера станций (http://127.0.0.1:порт)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StationHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,155 @@
+"""Проверка станций обоими движками против локального сервера"""
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from conftest import StationHandler
+from radio_core import StationChecker
+
+
+def run_check(urls, engine, probe_mode='get'):
+    """Проверить адреса и вернуть (результаты по строкам, итог check_finished)"""
+    checker = StationChecker(max_threads=4, timeout=3, engine=engine, probe_mode=probe_mode)
+    return run_check_with(checker, urls)
+
+
+def run_check_with(checker, urls):
+    """Проверить адреса готовым проверяющим без повторов"""
+    results = {}
+    finished = []
+
+    def listener(event, *args):
+        if event == 'stations_checked':
+            results.update(args[0])
+        elif event == 'check_finished':
+            finished.append(args)
+
+    checker.listener = listener
+    checker.retry_attempts = 1
+    checker.check_stations(list(enumerate(urls)), use_cache=False)
+    return results, finished
+
+
+@pytest.mark.parametrize('engine', StationChecker.ENGINES)
+@pytest.mark.parametrize('probe_mode', list(StationChecker.PROBE_MODES))
+def test_engines_classify_stations(station_server, engine, probe_mode):
+    urls = [station_server + path for path in ('/stream', '/redirect', '/missing')]
+    results, finished = run_check(urls, engine, probe_mode)
+    stream = results[0]
+    assert (stream['status'], stream['stream_type'], stream['name'], stream['codec'], stream['bitrate'],
+            stream['genre']) == ('OK', 'STREAM', 'Test FM', 'MP3', '128', 'Rock')
+    assert results[1]['status'] == 'OK'
+    assert results[1]['final_url'] == station_server + '/stream'
+    assert results[2]['status'] == '404'
+    assert finished == [(3, 2, 1)]
+
+
+@pytest.mark.parametrize('engine', StationChecker.ENGINES)
+@pytest.mark.parametrize('probe_mode', ['get', 'head_get'])  # В режиме HEAD тело не читается
+def test_short_bodies_on_keep_alive(station_server, engine, probe_mode):
+    """Короткое тело на keep-alive соединении читается по длине, а не до таймаута"""
+    urls = [station_server + path for path in ('/html', '/chunked-html', '/pl.m3u')]
+    started = time.monotonic()
+    results, _ = run_check(urls, engine, probe_mode)
+    assert time.monotonic() - started < 2.5
+    assert results[0]['status'] == '404'
+    assert results[1]['status'] == '404'
+    assert results[2]['status'] == 'OK'
+    assert results[2]['stream_type'] == 'PL: 1'
+
+
+def closed_port():
+    """Порт локального хоста, на котором никто не слушает"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize('engine', StationChecker.ENGINES)
+def test_unreachable_server_rechecked_once(engine):
+    """Недоступный сервер проверяется повторно одним соединением, станции не опрашиваются по HTTP"""
+    ports = [closed_port(), closed_port()]
+    urls = [f'http://127.0.0.1:{port}/{i}' for port in ports for i in range(10)]
+    events = []
+    results = {}
+
+    def listener(event, *args):
+        if event == 'stations_checked':
+            results.update(args[0])
+        else:
+            events.append((event, args))
+
+    checker = StationChecker(max_threads=4, timeout=3, engine=engine, listener=listener)
+    checker.retry_delay = 0.1
+    probed = []
+    original_connect_check = checker._async_connect_check
+
+    async def counted_connect_check(endpoint, resolving):
+        probed.append(endpoint)
+        return await original_connect_check(endpoint, resolving)
+
+    checker._async_connect_check = counted_connect_check
+    checker._threaded_check_station = lambda session, url: pytest.fail('HTTP-проверка недоступного сервера')
+    checker._async_check_station = checker._threaded_check_station
+    checker.check_stations(list(enumerate(urls)), use_cache=False)
+
+    assert len(probed) == 4  # По соединению на сервер в первой фазе и на повторе
+    assert {result['status'] for result in results.values()} == {'ConnError'}
+    assert len(results) == len(urls)
+    assert ('retries_finished', (len(urls), 0)) in events
+
+
+@pytest.mark.parametrize('engine', StationChecker.ENGINES)
+def test_recovered_server_checked_over_http(engine):
+    """Сервер, заработавший к повтору, получает полную проверку своих станций"""
+    listener_socket = socket.socket()
+    listener_socket.bind(('127.0.0.1', 0))  # Без listen соединения отклоняются
+    port = listener_socket.getsockname()[1]
+    server = ThreadingHTTPServer(('127.0.0.1', port), StationHandler, bind_and_activate=False)
+    server.socket = listener_socket
+    server.daemon_threads = True
+
+    checker = StationChecker(max_threads=4, timeout=3, engine=engine)
+    checker.retry_delay = 1
+
+    def prefilter_then_start():
+        # Сервер включается сразу после первой фазы
+        server.server_activate()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {}
+
+    def listener(event, *args):
+        if event == 'stations_checked':
+            results.update(args[0])
+        elif event == 'prefilter_finished':
+            prefilter_then_start()
+
+    checker.listener = listener
+    try:
+        checker.check_stations([(0, f'http://127.0.0.1:{port}/stream'), (1, f'http://127.0.0.1:{port}/html')],
+                               use_cache=False)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert results[0]['status'] == 'OK'
+    assert results[1]['status'] == '404'
+    assert checker.retry_policy.recovered == 1
+
+
+def test_failed_sample_read_leaves_no_inflight(station_server, monkeypatch):
+    """Ответ, на чтении которого проверка упала, не остается в списке закрываемых отменой"""
+    import requests
+
+    def broken_iter_content(self, chunk_size=1):
+        raise requests.exceptions.ChunkedEncodingError('обрыв')
+        yield b''
+
+    monkeypatch.setattr(requests.Response, 'iter_content', broken_iter_content)
+    checker = StationChecker(max_threads=2, timeout=3)
+    results, _ = run_check_with(checker, [station_server + '/stream', station_server + '/html'])
+    assert {result['status'] for result in results.values()} == {'Error'}
+    assert not checker._inflight
@@ -0,0 +1,190 @@
+"""Разбор плейлиста, повторы проверок и план инкрементальной проверки"""
+import re
+import time
+
+import pytest
+
+from radio_core import DataProcessor, HostFairQueue, ProbeCache, RetryPolicy, StationChecker
+
+
+def reference_parse(line):
+    """Разбор строки в том виде, в каком он был до быстрого пути и предкомпилированных шаблонов"""
+    log = []
+    line = line.strip().lstrip('\ufeff')
+    if not line:
+        return None, log
+    parts = re.split(r'\t+|\s{2,}', line)
+    if len(parts) == 1 and ' ' in parts[0]:
+        if parts[0].count('http') >= 2:
+            match = re.match(r'^(.*?)\s+(https?://.*?)\s+(https?://.*?)(?:\s+(-?\d+))?$', parts[0])
+            if not match:
+                raise ValueError("Неправильный формат строки")
+            name, url1, url2, volume = match.groups()
+            url = url1
+        else:
+            space_parts = parts[0].rsplit(' ', 2)
+            if len(space_parts) < 3:
+                raise ValueError("Недостаточно частей в строке")
+            name = ' '.join(space_parts[:-2])
+            url = space_parts[-2]
+            volume = space_parts[-1]
+    elif len(parts) >= 3:
+        name = ' '.join(parts[:-2])
+        url = parts[-2]
+        volume = parts[-1]
+    else:
+        raise ValueError("Недостаточно частей в строке")
+
+    name = name.strip()
+    url = url.strip().replace(' ', '')
+    try:
+        volume_int = int(volume) if volume else 0
+        if volume_int < -64 or volume_int > 64:
+            log.append(f"Строка 1: Громкость {volume_int} вне диапазона, установлена в 0")
+            volume_int = 0
+    except ValueError:
+        log.append(f"Строка 1: Неверная громкость '{volume}', установлена в 0")
+        volume_int = 0
+    if not re.match(r'^https?://', url):
+        raise ValueError(f"Неправильный формат URL '{url}'")
+    return {'name': name, 'url': url, 'volume': volume_int}, log
+
+
+PLAYLIST_LINES = [
+    "Rock FM\thttp://rock.example/stream\t5",
+    "\ufeffRock FM\thttp://rock.example/stream\t-3",
+    "Jazz  Radio\thttp://jazz.example/live\t0",
+    "Jazz Radio  http://jazz.example/live  12",
+    "Pop\t\thttp://pop.example/\t\t7",
+    "Name with spaces http://space.example/a 3",
+    "Double http://a.example/1 http://a.example/1 4",
+    "Double http://a.example/1 http://b.example/2",
+    "Loud\thttp://loud.example/\t100",
+    "Quiet\thttps://quiet.example/\tabc",
+    "Empty volume\thttp://e.example/\t",
+    "  Padded\thttp://pad.example/\t1  ",
+    "Bad url\tftp://files.example/\t0",
+    "One part",
+    "Two\thttp://two.example/",
+    "",
+    "   ",
+]
+
+
+@pytest.mark.parametrize('line', PLAYLIST_LINES)
+def test_parse_line_matches_reference(line):
+    """Быстрый путь и предкомпилированные шаблоны разбирают строки как прежний разбор"""
+    processor = DataProcessor()
+    try:
+        expected, expected_log = reference_parse(line)
+    except ValueError as error:
+        with pytest.raises(ValueError, match=re.escape(str(error))):
+            processor.parse_line(line, 1)
+        return
+    assert processor.parse_line(line, 1) == expected
+    assert processor.log_messages == expected_log
+
+
+def test_process_csv_file_counts(tmp_path):
+    path = tmp_path / 'playlist.csv'
+    path.write_text('\n'.join(PLAYLIST_LINES), encoding='utf-8')
+    expected = []
+    errors = 0
+    for line in PLAYLIST_LINES:
+        try:
+            station, _ = reference_parse(line)
+        except ValueError:
+            errors += 1
+            continue
+        if station is not None:
+            expected.append(station)
+    stations, log_messages = DataProcessor().process_csv_file(str(path))
+    assert stations == expected
+    assert log_messages[-1] == f"Обработано: {len(expected)} успешно, {errors} ошибок"
+
+
+def test_retry_policy_transient_only():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0)
+    assert policy.should_retry(StationChecker.make_result('Timeout'), 1)
+    assert policy.should_retry(StationChecker.make_result('503'), 2)
+    assert not policy.should_retry(StationChecker.make_result('Timeout'), 3)  # Попытки кончились
+    assert not policy.should_retry(StationChecker.make_result('404'), 1)
+    assert not policy.should_retry(StationChecker.make_result('OK'), 1)
+    assert policy.retried == 2
+
+
+def test_retry_policy_delay_grows_with_jitter():
+    policy = RetryPolicy(max_attempts=5, base_delay=2.0)
+    for attempt, full_delay in ((1, 2.0), (2, 4.0), (3, 8.0)):
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(full_delay / 2 <= delay <= full_delay for delay in delays)
+    assert policy.delay(20) <= RetryPolicy.MAX_DELAY
+
+
+def test_retry_policy_counts_recovered():
+    policy = RetryPolicy()
+    policy.record_final(StationChecker.make_result('OK'), 1)
+    policy.record_final(StationChecker.make_result('Timeout'), 2)
+    policy.record_final(StationChecker.make_result('OK'), 2)
+    assert policy.recovered == 1
+
+
+def test_host_fair_queue_limits_hosts():
+    queue = HostFairQueue(per_host_limit=1)
+    for index in range(3):
+        queue.push('a', ('a', index))
+    queue.push('b', ('b', 0))
+    assert queue.pop() == ('a', ('a', 0))
+    assert queue.pop() == ('b', ('b', 0))
+    assert queue.pop() is None  # Хост a занят, b пуст
+    queue.release('a')
+    assert queue.pop() == ('a', ('a', 1))
+    queue.push_delayed('b', ('b', 1), 0)
+    queue.release('b')
+    assert queue.pop() == ('b', ('b', 1))
+    assert len(queue) == 1
+
+
+@pytest.fixture
+def probe_cache(tmp_path):
+    cache = ProbeCache(str(tmp_path / 'cache.sqlite'), ttl_hours=48)
+    yield cache
+    cache.close()
+
+
+def put_at(cache, monkeypatch, url, status, hours_ago):
+    """Записать результат в кэш так, будто проверка была hours_ago часов назад"""
+    checked_at = time.time() - hours_ago * 3600
+    monkeypatch.setattr(time, 'time', lambda: checked_at)
+    cache.put(url, StationChecker.make_result(status, url))
+    monkeypatch.undo()
+
+
+def test_plan_recheck_groups_and_order(probe_cache, monkeypatch):
+    put_at(probe_cache, monkeypatch, 'http://fresh.example/', 'OK', 1)
+    put_at(probe_cache, monkeypatch, 'http://old.example/', 'OK', 30)
+    put_at(probe_cache, monkeypatch, 'http://older.example/', '404', 40)
+    put_at(probe_cache, monkeypatch, 'http://failed-old.example/', 'Timeout', 5)
+    put_at(probe_cache, monkeypatch, 'http://failed-new.example/', 'ConnError', 2)
+    stations_data = list(enumerate([
+        'http://fresh.example/', 'http://old.example/', 'http://older.example/',
+        'http://failed-old.example/', 'http://failed-new.example/', 'http://new.example/',
+        'HTTP://FRESH.example:80/',  # Тот же адрес после нормализации
+    ]))
+
+    to_check, fresh, counts = probe_cache.plan_recheck(stations_data, recheck_hours=24)
+
+    # Сначала недавние сбои, затем новые, затем устаревшие (самые старые первыми)
+    assert [row for row, _ in to_check] == [4, 3, 5, 2, 1]
+    assert sorted(row for row, _ in fresh) == [0, 6]
+    assert all(result['status'] == 'OK' for _, result in fresh)
+    assert counts == {'failed': 2, 'new': 1, 'stale': 2}
+
+
+def test_get_many_skips_transient_and_expired(probe_cache, monkeypatch):
+    put_at(probe_cache, monkeypatch, 'http://ok.example/', 'OK', 1)
+    put_at(probe_cache, monkeypatch, 'http://timeout.example/', 'Timeout', 1)
+    put_at(probe_cache, monkeypatch, 'http://expired.example/', 'OK', 72)
+    urls = ['http://ok.example/', 'http://timeout.example/', 'http://expired.example/']
+    assert list(probe_cache.get_many(urls)) == ['http://ok.example/']
+    assert len(probe_cache.get_many(urls, include_transient=True, any_age=True)) == 3
@@ -0,0 +1,127 @@
+"""Модель таблицы станций, индексы поиска и дублей"""
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+pytest.importorskip('PyQt6.QtWidgets')
+
+from radio_core import StationChecker  # noqa: E402
+from radio_gui import StationDuplicateIndex, StationSearchIndex, StationTableModel  # noqa: E402
+
+
+def make_model(count):
+    model = StationTableModel()
+    model.set_stations([{'name': f'Station {row}', 'url': f'http://host{row % 7}.example/{row}', 'volume': row % 10}
+                        for row in range(count)])
+    return model
+
+
+def snapshot(model):
+    """Все колонки модели списками (для сравнения с ожидаемым)"""
+    return [list(column) for column in model._columns()]
+
+
+def expected_after_removal(before, rows):
+    removed = set(rows)
+    return [[value for row, value in enumerate(column) if row not in removed] for column in before]
+
+
+@pytest.mark.parametrize('rows', [
+    [3],
+    [0, 1, 2, 10, 11],                       # Несколько блоков - удаление по блокам
+    list(range(0, 200, 3)),                  # Больше MAX_REMOVE_BLOCKS - пересборка колонок
+    [199, 5, 5, 198],                        # Неотсортированные номера с повтором
+])
+def test_remove_rows_keeps_columns_aligned(rows):
+    model = make_model(200)
+    model.set_results({row: StationChecker.make_result('OK', f'http://final/{row}', stream_type='STREAM',
+                                                       name=f'Real {row}', codec='MP3', bitrate='128',
+                                                       genre='Rock') for row in range(0, 200, 2)})
+    model.set_highlights(range(0, 200, 5), 'highlight')
+    before = snapshot(model)
+
+    model.remove_rows(rows)
+
+    assert snapshot(model) == expected_after_removal(before, rows)
+    assert model.rowCount() == 200 - len(set(rows))
+    assert model.highlighted_rows() == {row for row in range(model.rowCount()) if model.highlights[row]}
+
+
+def test_compact_signals_one_reset():
+    model = make_model(100)
+    events = []
+    model.modelReset.connect(lambda: events.append('reset'))
+    model.rowsRemoved.connect(lambda *args: events.append('removed'))
+    rows = list(range(0, 100, 2))
+    assert len(rows) > StationTableModel.MAX_REMOVE_BLOCKS
+
+    model.remove_rows(rows)
+
+    assert events == ['reset']
+    assert model.urls == [f'http://host{row % 7}.example/{row}' for row in range(1, 100, 2)]
+    assert model.volumes.typecode == 'b' and model.bitrates.typecode == 'i'
+
+
+@pytest.fixture
+def checked_model():
+    model = make_model(6)
+    results = {
+        0: StationChecker.make_result('OK', stream_type='STREAM', name='Rock Max', codec='MP3', bitrate='128', genre='Rock'),
+        1: StationChecker.make_result('OK', stream_type='STREAM', name='Jazz', codec='AAC', bitrate='64', genre='Jazz'),
+        2: StationChecker.make_result('OK', stream_type='PL: 2', name='Classic Rock', codec='AAC', bitrate='256',
+                                      genre='Classic Rock'),
+        3: StationChecker.make_result('Timeout'),
+        4: StationChecker.make_result('404'),
+    }
+    model.set_results(results)
+    return model
+
+
+@pytest.mark.parametrize('query, rows', [
+    ('codec:aac', [1, 2]),
+    ('codec=mp3', [0]),
+    ('bitrate>=128', [0, 2]),
+    ('bitrate<128', [1]),
+    ('bitrate:64', [1]),
+    ('genre:rock', [0, 2]),
+    ('genre="classic rock"', [2]),
+    ('genre=rock', [0]),
+    ('status:timeout', [3]),
+    ('type:pl', [2]),
+    ('name:rock codec:aac', [2]),
+    ('codec:aac station 2', [2]),            # Остаток запроса ищется по тексту колонок
+    ('station 5', [5]),
+    ('codec:ogg', []),
+    ('bitrate>abc', []),
+])
+def test_search_filters(checked_model, query, rows):
+    index = StationSearchIndex(checked_model)
+    assert index.query(query) == rows
+
+
+def test_search_index_follows_model_changes(checked_model):
+    index = StationSearchIndex(checked_model)
+    assert index.query('codec:aac') == [1, 2]
+    checked_model.set_results({5: StationChecker.make_result('OK', stream_type='STREAM', name='New', codec='AAC',
+                                                             bitrate='32', genre='Pop')})
+    assert index.query('codec:aac') == [1, 2, 5]
+    checked_model.remove_rows([0])
+    assert index.query('codec:aac') == [0, 1, 4]
+    assert index.search('station 3') == [2]
+
+
+def test_duplicate_index_updates_incrementally():
+    model = StationTableModel()
+    model.set_stations([
+        {'name': 'A', 'url': 'http://host/stream', 'volume': 0},
+        {'name': 'B', 'url': 'https://HOST:443/stream/', 'volume': 0},
+        {'name': 'C', 'url': 'http://other/', 'volume': 0},
+    ])
+    index = StationDuplicateIndex(model)
+    index._ensure_keys()
+    assert index.duplicate_count == 1
+    model.append_stations([{'name': 'D', 'url': 'http://other:80/', 'volume': 0}])
+    assert index.duplicate_count == 2
+    model.remove_rows([0])
+    assert index.duplicate_count == 1